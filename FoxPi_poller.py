@@ -0,0 +1,209 @@
+"""Periodic sampling of FoxPi signal DIDs.
+
+``FoxPiPoller`` keeps a deadline per DID derived from its target rate. Every
+DID that is due (or about to be, within ``coalesce_window``) is read in one
+multi-DID ReadDataByIdentifier request, decoded with ``FOXPI_DECODER`` and
+delivered to subscribers and/or a queue. Between deadlines the poller sleeps
+on an event, so it never busy-waits and can be stopped at any time.
+"""
+
+from uds.client import DoIPClient
+from uds.connection import DoIPConnection as DoIPClientUDSConnector
+from uds.client_config import client_config
+from uds.config import DOIP_SERVER_IP, DOIP_DEFAULT_LOGICAL_ADDRESS
+from udsoncan.client import Client
+from FoxPi_read import FoxPiReadDID, SNAPSHOT_MAX_PAYLOAD
+from FoxPi_signals import FOXPI_DECODER, FOXPI_DIDS, SignalValue
+from typing import Callable, Dict, List, Optional
+import dataclasses
+import datetime
+import heapq
+import logging
+import math
+import os
+import queue
+import threading
+import time
+
+
+@dataclasses.dataclass
+class Sample:
+    """Decoded values of one DID read by the poller."""
+
+    did: int
+    name: str
+    timestamp: float  # time.time() when the response was received
+    values: Dict[str, SignalValue]
+
+
+@dataclasses.dataclass
+class DidStats:
+    """Scheduling statistics of one polled DID.
+
+    Jitter is how late a read was issued compared to its deadline. An overrun
+    is a deadline that was skipped because the previous one was served more
+    than a full period late.
+    """
+
+    period: float
+    rounds: int = 0  # Deadlines served, whether the read succeeded or not
+    samples: int = 0
+    overruns: int = 0
+    errors: int = 0
+    jitter_sum: float = 0.0
+    jitter_max: float = 0.0
+
+    @property
+    def jitter_mean(self) -> float:
+        return self.jitter_sum / self.rounds if self.rounds else 0.0
+
+
+class FoxPiPoller:
+    """Polls FoxPi DIDs at per-DID target rates over one UDS client.
+
+    The poller owns the client while it runs: do not send other requests on the
+    same client from another thread.
+
+    :param client: An opened udsoncan Client configured with ``client_config()``.
+    :param rates: Target rate in Hz for each DID to poll, e.g. ``{0x1002: 50, 0x100E: 1}``.
+    :param max_payload: Largest response a single coalesced request may produce.
+    :param coalesce_window: DIDs due within this many seconds of the earliest
+        deadline are read in the same request.
+    :param sample_queue: Optional queue that receives every ``Sample``.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        rates: Dict[int, float],
+        max_payload: int = SNAPSHOT_MAX_PAYLOAD,
+        coalesce_window: float = 0.002,
+        sample_queue: Optional["queue.Queue[Sample]"] = None,
+    ):
+        if not rates:
+            raise ValueError("At least one DID rate must be given")
+        for did, rate in rates.items():
+            if did not in FOXPI_DIDS:
+                raise ValueError(f"DID {hex(did)} is not a FoxPi signal DID")
+            if not rate > 0:
+                raise ValueError(f"Rate for DID {hex(did)} must be positive, got {rate}")
+
+        self.reader = FoxPiReadDID(client)
+        self.client = client
+        self.max_payload = max_payload
+        self.coalesce_window = coalesce_window
+        self.queue = sample_queue
+        self.stats = {did: DidStats(period=1.0 / rate) for did, rate in rates.items()}
+        self.requests = 0
+        self.logger = logging.getLogger("FoxPiPoller")
+
+        self._subscribers: List[Callable[[Sample], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[Sample], None]) -> None:
+        """Call ``callback(sample)`` for every decoded sample, from the polling thread."""
+        self._subscribers.append(callback)
+
+    def start(self) -> None:
+        """Start polling in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("FoxPiPoller is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="FoxPiPoller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling and wait for the background thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """Poll in the calling thread until ``stop()`` is called or ``duration`` seconds elapse."""
+        start = time.monotonic()
+        end = math.inf if duration is None else start + duration
+        deadlines = [(start, did) for did in self.stats]
+        heapq.heapify(deadlines)
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= end:
+                break
+            next_deadline = deadlines[0][0]
+            if next_deadline > now:
+                self._stop.wait(min(next_deadline, end) - now)
+                continue
+
+            # Every DID due up to the coalesce window goes in this round
+            due = []
+            while deadlines and deadlines[0][0] <= now + self.coalesce_window:
+                due.append(heapq.heappop(deadlines))
+
+            for deadline, did in due:
+                stats = self.stats[did]
+                stats.rounds += 1
+                jitter = max(now - deadline, 0.0)
+                stats.jitter_sum += jitter
+                stats.jitter_max = max(stats.jitter_max, jitter)
+                # Deadlines that already passed while this one was pending are skipped, not queued up
+                missed = int(jitter // stats.period)
+                stats.overruns += missed
+                heapq.heappush(deadlines, (deadline + (missed + 1) * stats.period, did))
+
+            self.poll([did for _, did in due])
+
+    def poll(self, dids: List[int]) -> None:
+        """Read the given DIDs now, in as few requests as ``max_payload`` allows, and deliver the samples.
+
+        A failed read, decode or subscriber call is logged and counted in the errors of its DID; polling goes on.
+        """
+        for group in self.reader.group_dids(dids, self.max_payload):
+            self.requests += 1
+            try:
+                response = self.client.read_data_by_identifier(group)
+            except Exception as e:
+                for did in group:
+                    self.stats[did].errors += 1
+                self.logger.error("Reading %s failed: [%s] %s", [hex(did) for did in group], e.__class__.__name__, e)
+                continue
+
+            timestamp = time.time()
+            for did in group:
+                try:
+                    sample = Sample(did, FOXPI_DIDS[did], timestamp, FOXPI_DECODER.decode(did, response.service_data.values[did][0]))
+                except Exception as e:
+                    self.stats[did].errors += 1
+                    self.logger.error("Decoding %s failed: [%s] %s", hex(did), e.__class__.__name__, e)
+                    continue
+                self.stats[did].samples += 1
+                if self.queue is not None:
+                    self.queue.put(sample)
+                for callback in self._subscribers:
+                    try:
+                        callback(sample)
+                    except Exception as e:
+                        self.stats[did].errors += 1
+                        self.logger.error("Subscriber %r failed on %s: [%s] %s", callback, hex(did), e.__class__.__name__, e)
+
+
+if __name__ == "__main__":
+    os.environ["RUST_LOG"] = "trace"
+    print(f"{datetime.datetime.now()}: Connecting to vehicle at {DOIP_SERVER_IP} with logical address {DOIP_DEFAULT_LOGICAL_ADDRESS}")
+    doip_client = DoIPClient(DOIP_SERVER_IP, DOIP_DEFAULT_LOGICAL_ADDRESS)
+    uds_connection = DoIPClientUDSConnector(doip_client)
+    assert uds_connection.is_open
+    with Client(uds_connection, request_timeout=4, config=client_config()) as client:
+        poller = FoxPiPoller(client, {0x1002: 50, 0x1004: 50, 0x100D: 1, 0x100E: 1})
+        poller.subscribe(lambda sample: print(f"{sample.name}: {sample.values}"))
+        poller.run(duration=10)
+        for did, stats in poller.stats.items():
+            print(f"{FOXPI_DIDS[did]}: {stats.samples} samples, jitter mean {stats.jitter_mean * 1000:.2f} ms max {stats.jitter_max * 1000:.2f} ms, {stats.overruns} overruns, {stats.errors} errors")
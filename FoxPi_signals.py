@@ -0,0 +1,410 @@
+"""FoxPi signal database and precompiled DID decoder.
+
+Every signal carried by the FoxPi DIDs (0x1001 - 0x1012) is described once in
+``FOXPI_SIGNALS``. ``SignalDecoder`` compiles that table into per-DID field
+lists (byte slice, shift, mask, scaling) so decoding a DID payload is a few
+integer operations per signal instead of bit-string parsing.
+
+``SignalDecoder.decode_bulk`` decodes many recorded payloads of one DID at once
+with NumPy, which is only needed for that method.
+"""
+
+import dataclasses
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np  # type:ignore
+    _import_numpy_err = None
+except Exception as e:
+    _import_numpy_err = e
+
+# FoxPi signal DIDs and the FoxPiReadDID method that reads each of them
+FOXPI_DIDS = {
+    0x1001: "FoxPi_Driving_Ctrl",
+    0x1002: "FoxPi_Motion_Status",
+    0x1003: "FoxPi_Brake_Status",
+    0x1004: "FoxPi_WheelSpeed",
+    0x1005: "FoxPi_EPS_Status",
+    0x1006: "FoxPi_Button_Status",
+    0x1007: "FoxPi_USS_Distance",
+    0x1008: "FoxPi_USS_Fault_Status",
+    0x1009: "FoxPi_PTG_USS_SW",
+    0x100A: "FoxPi_Switch_Status",
+    0x100B: "FoxPi_Lamp_Status",
+    0x100C: "FoxPi_Lamp_Ctrl",
+    0x100D: "FoxPi_Battery_Status",
+    0x100E: "FoxPi_TPMS_Status",
+    0x100F: "FoxPi_Pedal_position",
+    0x1010: "FoxPi_Motor_Status",
+    0x1011: "FoxPi_Shifter_allow",
+    0x1012: "FoxPi_Ctrl_Enable_Switch",
+}
+
+# Value returned for a signal whose bytes are all 0xFF (signal not available)
+INVALID = "FF"
+
+SignalValue = Union[int, float, str]
+
+
+@dataclasses.dataclass(frozen=True)
+class Signal:
+    """One signal inside a FoxPi DID payload.
+
+    The raw value is read big-endian starting at ``byte``; ``bit`` is the shift
+    from the LSB of those bytes and ``length`` the width in bits. The physical
+    value is ``raw * factor + offset``. When ``ff_invalid`` is set and every
+    byte the signal spans is 0xFF, the value is reported as ``INVALID``.
+    """
+
+    did: int
+    name: str
+    byte: int
+    bit: int = 0
+    length: int = 8
+    factor: Union[int, float] = 1
+    offset: Union[int, float] = 0
+    unit: str = ""
+    ff_invalid: bool = False
+
+    @property
+    def byte_count(self) -> int:
+        return (self.bit + self.length + 7) // 8
+
+
+def _bytes(did, name, byte, count, factor=1, offset=0, unit="", ff_invalid=False) -> Signal:
+    return Signal(did, name, byte, 0, count * 8, factor, offset, unit, ff_invalid)
+
+
+def _bits(did, name, byte, bit, length=1, ff_invalid=False) -> Signal:
+    return Signal(did, name, byte, bit, length, ff_invalid=ff_invalid)
+
+
+# fmt: off
+FOXPI_SIGNALS: List[Signal] = [
+    # 0x1001 FoxPi_Driving_Ctrl, 21 bytes
+    _bytes(0x1001, "AccReq", 0, 3, 0.05, -15, "m/s^2", ff_invalid=True),
+    _bytes(0x1001, "AccReq_A", 3, 1, ff_invalid=True),
+    _bytes(0x1001, "TargetSpdReq", 4, 3, 0.125, 0, "km/h", ff_invalid=True),
+    _bytes(0x1001, "TargetSpdReq_A", 7, 1, ff_invalid=True),
+    _bytes(0x1001, "Angle_Target_Valid", 8, 1, ff_invalid=True),
+    _bytes(0x1001, "Angle_Target_Req", 9, 1, ff_invalid=True),
+    _bytes(0x1001, "Angle_Target", 10, 4, 0.1, -900, "Deg", ff_invalid=True),
+    _bytes(0x1001, "Torque_Target_Valid", 14, 1, ff_invalid=True),
+    _bytes(0x1001, "Torque_Target_Req", 15, 1, ff_invalid=True),
+    _bytes(0x1001, "Torque_Target", 16, 3, 0.01, -10, "Nm", ff_invalid=True),
+    _bits(0x1001, "APSVMCReqA_flg", 19, 0, 1, ff_invalid=True),
+    _bits(0x1001, "APSStaSystem_enum", 19, 1, 3, ff_invalid=True),
+    _bits(0x1001, "APSShiftPosnReq_enum", 19, 4, 4, ff_invalid=True),
+    _bytes(0x1001, "APS_SpeedCMD", 20, 1, 0.125, 0, "km/h", ff_invalid=True),
+
+    # 0x1002 FoxPi_Motion_Status, 13 bytes
+    _bytes(0x1002, "VehicleSpeed", 0, 3, 0.125, 0, "km/h"),
+    _bytes(0x1002, "LongAccel", 3, 2, 0.01, -1.27, "G's"),
+    _bytes(0x1002, "LongAccel_V", 5, 1),
+    _bytes(0x1002, "LatAccel", 6, 2, 0.01, -1.27, "G's"),
+    _bytes(0x1002, "LatAccel_V", 8, 1),
+    _bytes(0x1002, "YawRate", 9, 3, 0.1, -100, "Deg/s"),
+    _bytes(0x1002, "YawRate_V", 12, 1),
+
+    # 0x1003 FoxPi_Brake_Status, 13 bytes
+    _bytes(0x1003, "BrkSw_Sta", 0, 1),
+    _bytes(0x1003, "BrkSw_V", 1, 1),
+    _bytes(0x1003, "MCPressure", 2, 3, 0.1, -9.7, "Bar"),
+    _bytes(0x1003, "MCPressure_V", 5, 1),
+    _bytes(0x1003, "PBA_Active", 6, 1),
+    _bytes(0x1003, "PBA_Failed", 7, 1),
+    _bytes(0x1003, "ABS_Active", 8, 1),
+    _bytes(0x1003, "ABS_Failed", 9, 1),
+    _bytes(0x1003, "EBD_Active", 10, 1),
+    _bytes(0x1003, "EBD_Failed", 11, 1),
+    _bytes(0x1003, "ACC_Availiability", 12, 1),
+
+    # 0x1004 FoxPi_WheelSpeed, 16 bytes
+    _bytes(0x1004, "RR_RawwhlSpeed", 0, 3, 0.0625, 0, "km/h"),
+    _bytes(0x1004, "RR_RawwhlSpeed_V", 3, 1),
+    _bytes(0x1004, "LR_RawwhlSpeed", 4, 3, 0.0625, 0, "km/h"),
+    _bytes(0x1004, "LR_RawwhlSpeed_V", 7, 1),
+    _bytes(0x1004, "RF_RawwhlSpeed", 8, 3, 0.0625, 0, "km/h"),
+    _bytes(0x1004, "RF_RawwhlSpeed_V", 11, 1),
+    _bytes(0x1004, "LF_RawwhlSpeed", 12, 3, 0.0625, 0, "km/h"),
+    _bytes(0x1004, "LF_RawwhlSpeed_V", 15, 1),
+
+    # 0x1005 FoxPi_EPS_Status, 11 bytes
+    _bytes(0x1005, "SAS_Angle", 0, 4, 0.1, -900, "Deg"),
+    _bytes(0x1005, "SAS_V", 4, 1),
+    _bytes(0x1005, "SAS_CAL", 5, 1),
+    _bytes(0x1005, "EPS_AOI_Control", 6, 1),
+    _bytes(0x1005, "EpasFailed", 7, 1),
+    _bytes(0x1005, "EPS_TOI_Activation", 8, 1),
+    _bytes(0x1005, "EPS_TOI_Unavailable", 9, 1),
+    _bytes(0x1005, "EPS_TOI_Fault", 10, 1),
+
+    # 0x1006 FoxPi_Button_Status, 2 bytes
+    _bits(0x1006, "SWC_ACC_sta", 0, 0),
+    _bits(0x1006, "SWC_CANCEL_Sta", 0, 1),
+    _bits(0x1006, "SWC_SET_down_Sta", 0, 2),
+    _bits(0x1006, "SWC_RES_up_Sta", 0, 3),
+    _bits(0x1006, "SWC_Distance_Sta", 0, 4),
+    _bits(0x1006, "SWC_mode_Sta", 0, 5),
+    _bits(0x1006, "SWC_Up_Sta", 0, 6),
+    _bits(0x1006, "SWC_Down_Sta", 0, 7),
+    _bits(0x1006, "SWC_Left_Sta", 1, 0),
+    _bits(0x1006, "SWC_Right_Sta", 1, 1),
+    _bits(0x1006, "SWC_RegenDown", 1, 2),
+    _bits(0x1006, "SWC_Undefined_Sta", 1, 3),
+    _bits(0x1006, "SWC_VR_Sta", 1, 4),
+    _bits(0x1006, "SWC_LKA_Sta", 1, 5),
+    _bits(0x1006, "SWC_RegenUp", 1, 6),
+    _bits(0x1006, "SWC_Trip_Sta", 1, 7),
+
+    # 0x1007 FoxPi_USS_Distance, 20 bytes
+    _bits(0x1007, "PAS_A_RMR", 0, 0, 4),
+    _bits(0x1007, "PAS_A_RML", 0, 4, 4),
+    _bits(0x1007, "PAS_A_RCR", 1, 0, 4),
+    _bits(0x1007, "PAS_A_RCL", 1, 4, 4),
+    _bits(0x1007, "PAS_A_FMR", 2, 0, 4),
+    _bits(0x1007, "PAS_A_FML", 2, 4, 4),
+    _bits(0x1007, "PAS_A_FCR", 3, 0, 4),
+    _bits(0x1007, "PAS_A_FCL", 3, 4, 4),
+    _bytes(0x1007, "PAS_D_RMR", 4, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_RML", 5, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_RCR", 6, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_RCL", 7, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_FMR", 8, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_FML", 9, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_FCR", 10, 1, unit="cm"),
+    _bytes(0x1007, "PAS_D_FCL", 11, 1, unit="cm"),
+    _bytes(0x1007, "APS_D_FLL", 12, 1, unit="cm"),
+    _bytes(0x1007, "APS_D_FLR", 13, 1, unit="cm"),
+    _bytes(0x1007, "APS_D_RLL", 14, 1, unit="cm"),
+    _bytes(0x1007, "APS_D_RLR", 15, 1, unit="cm"),
+    _bytes(0x1007, "PAS_Chime", 16, 1),
+    _bytes(0x1007, "PAS_SNSR_Layout", 17, 1),
+    _bytes(0x1007, "PAS_Mod_Operation", 18, 1),
+    _bytes(0x1007, "PAS_Sta_F_Sys", 19, 1),
+
+    # 0x1008 FoxPi_USS_Fault_Status, 2 bytes
+    _bits(0x1008, "USS_Sta_RMR", 0, 0),
+    _bits(0x1008, "USS_Sta_RML", 0, 1),
+    _bits(0x1008, "USS_Sta_RCR", 0, 2),
+    _bits(0x1008, "USS_Sta_RCL", 0, 3),
+    _bits(0x1008, "USS_Sta_FMR", 0, 4),
+    _bits(0x1008, "USS_Sta_FML", 0, 5),
+    _bits(0x1008, "USS_Sta_FCR", 0, 6),
+    _bits(0x1008, "USS_Sta_FCL", 0, 7),
+    _bits(0x1008, "USS_Sta_RLR", 1, 0),
+    _bits(0x1008, "USS_Sta_RLL", 1, 1),
+    _bits(0x1008, "USS_Sta_FLR", 1, 2),
+    _bits(0x1008, "USS_Sta_FLL", 1, 3),
+
+    # 0x1009 FoxPi_PTG_USS_SW, 1 byte
+    _bytes(0x1009, "PTG_USS_SW_Sta", 0, 1),
+
+    # 0x100A FoxPi_Switch_Status, 2 bytes
+    _bits(0x100A, "Crash_Detect_Status", 0, 0),
+    _bits(0x100A, "Driver_Lock_Status", 0, 1),
+    _bits(0x100A, "All_Door_Switch_Status", 0, 2),
+    _bits(0x100A, "Driver_Door_Switch_Status", 0, 3),
+    _bits(0x100A, "Passenger_Door_Switch_Status", 0, 4),
+    _bits(0x100A, "Rear_Left_Door_Switch_Status", 0, 5),
+    _bits(0x100A, "Rear_Right_Door_Switch_Status", 0, 6),
+    _bits(0x100A, "Tailgate_Switch_Status", 0, 7),
+    _bits(0x100A, "Hood_Switch_Status", 1, 0),
+
+    # 0x100B FoxPi_Lamp_Status, 2 bytes
+    _bits(0x100B, "Column_Turn_Lamp_Switch_Status", 0, 0, 2),
+    _bits(0x100B, "Column_Dim_Switch_Status", 0, 2),
+    _bits(0x100B, "Column_Pass_Switch_Status", 0, 3),
+    _bits(0x100B, "Position_Lamp_Status", 0, 4),
+    _bits(0x100B, "Low_Beam_Status", 0, 5),
+    _bits(0x100B, "High_Beam_Status", 0, 6),
+    _bits(0x100B, "Right_Daytime_Running_Light_Status", 0, 7),
+    _bits(0x100B, "Left_Daytime_Running_Light_Status", 1, 0),
+    _bits(0x100B, "Left_Turn_Lamp_Status", 1, 1),
+    _bits(0x100B, "Right_Turn_Lamp_Status", 1, 2),
+    _bits(0x100B, "Brake_Lamp_Status", 1, 3),
+    _bits(0x100B, "Reverse_Lamp_Status", 1, 4),
+    _bits(0x100B, "Rear_Fog_Lamp_Status", 1, 5),
+
+    # 0x100C FoxPi_Lamp_Ctrl, 6 bytes
+    _bits(0x100C, "Position_Lamp_Control_Enable", 0, 0),
+    _bits(0x100C, "Position_Lamp", 0, 1),
+    _bits(0x100C, "Low_Beam_Control_Enable", 0, 2),
+    _bits(0x100C, "Low_Beam", 0, 3),
+    _bits(0x100C, "High_Beam_Control_Enable", 0, 4),
+    _bits(0x100C, "High_Beam", 0, 5),
+    _bits(0x100C, "Right_Daytime_Running_Light_Control_Enable", 0, 6),
+    _bits(0x100C, "Right_Daytime_Running_Light", 0, 7),
+    _bits(0x100C, "Left_Daytime_Running_Light_Control_Enable", 1, 0),
+    _bits(0x100C, "Left_Daytime_Running_Light", 1, 1),
+    _bits(0x100C, "Left_TurnLamp_Control_Enable", 1, 2),
+    _bits(0x100C, "Left_TurnLamp", 1, 3),
+    _bits(0x100C, "Right_TurnLamp_Control_Enable", 1, 4),
+    _bits(0x100C, "Right_TurnLamp", 1, 5),
+    _bits(0x100C, "Brake_Lamp_Control_Enable", 1, 6),
+    _bits(0x100C, "Brake_Lamp", 1, 7),
+    _bits(0x100C, "Reverse_Lamp_Control_Enable", 2, 0),
+    _bits(0x100C, "Reverse_Lamp", 2, 1),
+    _bits(0x100C, "Rear_Fog_Lamp_Control_Enable", 2, 2),
+    _bits(0x100C, "Rear_Fog_Lamp", 2, 3),
+    _bits(0x100C, "Amblight_Control_Enable", 2, 4),
+    _bits(0x100C, "Control_Area", 2, 5, 3),
+    _bytes(0x100C, "RGB_Color", 3, 1, ff_invalid=True),
+    _bytes(0x100C, "Bright", 4, 1, ff_invalid=True),
+    _bytes(0x100C, "Mode", 5, 1, ff_invalid=True),
+
+    # 0x100D FoxPi_Battery_Status, 4 bytes
+    _bytes(0x100D, "LVBattDet12V", 0, 1, 0.1, 0, "V"),
+    _bytes(0x100D, "HVBattSOC", 1, 1, 0.4, 0, "%"),
+    _bytes(0x100D, "CellTempAvg", 2, 1, 1, -40, "Deg^C"),
+    _bits(0x100D, "HVBContactorSta", 3, 6),
+    _bits(0x100D, "HVBattErr", 3, 7),
+
+    # 0x100E FoxPi_TPMS_Status, 13 bytes
+    _bytes(0x100E, "LF_Wheel_Pressure", 0, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "RF_Wheel_Pressure", 1, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "LR_Wheel_Pressure", 2, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "RR_Wheel_Pressure", 3, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "LF_Wheel_Temperature", 4, 1, 1, -40, "Deg^C"),
+    _bytes(0x100E, "RF_Wheel_Temperature", 5, 1, 1, -40, "Deg^C"),
+    _bytes(0x100E, "LR_Wheel_Temperature", 6, 1, 1, -40, "Deg^C"),
+    _bytes(0x100E, "RR_Wheel_Temperature", 7, 1, 1, -40, "Deg^C"),
+    _bytes(0x100E, "LF_Low_Pressure_Threshold", 8, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "RF_Low_Pressure_Threshold", 9, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "LR_Low_Pressure_Threshold", 10, 1, 0.25, 7.26, "psi"),
+    _bytes(0x100E, "RR_Low_Pressure_Threshold", 11, 1, 0.25, 7.26, "psi"),
+    _bits(0x100E, "TPMSWarnindi", 12, 0, 2),
+
+    # 0x100F FoxPi_Pedal_position, 3 bytes
+    _bytes(0x100F, "ActAPSPosn", 0, 1, 0.392, 0, "%"),
+    _bytes(0x100F, "BrkPedalPos", 1, 2, 0.4, 0, "%"),
+
+    # 0x1010 FoxPi_Motor_Status, 11 bytes
+    _bytes(0x1010, "Rr_TqSource", 0, 1),
+    _bytes(0x1010, "Rr_TMTqReq_toNidec", 1, 2, 1, -530, "Nm"),
+    _bytes(0x1010, "Rr_EDURealTMTq_Nidec", 3, 2, 1, -1023, "Nm"),
+    _bytes(0x1010, "Rr_MotorAvailTq_Nidec", 5, 2, 1, -1023, "Nm"),
+    _bytes(0x1010, "Rr_RegenAvailTq_Nidec", 7, 2, 1, -1023, "Nm"),
+    _bytes(0x1010, "Rr_TMSpd_Nidec", 9, 2, 1, -32767, "rpm"),
+
+    # 0x1011 FoxPi_Shifter_allow, 3 bytes
+    _bytes(0x1011, "VTQD_ExternalTqAllow_flg", 0, 1),
+    _bytes(0x1011, "VTQD_ExtShftAllow_flg", 1, 1),
+    _bytes(0x1011, "VTQD_ExtDoorAllow_flg", 2, 1),
+
+    # 0x1012 FoxPi_Ctrl_Enable_Switch, 1 byte
+    _bits(0x1012, "Ctrl_Enable_Switch", 0, 0, ff_invalid=True),
+]
+# fmt: on
+
+
+# name, start, end, shift, mask, factor, offset, scaled, all-0xFF value (None when not ff_invalid)
+_Field = Tuple[str, int, int, int, int, Union[int, float], Union[int, float], bool, Optional[int]]
+
+
+@dataclasses.dataclass
+class BulkDecoded:
+    """Signal columns decoded from N payloads of one DID.
+
+    ``values`` maps each signal name to an array of N values: float for scaled
+    signals, integer otherwise. ``valid`` holds a boolean array for every
+    ``ff_invalid`` signal, False where the record was all 0xFF; the matching
+    ``values`` entries are then meaningless.
+    """
+
+    did: int
+    count: int
+    values: Dict[str, "np.ndarray"]
+    valid: Dict[str, "np.ndarray"]
+
+
+class SignalDecoder:
+    """Decodes DID payloads into signal values using a precompiled signal table.
+
+    :param signals: The signals to decode. Compiled once, at construction.
+    """
+
+    def __init__(self, signals: Iterable[Signal]):
+        self.signals: Dict[int, List[Signal]] = {}
+        for signal in signals:
+            self.signals.setdefault(signal.did, []).append(signal)
+
+        self._fields: Dict[int, List[_Field]] = {}
+        self.sizes: Dict[int, int] = {}
+        for did, did_signals in self.signals.items():
+            fields = []
+            for s in did_signals:
+                end = s.byte + s.byte_count
+                scaled = s.factor != 1 or s.offset != 0
+                all_ff = (1 << (8 * s.byte_count)) - 1 if s.ff_invalid else None
+                fields.append((s.name, s.byte, end, s.bit, (1 << s.length) - 1, s.factor, s.offset, scaled, all_ff))
+            self._fields[did] = fields
+            self.sizes[did] = max(f[2] for f in fields)
+
+    def units(self, did: int) -> Dict[str, str]:
+        """Unit of every signal of a DID, keyed by signal name."""
+        return {s.name: s.unit for s in self.signals[did]}
+
+    def decode(self, did: int, data: bytes) -> Dict[str, SignalValue]:
+        """Decode one DID payload.
+
+        :param did: The DID the payload belongs to.
+        :param data: The DID payload, without the DID number.
+
+        :raises KeyError: If the DID is not in the signal table.
+        :raises ValueError: If the payload is shorter than the DID layout.
+        """
+        if len(data) < self.sizes[did]:
+            raise ValueError(f"DID {hex(did)} payload needs {self.sizes[did]} bytes but got {len(data)}")
+
+        values: Dict[str, SignalValue] = {}
+        for name, start, end, shift, mask, factor, offset, scaled, all_ff in self._fields[did]:
+            raw = data[start] if end - start == 1 else int.from_bytes(data[start:end], "big")
+            if raw == all_ff:
+                values[name] = INVALID
+                continue
+            raw = (raw >> shift) & mask
+            values[name] = raw * factor + offset if scaled else raw
+        return values
+
+    def decode_all(self, payloads: Dict[int, bytes]) -> Dict[int, Dict[str, SignalValue]]:
+        """Decode several DID payloads, keyed by DID."""
+        return {did: self.decode(did, data) for did, data in payloads.items()}
+
+    def decode_bulk(self, did: int, buffer) -> BulkDecoded:
+        """Decode N back-to-back payloads of one DID in a single vectorized pass.
+
+        :param did: The DID all payloads belong to.
+        :param buffer: Any object supporting the buffer protocol (bytes, bytearray,
+            memoryview, mmap) holding N payloads of ``sizes[did]`` bytes each.
+
+        :raises KeyError: If the DID is not in the signal table.
+        :raises ValueError: If the buffer length is not a multiple of the payload size.
+        """
+        if _import_numpy_err is not None:
+            raise _import_numpy_err
+
+        size = self.sizes[did]
+        records = np.frombuffer(buffer, dtype=np.uint8)
+        if len(records) % size != 0:
+            raise ValueError(f"Buffer of {len(records)} bytes is not a whole number of {size} bytes DID {hex(did)} payloads")
+        records = records.reshape(-1, size)
+
+        values = {}
+        valid = {}
+        for name, start, end, shift, mask, factor, offset, scaled, all_ff in self._fields[did]:
+            if end - start == 1:
+                raw = records[:, start].astype(np.int64)
+            else:
+                raw = np.zeros(len(records), dtype=np.int64)
+                for column in range(start, end):
+                    raw = (raw << 8) | records[:, column]
+            if all_ff is not None:
+                valid[name] = raw != all_ff
+            if shift or mask != (1 << (8 * (end - start))) - 1:
+                raw = (raw >> shift) & mask
+            values[name] = raw * factor + offset if scaled else raw
+        return BulkDecoded(did, len(records), values, valid)
+
+
+FOXPI_DECODER = SignalDecoder(FOXPI_SIGNALS)
@@ -2,17 +2,21 @@ from uds.client import DoIPClient
 from uds.connection import DoIPConnection as DoIPClientUDSConnector
 from uds.client_config import client_config
 from uds.config import DOIP_SERVER_IP, DOIP_DEFAULT_LOGICAL_ADDRESS
+from uds.driving_ctrl import DrivingCtrlEncoder
+from uds.session import SessionManager
 from udsoncan.client import Client
-from udsoncan.services import *
 import datetime
 import os
-import math
+from typing import Optional
 
 
 class FoxPiWriteDID:
 
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, session: Optional[SessionManager] = None):
         self.client = client
+        # Changes the session and unlocks the ECU only when needed, instead of before each write
+        self.session = session if session is not None else SessionManager(client)
+        self.encoder = DrivingCtrlEncoder()
 
     def debug_print(self,msg):
         print(f"\033[34m{datetime.datetime.now()}\033[0m: {msg}")
@@ -21,62 +25,12 @@ class FoxPiWriteDID:
 
         try:
             
-            if len(user_input) != 14:
-                raise ValueError(f"\033[91mFoxPi_Driving_Ctrl Input must contain exactly 14 values but you only provided {len(user_input)} values.\033[0m")
-            
-            DID_list = [int(x) if isinstance(x, float) and x.is_integer() else x for x in user_input]#to convert all elements to int, if they are float and integer, otherwise keep as is
-
-            Value_limit = [
-                (0, -15, 10.55, "Acceleration Request"),
-                (1, 0, 1, "Acceleration Request A"),
-                (2, 0, 255.875, "Target Speed Request"),
-                (3, 0, 1, "Target Speed Request A"),
-                (4, 0, 1, "Angle Target Valid"),
-                (5, 0, 1, "Angle Target Request"),
-                (6, -900, 900, "Angle Target"),
-                (7, 0, 1, "Torque Target Valid"),
-                (8, 0, 1, "Torque Target Request"),
-                (9, -10, 10, "Torque Target"),
-                (10, 0, 1, "APS_flg"),
-                (11, 0, 4, "VINP_APSStaSystem_enum"),
-                (12, 0, 7, "VINP_APSShiftPosnReq_enum"),
-                (13, 0, 20, "VINP_APSSpeedCMD_kph"),
-            ]
-
-            for idx, min, max, name in Value_limit:
-                idx_value = DID_list[idx]
-                if not (min <=idx_value <= max):
-                    raise ValueError(f"\033[91mFoxPi_Driving_Ctrl {name}[{idx}] must be between \033[33m{min} \033[91mand \033[33m{max} \033[91mbut you provided <{idx_value}>\033[0m")
-
-            # <<4 is means shift left by 4 bits, <<1 is shift left by 1 bit
-            # 0 0 0 0 0 0 0 0
-            # 7 6 5 4 3 2 1 0
-            # 7 6 5 4, << 4
-            # 3 2 1, << 1
-            APS_bit = (DID_list[12] << 4) | (DID_list[11] << 1) | DID_list[10] # | is bitwise OR operation combining the bits into a single byte
-
-            byte_list = [
-                math.floor((DID_list[0]-(-15))/0.05).to_bytes(3, byteorder="big"), #math.floor rounds down to the nearest integer, ACCReq = 3byte
-                math.floor(DID_list[1]).to_bytes(1, byteorder="big"), #ACCReq_A = 1byte
-                math.floor(DID_list[2]/0.125).to_bytes(3, byteorder="big"), #TargetSpdReq = 3byte
-                math.floor(DID_list[3]).to_bytes(1, byteorder="big"), #TargetSpdReq_A = 1byte
-                math.floor(DID_list[4]).to_bytes(1, byteorder="big"),#Angle_Target_Valid = 1byte
-                math.floor(DID_list[5]).to_bytes(1,byteorder="big"), #Angle_Target_Req= 1byte
-                math.floor((DID_list[6]-(-900))/0.1).to_bytes(4, byteorder="big"), #Angle_Target = 4byte
-                math.floor(DID_list[7]).to_bytes(1, byteorder="big"), #Torque_Target_Valid = 1byte
-                math.floor(DID_list[8]).to_bytes(1, byteorder="big"), #Torque_Target_Req = 1byte
-                math.floor((DID_list[9]-(-10))/0.01).to_bytes(3, byteorder="big"), #Torque_Target = 3byte
-                APS_bit.to_bytes(1, byteorder="big"),  # APS = 1byte
-                math.floor(DID_list[13]/0.125).to_bytes(1, byteorder="big") #VINP_APSSpeedCMD_kph = 1byte
-            ] # all 21 bytes for FoxPi_Driving_Ctrl
-
-            merged_bytes = b''.join(byte_list)
+            # Checks the 14 values and packs them with the layout of uds.driving_ctrl
+            merged_bytes = bytes(self.encoder.encode(user_input))
 
             print(f"Processed input: {merged_bytes}")
 
-            response = client.change_session(DiagnosticSessionControl.Session.extendedDiagnosticSession)
-            response = client.unlock_security_access(1)
-            response = client.write_data_by_identifier(0x1001, merged_bytes)
+            response = self.session.write_data_by_identifier(0x1001, merged_bytes)
 
             self.debug_print(f"The response sevice is {response.service_data}, data is {response.data.hex()}")
 
@@ -170,9 +124,7 @@ class FoxPiWriteDID:
             merged_bytes = b''.join(byte_list)
             print(f"Merged bytes: {merged_bytes}")
 
-            response = client.change_session(DiagnosticSessionControl.Session.extendedDiagnosticSession)
-            response = client.unlock_security_access(1)
-            response = client.write_data_by_identifier(0x100C, merged_bytes)
+            response = self.session.write_data_by_identifier(0x100C, merged_bytes)
 
             self.debug_print(f"The response sevice is {response.service_data}, data is {response.data.hex()}")
 
@@ -194,9 +146,7 @@ class FoxPiWriteDID:
                 raise ValueError(f"\033[91mFoxPi_Ctrl_Enable_Switch Input must be either 0 or 1 but you provided {user_input[0]}\033[0m")
 
             Ctrl_Enable = user_input[0].to_bytes(1, byteorder="big")
-            response = client.change_session(DiagnosticSessionControl.Session.extendedDiagnosticSession)
-            response = client.unlock_security_access(1)
-            response = client.write_data_by_identifier(0x1012, Ctrl_Enable)
+            response = self.session.write_data_by_identifier(0x1012, Ctrl_Enable)
 
             self.debug_print(f"The response sevice is {response.service_data}, data is {response.data.hex()}")
 
@@ -212,9 +162,7 @@ class FoxPiWriteDID:
             data_toFF = bytes([0xff]*21)
             print(f"Processed input: {data_toFF}")
 
-            response = client.change_session(DiagnosticSessionControl.Session.extendedDiagnosticSession)
-            response = client.unlock_security_access(1)
-            response = client.write_data_by_identifier(0x1001, data_toFF)
+            response = self.session.write_data_by_identifier(0x1001, data_toFF)
 
             self.debug_print(f"The response sevice is {response.service_data}, data is {response.data.hex()}")
 
@@ -234,9 +182,9 @@ os.environ["RUST_LOG"] = "trace"
 doip_client = DoIPClient(DOIP_SERVER_IP, DOIP_DEFAULT_LOGICAL_ADDRESS)
 uds_connection = DoIPClientUDSConnector(doip_client)
 assert uds_connection.is_open
-with Client(uds_connection, request_timeout=4, config=client_config()) as client:
+with Client(uds_connection, request_timeout=4, config=client_config()) as client, SessionManager(client, memoize_keys=True) as session:
 
-    FoxPi = FoxPiWriteDID(client)
+    FoxPi = FoxPiWriteDID(client, session)
     #FoxPi.FoxPi_Driving_Ctrl(user_input=[-10, 1, 255.875, 1, 1, 1, -900, 1, 1, -10, 1, 4, 7, 20])
     #FoxPi.FoxPi_Lamp_Ctrl(user_input=[1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,7,63,100,7])
     FoxPi.Driving_Ctrl_toFF()
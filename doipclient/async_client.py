@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import ssl
+from .client import DoIPClient, Parser
+from .constants import A_PROCESSING_TIME, TCP_DATA_UNSECURED
+from .messages import *
+
+logger = logging.getLogger("doipclient")
+
+
+class _DoIPProtocol(asyncio.Protocol):
+    """asyncio protocol feeding the received TCP stream to a Parser"""
+
+    def __init__(self, client):
+        self._client = client
+        self._parser = Parser()
+
+    def connection_made(self, transport):
+        self._client._transport = transport
+
+    def data_received(self, data):
+        # A single read can hold several DoIP messages, or only part of one
+        for message in self._parser.read_messages(data):
+            self._client._message_received(message)
+
+    def connection_lost(self, exc):
+        self._client._connection_lost(exc)
+
+
+class AsyncDoIPClient:
+    """An asyncio version of :class:`DoIPClient<doipclient.DoIPClient>` for the TCP_DATA connection.
+
+    The connection is handled by the event loop: no thread and no polling is needed, so one
+    process can hold many connections. Use :meth:`connect` to create an instance.
+
+    Only one diagnostic request is sent at a time; concurrent callers wait for the previous
+    request to be acknowledged by the ECU.
+
+    :param ecu_logical_address: The logical address of the target ECU.
+    :type ecu_logical_address: int
+    :param protocol_version: The DoIP protocol version to use for communication.
+    :type protocol_version: int
+    :param client_logical_address: The logical address that this DoIP client will use to identify itself.
+    :type client_logical_address: int
+    """
+
+    def __init__(
+        self,
+        ecu_logical_address,
+        protocol_version=0x02,
+        client_logical_address=0x0E00,
+    ):
+        self._ecu_logical_address = ecu_logical_address
+        self._protocol_version = protocol_version
+        self._client_logical_address = client_logical_address
+        self._transport = None
+        self._close_exception = None
+        self._diagnostic_queue = asyncio.Queue()
+        self._control_queue = asyncio.Queue()
+        self._send_lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(
+        cls,
+        ecu_ip_address,
+        ecu_logical_address,
+        tcp_port=TCP_DATA_UNSECURED,
+        activation_type=RoutingActivationRequest.ActivationType.Default,
+        protocol_version=0x02,
+        client_logical_address=0x0E00,
+        client_ip_address=None,
+        use_secure=False,
+    ):
+        """Open the TCP_DATA connection to the ECU and request routing activation.
+
+        Parameters are the same as for :class:`DoIPClient<doipclient.DoIPClient>`.
+
+        :return: The connected client
+        :rtype: AsyncDoIPClient
+        :raises ConnectionRefusedError: If the activation request fails
+        """
+        client = cls(ecu_logical_address, protocol_version, client_logical_address)
+
+        ssl_context = None
+        if use_secure:
+            if isinstance(use_secure, ssl.SSLContext):
+                ssl_context = use_secure
+            else:
+                ssl_context = ssl.create_default_context()
+
+        loop = asyncio.get_running_loop()
+        await loop.create_connection(
+            lambda: _DoIPProtocol(client),
+            ecu_ip_address,
+            tcp_port,
+            ssl=ssl_context,
+            local_addr=(client_ip_address, 0) if client_ip_address is not None else None,
+        )
+
+        if activation_type is not None:
+            try:
+                result = await client.request_activation(activation_type)
+            except BaseException:
+                client.close()
+                raise
+            if result.response_code != RoutingActivationResponse.ResponseCode.Success:
+                client.close()
+                raise ConnectionRefusedError(
+                    f"Activation Request failed with code {result.response_code}"
+                )
+        return client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        self.close()
+
+    def _message_received(self, message):
+        if type(message) == DiagnosticMessage:
+            self._diagnostic_queue.put_nowait(message)
+        elif type(message) == AliveCheckRequest:
+            logger.warning("Responding to an alive check")
+            self.send_doip_message(AliveCheckResponse(self._client_logical_address))
+        else:
+            self._control_queue.put_nowait(message)
+
+    def _connection_lost(self, exc):
+        logger.debug("Peer has closed the connection.")
+        self._close_exception = exc
+        self._transport = None
+        # Wake up every reader
+        self._diagnostic_queue.put_nowait(None)
+        self._control_queue.put_nowait(None)
+
+    async def _get(self, queue, timeout):
+        try:
+            message = await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("ECU failed to respond in time")
+        if message is None:
+            queue.put_nowait(None)  # Keep the connection closed for the next reader
+            raise ConnectionResetError("DoIP connection is closed") from self._close_exception
+        return message
+
+    async def read_doip(self, timeout=A_PROCESSING_TIME):
+        """Wait for the next DoIP message that is not a diagnostic message.
+
+        :param timeout: Maximum time allowed for response from ECU
+        :type timeout: float, optional
+        :raises IOError: If DoIP layer fails with negative acknowledgement
+        :raises TimeoutError: If ECU fails to respond in time
+        """
+        response = await self._get(self._control_queue, timeout)
+        if type(response) == GenericDoIPNegativeAcknowledge:
+            raise IOError(f"DoIP Negative Acknowledge. NACK Code: {response.nack_code}")
+        return response
+
+    def is_open(self):
+        return self._transport is not None and not self._transport.is_closing()
+
+    def send_doip(self, payload_type, payload_data):
+        """Adds the correct DoIP header to the payload and writes it to the connection.
+
+        :param payload_type: The payload type (see Table 17 "Overview of DoIP payload types" in ISO-13400
+        :type payload_type: int
+        """
+        if self._transport is None:
+            raise ConnectionResetError("DoIP connection is closed") from self._close_exception
+        data_bytes = DoIPClient._pack_doip(self._protocol_version, payload_type, payload_data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Sending DoIP Message: Type: 0x{:X}, Payload Size: {}, Payload: {}".format(
+                    payload_type,
+                    len(payload_data),
+                    " ".join(f"{byte:02X}" for byte in payload_data),
+                )
+            )
+        self._transport.write(data_bytes)
+
+    def send_doip_message(self, doip_message):
+        """Packs the given message and adds the correct DoIP header before writing it to the connection
+
+        :param doip_message: DoIP message object
+        :type doip_message: object
+        """
+        payload_type = payload_message_to_type[type(doip_message)]
+        self.send_doip(payload_type, doip_message.pack())
+
+    async def request_activation(self, activation_type, vm_specific=None):
+        """Requests a given activation type from the ECU for this connection using payload type 0x0005
+
+        :param activation_type: The type of activation to request
+        :type activation_type: RoutingActivationRequest.ActivationType
+        :param vm_specific: Optional 4 byte long int
+        :type vm_specific: int, optional
+        :return: The resulting activation response object
+        :rtype: RoutingActivationResponse
+        """
+        message = RoutingActivationRequest(
+            self._client_logical_address, activation_type, vm_specific=vm_specific
+        )
+        self.send_doip_message(message)
+        while True:
+            result = await self.read_doip()
+            if type(result) == RoutingActivationResponse:
+                return result
+            logger.warning(
+                "Received unexpected DoIP message type {}. Ignoring".format(type(result))
+            )
+
+    async def send_diagnostic(self, diagnostic_payload, timeout=A_PROCESSING_TIME):
+        """Send a raw diagnostic payload (ie: UDS) to the ECU and wait for its acknowledgement.
+
+        :param diagnostic_payload: UDS payload to transmit to the ECU
+        :type diagnostic_payload: bytes
+        :raises IOError: DoIP negative acknowledgement received
+        :raises TimeoutError: No acknowledgement received in time
+        """
+        await self.send_diagnostic_to_address(
+            self._ecu_logical_address, diagnostic_payload, timeout
+        )
+
+    async def send_diagnostic_to_address(
+        self, address, diagnostic_payload, timeout=A_PROCESSING_TIME
+    ):
+        """Send a raw diagnostic payload (ie: UDS) to the specified address and wait for its acknowledgement.
+
+        :param address: The logical address to send the diagnostic payload to
+        :type address: int
+        :param diagnostic_payload: UDS payload to transmit to the ECU
+        :type diagnostic_payload: bytes
+        :raises IOError: DoIP negative acknowledgement received
+        :raises TimeoutError: No acknowledgement received in time
+        """
+        message = DiagnosticMessage(
+            self._client_logical_address, address, bytes(diagnostic_payload)
+        )
+        async with self._send_lock:
+            self.send_doip_message(message)
+            while True:
+                result = await self.read_doip(timeout)
+                if type(result) == DiagnosticMessageNegativeAcknowledgement:
+                    raise IOError(
+                        "Diagnostic request rejected with negative acknowledge code: {}".format(
+                            result.nack_code
+                        )
+                    )
+                elif type(result) == DiagnosticMessagePositiveAcknowledgement:
+                    return
+                logger.warning(
+                    "Received unexpected DoIP message type {}. Ignoring".format(type(result))
+                )
+
+    async def receive_diagnostic(self, timeout=None):
+        """Receive a raw diagnostic payload (ie: UDS) from the ECU.
+
+        :return: Raw UDS payload
+        :rtype: bytearray
+        :raises TimeoutError: No diagnostic response received in time
+        """
+        message = await self._get(self._diagnostic_queue, timeout)
+        return message.user_data
+
+    def empty_rxqueue(self):
+        """Drop the diagnostic messages received but not read yet"""
+        while not self._diagnostic_queue.empty():
+            if self._diagnostic_queue.get_nowait() is None:
+                self._diagnostic_queue.put_nowait(None)
+                break
+
+    def close(self):
+        """Close the DoIP connection"""
+        if self._transport is not None:
+            self._transport.close()
@@ -17,6 +17,13 @@ from .messages import *
 
 logger = logging.getLogger("doipclient")
 
+# Default size of the buffer socket reads are done into. Holds a 4 KB diagnostic message with
+# its headers, plus whatever the ECU sent right behind it.
+DEFAULT_RX_BUFFER_SIZE = 8192
+# Largest buffer request_entity_status() grows to. One read never returns more than the socket
+# receive buffer holds, and entities may report 0xFFFFFFFF as an unlimited max data size.
+MAX_RX_BUFFER_SIZE = 65536
+
 
 class Parser:
     """Implements state machine for DoIP transport layer.
@@ -25,86 +32,93 @@ class Parser:
     is reliable, the UDP broadcasts are not, so the state machine is a little more defensive
     than one might otherwise expect. When using TCP, reads from the socket aren't guaranteed
     to be exactly one DoIP message, so the running buffer needs to be maintained across reads
+
+    Received bytes are appended to ``rx_buffer`` and consumed by moving a read offset, so
+    parsing a message costs the same whatever the amount of data buffered behind it. The
+    consumed part of the buffer is released once everything is read, or when it is larger
+    than what remains.
     """
 
-    class ParserState(IntEnum):
-        READ_PROTOCOL_VERSION = 1
-        READ_INVERSE_PROTOCOL_VERSION = 2
-        READ_PAYLOAD_TYPE = 3
-        READ_PAYLOAD_SIZE = 4
-        READ_PAYLOAD = 5
+    HEADER = struct.Struct("!BBHL")
 
     def __init__(self):
         self.reset()
 
     def reset(self):
         self.rx_buffer = bytearray()
+        self._offset = 0
         self.protocol_version = None
         self.payload_type = None
         self.payload_size = None
-        self.payload = bytearray()
-        self._state = Parser.ParserState.READ_PROTOCOL_VERSION
 
     def push_bytes(self, data_bytes):
         self.rx_buffer += data_bytes
 
     def read_message(self, data_bytes):
+        """Append data_bytes to the buffer and return the next complete message, or None"""
         self.rx_buffer += data_bytes
-        if self._state == Parser.ParserState.READ_PROTOCOL_VERSION:
-            if len(self.rx_buffer) >= 1:
-                self.payload = bytearray()
-                self.payload_type = None
-                self.payload_size = None
-                self.protocol_version = int(self.rx_buffer.pop(0))
-                self._state = Parser.ParserState.READ_INVERSE_PROTOCOL_VERSION
-
-        if self._state == Parser.ParserState.READ_INVERSE_PROTOCOL_VERSION:
-            if len(self.rx_buffer) >= 1:
-                inverse_protocol_version = int(self.rx_buffer.pop(0))
-                if inverse_protocol_version != (0xFF ^ self.protocol_version):
-                    logger.warning(
-                        "Bad DoIP Header - Inverse protocol version does not match. Ignoring."
-                    )
-                    # Bad protocol version inverse - shift the buffer forward
-                    self.protocol_version = inverse_protocol_version
-                else:
-                    self._state = Parser.ParserState.READ_PAYLOAD_TYPE
-
-        if self._state == Parser.ParserState.READ_PAYLOAD_TYPE:
-            if len(self.rx_buffer) >= 2:
-                self.payload_type = self.rx_buffer.pop(0) << 8
-                self.payload_type |= self.rx_buffer.pop(0)
-                self._state = Parser.ParserState.READ_PAYLOAD_SIZE
-
-        if self._state == Parser.ParserState.READ_PAYLOAD_SIZE:
-            if len(self.rx_buffer) >= 4:
-                self.payload_size = self.rx_buffer.pop(0) << 24
-                self.payload_size |= self.rx_buffer.pop(0) << 16
-                self.payload_size |= self.rx_buffer.pop(0) << 8
-                self.payload_size |= self.rx_buffer.pop(0)
-                self._state = Parser.ParserState.READ_PAYLOAD
-
-        if self._state == Parser.ParserState.READ_PAYLOAD:
-            remaining_bytes = self.payload_size - len(self.payload)
-            self.payload += self.rx_buffer[:remaining_bytes]
-            self.rx_buffer = self.rx_buffer[remaining_bytes:]
-            if len(self.payload) == self.payload_size:
-                self._state = Parser.ParserState.READ_PROTOCOL_VERSION
+        return self._next_message()
+
+    def read_messages(self, data_bytes):
+        """Append data_bytes to the buffer and yield every complete message available"""
+        self.rx_buffer += data_bytes
+        message = self._next_message()
+        while message is not None:
+            yield message
+            message = self._next_message()
+
+    def _next_message(self):
+        rx_buffer = self.rx_buffer
+        header_size = self.HEADER.size
+        while len(rx_buffer) - self._offset >= header_size:
+            (
+                self.protocol_version,
+                inverse_protocol_version,
+                self.payload_type,
+                self.payload_size,
+            ) = self.HEADER.unpack_from(rx_buffer, self._offset)
+            if inverse_protocol_version != (0xFF ^ self.protocol_version):
+                logger.warning(
+                    "Bad DoIP Header - Inverse protocol version does not match. Ignoring."
+                )
+                # Bad protocol version inverse - shift the buffer forward
+                self._offset += 1
+                continue
+
+            payload_start = self._offset + header_size
+            payload_end = payload_start + self.payload_size
+            if len(rx_buffer) < payload_end:
+                break
+            payload = rx_buffer[payload_start:payload_end]
+            self._offset = payload_end
+            self._compact()
+
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
                     "Received DoIP Message. Type: 0x{:X}, Payload Size: {} bytes, Payload: {}".format(
                         self.payload_type,
                         self.payload_size,
-                        " ".join(f"{byte:02X}" for byte in self.payload),
+                        " ".join(f"{byte:02X}" for byte in payload),
                     )
                 )
-                try:
-                    return payload_type_to_message[self.payload_type].unpack(
-                        self.payload, self.payload_size
-                    )
-                except KeyError:
-                    return ReservedMessage.unpack(
-                        self.payload_type, self.payload, self.payload_size
-                    )
+            try:
+                return payload_type_to_message[self.payload_type].unpack(
+                    payload, self.payload_size
+                )
+            except KeyError:
+                return ReservedMessage.unpack(
+                    self.payload_type, payload, self.payload_size
+                )
+        self._compact()
+        return None
+
+    def _compact(self):
+        if self._offset == len(self.rx_buffer):
+            self.rx_buffer.clear()
+            self._offset = 0
+        elif self._offset > len(self.rx_buffer) // 2:
+            del self.rx_buffer[: self._offset]
+            self._offset = 0
 
 
 class DoIPClient:
@@ -149,6 +163,13 @@ class DoIPClient:
     :type log_level: int
     :param auto_reconnect_tcp: Attempt to automatically reconnect TCP sockets that were closed by peer
     :type auto_reconnect_tcp: bool
+    :param rx_buffer_size: Size of the preallocated buffer that socket reads are done into. Every read
+        takes whatever is available, up to this size, in one syscall. Grown to the max data size
+        reported by the entity, up to MAX_RX_BUFFER_SIZE, when request_entity_status() is called.
+    :type rx_buffer_size: int, optional
+
+    The ``rx_syscalls``, ``rx_bytes``, ``tx_syscalls`` and ``tx_bytes`` attributes count the socket
+    calls made and bytes transferred, for profiling. ``reset_io_counters()`` sets them back to 0.
 
     :raises ConnectionRefusedError: If the activation request fails
     :raises ValueError: If the IPAddress is neither an IPv4 nor an IPv6 address
@@ -166,7 +187,10 @@ class DoIPClient:
         client_ip_address=None,
         use_secure=False,
         auto_reconnect_tcp=False,
+        rx_buffer_size=DEFAULT_RX_BUFFER_SIZE,
     ):
+        self._rx_buffer = bytearray(rx_buffer_size)
+        self.reset_io_counters()
         self._ecu_logical_address = ecu_logical_address
         self._client_logical_address = client_logical_address
         self._client_ip_address = client_ip_address
@@ -207,6 +231,35 @@ class DoIPClient:
     def __exit__(self, type, value, traceback):
         self.close()
 
+    def reset_io_counters(self):
+        """Set the syscall and byte counters back to 0"""
+        self.rx_syscalls = 0
+        self.rx_bytes = 0
+        self.tx_syscalls = 0
+        self.tx_bytes = 0
+
+    @property
+    def rx_buffer_size(self):
+        return len(self._rx_buffer)
+
+    def set_rx_buffer_size(self, size):
+        """Replace the buffer that socket reads are done into
+
+        :param size: New size of the buffer, in bytes
+        :type size: int
+        """
+        self._rx_buffer = bytearray(size)
+
+    def _recv(self, sock):
+        """Read whatever is available on the socket, up to the size of the receive buffer, in one syscall.
+
+        The returned view is only valid until the next read.
+        """
+        size = sock.recv_into(self._rx_buffer)
+        self.rx_syscalls += 1
+        self.rx_bytes += size
+        return memoryview(self._rx_buffer)[:size]
+
     @staticmethod
     def _create_udp_socket(
         ipv6=False, udp_port=UDP_DISCOVERY, timeout=None, source_interface=None
@@ -291,6 +344,7 @@ class DoIPClient:
         start_time = time.time()
 
         parser = Parser()
+        rx_buffer = bytearray(DEFAULT_RX_BUFFER_SIZE)
 
         if not sock:
             sock = cls._create_udp_socket(
@@ -312,7 +366,8 @@ class DoIPClient:
                     remaining = timeout - duration
                     sock.settimeout(remaining)
             try:
-                data, addr = sock.recvfrom(1024)
+                size, addr = sock.recvfrom_into(rx_buffer)
+                data = memoryview(rx_buffer)[:size]
             except socket.timeout:
                 raise TimeoutError(
                     "Timed out waiting for Vehicle Announcement broadcast"
@@ -426,7 +481,7 @@ class DoIPClient:
                 else:
                     try:
                         if transport == DoIPClient.TransportType.TRANSPORT_TCP:
-                            data = self._tcp_sock.recv(1024)
+                            data = self._recv(self._tcp_sock)
                             if len(data) == 0:
                                 logger.debug("Peer has closed the connection.")
                                 self._tcp_close_detected = True
@@ -434,7 +489,7 @@ class DoIPClient:
                             # "Only one DoIP message shall be transmitted by any DoIP entity
                             # per UDP datagram", so reset the UDP parser for each recv()
                             self._udp_parser.reset()
-                            data = self._udp_sock.recv(1024)
+                            data = self._recv(self._udp_sock)
                     except socket.timeout:
                         pass
         raise TimeoutError("ECU failed to respond in time")
@@ -457,7 +512,7 @@ class DoIPClient:
         try:
             self._tcp_sock.settimeout(first_timeout)
             while True:
-                data = self._tcp_sock.recv(1024)
+                data = self._recv(self._tcp_sock)
                 if len(data) == 0:
                     logger.debug("TCP Connection closed by ECU, attempting to reset")
                     self._tcp_close_detected = True
@@ -497,13 +552,14 @@ class DoIPClient:
         retry = self._auto_reconnect_tcp and not disable_retry
 
         data_bytes = self._pack_doip(self._protocol_version, payload_type, payload_data)
-        logger.debug(
-            "Sending DoIP Message: Type: 0x{:X}, Payload Size: {}, Payload: {}".format(
-                payload_type,
-                len(payload_data),
-                " ".join(f"{byte:02X}" for byte in payload_data),
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Sending DoIP Message: Type: 0x{:X}, Payload Size: {}, Payload: {}".format(
+                    payload_type,
+                    len(payload_data),
+                    " ".join(f"{byte:02X}" for byte in payload_data),
+                )
             )
-        )
 
         # The ECU is well within its rights to have closed the socket since we last sent it data -
         # particularly if the tester has been quiet for a while. For TCP there's two possibilities
@@ -536,6 +592,7 @@ class DoIPClient:
                         )
 
                 remaining -= self._tcp_sock.send(data_bytes[-remaining:])
+                self.tx_syscalls += 1
 
                 if retry and not self._tcp_close_detected:
                     self._tcp_socket_check()
@@ -546,6 +603,8 @@ class DoIPClient:
                 remaining -= self._udp_sock.sendto(
                     data_bytes[-remaining:], (self._ecu_ip_address, self._udp_port)
                 )
+                self.tx_syscalls += 1
+        self.tx_bytes += len(data_bytes)
 
     def send_doip_message(
         self,
@@ -688,6 +747,11 @@ class DoIPClient:
         while True:
             result = self.read_doip(transport=DoIPClient.TransportType.TRANSPORT_UDP)
             if type(result) == EntityStatusResponse:
+                if result.max_data_size is not None:
+                    # Fit the largest message the entity handles in a single read
+                    size = min(result.max_data_size + Parser.HEADER.size, MAX_RX_BUFFER_SIZE)
+                    if size > self.rx_buffer_size:
+                        self.set_rx_buffer_size(size)
                 return result
             elif result:
                 logger.warning(
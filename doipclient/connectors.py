@@ -1,4 +1,6 @@
-from udsoncan.connections import BaseConnection
+import asyncio
+
+from udsoncan.connections import BaseConnection, AsyncBaseConnection
 from udsoncan.exceptions import TimeoutException
 
 
@@ -54,3 +56,54 @@ class DoIPClientUDSConnector(BaseConnection):
 
     def empty_txqueue(self):
         self._connection.empty_txqueue()
+
+
+class AsyncDoIPClientUDSConnector(AsyncBaseConnection):
+    """
+    A connector for :class:`AsyncClient<udsoncan.async_client.AsyncClient>` which uses an :class:`AsyncDoIPClient<doipclient.async_client.AsyncDoIPClient>`
+    as a DoIP transport layer for UDS.
+
+    :param doip_layer: The asyncio DoIP Transport layer object.
+    :type doip_layer: :class:`AsyncDoIPClient<doipclient.async_client.AsyncDoIPClient>`
+
+    :param name: This name is included in the logger name so that its output can be redirected. The logger name will be ``Connection[<name>]``
+    :type name: string
+
+    :param close_connection: True if the wrapper's close() function should close the associated DoIP client. This is not the default
+    :type name: bool
+
+    """
+
+    def __init__(self, doip_layer, name=None, close_connection=False):
+        AsyncBaseConnection.__init__(self, name)
+        self._connection = doip_layer
+        self._close_connection = close_connection
+        self.opened = False
+
+    async def open(self):
+        self.opened = True
+        return self
+
+    async def close(self):
+        if self._close_connection:
+            self._connection.close()
+        self.opened = False
+
+    def is_open(self):
+        return self.opened and self._connection.is_open()
+
+    async def specific_send(self, payload, timeout=None):
+        # The timeout covers the wait for the DoIP acknowledgement too
+        try:
+            await asyncio.wait_for(self._connection.send_diagnostic(payload), timeout)
+        except (TimeoutError, asyncio.TimeoutError) as e:
+            raise TimeoutException("Did not send the request in time (timeout=%s sec)" % timeout) from e
+
+    async def specific_wait_frame(self, timeout=2):
+        try:
+            return bytes(await self._connection.receive_diagnostic(timeout=timeout))
+        except TimeoutError as e:
+            raise TimeoutException(str(e)) from e
+
+    def empty_rxqueue(self):
+        self._connection.empty_rxqueue()
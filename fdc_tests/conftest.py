@@ -1,21 +1,24 @@
 from uds.client import DoIPClient, ActivationType
-from doipclient import DoIPClient as pyDoIPClient
-from uds.config import DOIP_SERVER_IP
+from uds.discovery import DiscoveryService
+import os
 import pytest
 
 
+@pytest.fixture(scope="session")
+def discovery():
+    """Shared by every test module, so that the DoIP entity is only looked for once.
+    Set DOIP_DISCOVERY_CACHE to a JSON file to share it between test sessions too."""
+    return DiscoveryService(cache_path=os.environ.get("DOIP_DISCOVERY_CACHE"))
+
+
 @pytest.fixture(scope="module")
-def doip_client(request):
-    address, response = pyDoIPClient.get_entity(
-        protocol_version=0xFF, ecu_ip_address=DOIP_SERVER_IP
-    )
+def doip_client(request, discovery):
+    entity = discovery.find()
     print(
-        f"Found DoIP entity at {address} with logical address {response.logical_address}"
+        f"Found DoIP entity at {entity.ip} with logical address {entity.logical_address}"
     )
-    # The type of address is a tuple, and the DoIPClient expects a string with the IP address
-    # So we convert the tuple to a string and extract the IP address
-    target_ip = str(address[0])
-    target_logical_address = response.logical_address
+    target_ip = entity.ip
+    target_logical_address = entity.logical_address
 
     # Determine activation type based on test marker
     activation_type = ActivationType.Default
@@ -0,0 +1,184 @@
+"""Emulated ECUs shared by the offline tests: udsoncan connections answering requests without any I/O."""
+
+from uds.client_config import client_config
+from uds.session import SessionManager
+from udsoncan.client import Client
+from udsoncan.common.MemoryLocation import MemoryLocation
+from udsoncan.connections import BaseConnection
+from udsoncan.exceptions import TimeoutException
+import logging
+import queue
+
+ADDRESS = 0x00080000
+MAX_LENGTH = 0x402  # maxNumberOfBlockLength: SID + block sequence counter + 1024 bytes
+
+
+class FlashConnection(BaseConnection):
+    """Emulates the RequestDownload, TransferData and RequestTransferExit services of an ECU, without any I/O"""
+
+    def __init__(self, size, max_length=MAX_LENGTH):
+        BaseConnection.__init__(self, "Flash")
+        self.memory = bytearray(size)
+        self.max_length = max_length
+        self.rxqueue = queue.Queue()
+        self.active = False
+        self.pointer = 0
+        self.next_sequence_number = 1
+        self.transfer_data_count = 0
+        self.download_requests = []
+        self.drop = set()  # TransferData requests answered by nothing
+        self.busy = set()  # TransferData requests answered by BusyRepeatRequest
+        self.disconnect_at = None  # TransferData request raising ConnectionError
+
+    def specific_send(self, payload):
+        sid = payload[0]
+        if sid == 0x34:
+            address_length = payload[2] & 0xF
+            size_length = payload[2] >> 4
+            address = int.from_bytes(payload[3:3 + address_length], "big")
+            size = int.from_bytes(payload[3 + address_length:3 + address_length + size_length], "big")
+            self.download_requests.append((address, size))
+            self.active = True
+            self.pointer = address - ADDRESS
+            self.next_sequence_number = 1
+            self.rxqueue.put(b"\x74\x20" + self.max_length.to_bytes(2, "big"))
+        elif sid == 0x36:
+            self.transfer_data_count += 1
+            if self.transfer_data_count == self.disconnect_at:
+                raise ConnectionError("Connection lost")
+            if self.transfer_data_count in self.busy:
+                self.rxqueue.put(b"\x7f\x36\x21")
+                return
+            sequence_number = payload[1]
+            if not self.active:
+                response = b"\x7f\x36\x24"
+            elif sequence_number == self.next_sequence_number:
+                data = payload[2:]
+                self.memory[self.pointer:self.pointer + len(data)] = data
+                self.pointer += len(data)
+                self.next_sequence_number = (sequence_number + 1) & 0xFF
+                response = b"\x76" + payload[1:2]
+            elif sequence_number == (self.next_sequence_number - 1) & 0xFF:
+                response = b"\x76" + payload[1:2]  # Repeated block, already written
+            else:
+                response = b"\x7f\x36\x73"
+            if self.transfer_data_count not in self.drop:
+                self.rxqueue.put(response)
+        elif sid == 0x37:
+            self.active = False
+            self.rxqueue.put(b"\x77")
+
+    def specific_wait_frame(self, timeout=2):
+        try:
+            return self.rxqueue.get_nowait()
+        except queue.Empty:
+            raise TimeoutException("No response")
+
+    def open(self):
+        return self
+
+    def close(self):
+        pass
+
+    def empty_rxqueue(self):
+        while not self.rxqueue.empty():
+            self.rxqueue.get_nowait()
+
+    def is_open(self):
+        return True
+
+
+def make_image(size):
+    return bytes(i * 7 % 251 for i in range(size))
+
+
+def memory_location(size):
+    return MemoryLocation(ADDRESS, size, address_format=32, memorysize_format=32)
+
+
+class WriteConnection(FlashConnection):
+    """Emulates an ECU accepting WriteDataByIdentifier in the unlocked extended session only"""
+
+    def __init__(self, same_seed=False):
+        FlashConnection.__init__(self, 0)
+        self.same_seed = same_seed
+        self.session = 0x01
+        self.unlocked = False
+        self.seed = 0x12345678
+        self.requests = []
+        self.fail_next = False
+        self.logger.setLevel(logging.WARNING)
+
+    def reset(self):
+        self.session = 0x01
+        self.unlocked = False
+
+    def specific_send(self, payload):
+        self.requests.append(payload[0])
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("Connection lost")
+        sid = payload[0]
+        if sid == 0x10:
+            self.session = payload[1]
+            self.unlocked = False
+            self.rxqueue.put(b"\x50" + payload[1:2] + b"\x00\x32\x01\xf4")
+        elif sid == 0x27 and payload[1] == 0x01:
+            if not self.same_seed:
+                self.seed += 1
+            self.rxqueue.put(b"\x67\x01" + self.seed.to_bytes(4, "big"))
+        elif sid == 0x27 and payload[1] == 0x02:
+            self.unlocked = payload[2:] == self.seed.to_bytes(4, "big")[::-1]
+            self.rxqueue.put(b"\x67\x02" if self.unlocked else b"\x7f\x27\x35")
+        elif sid == 0x2E:
+            if self.session != 0x03:
+                self.rxqueue.put(b"\x7f\x2e\x7f")
+            elif not self.unlocked:
+                self.rxqueue.put(b"\x7f\x2e\x33")
+            else:
+                self.rxqueue.put(b"\x6e" + payload[1:3])
+        elif sid == 0x3E:
+            if payload[1] & 0x80 == 0:
+                self.rxqueue.put(b"\x7e\x00")
+
+
+def make_manager(conn, **kwargs):
+    config = client_config()
+    keys = []
+
+    def security_algo(level, seed, params=None):
+        keys.append(seed)
+        return seed[::-1]
+
+    config["security_algo"] = security_algo
+    client = Client(conn, config=config)
+    client.logger.setLevel(logging.WARNING)
+    return SessionManager(client, **kwargs), keys
+
+
+class LoopbackConnection(BaseConnection):
+    """Answers every ReadDataByIdentifier request with a positive response, without any I/O"""
+
+    def __init__(self, value=b"FOXTRONPI1"):
+        BaseConnection.__init__(self, "Loopback")
+        self.value = value
+        self.rxqueue = queue.Queue()
+
+    def specific_send(self, payload):
+        self.rxqueue.put(b"\x62" + payload[1:3] + self.value)
+
+    def specific_wait_frame(self, timeout=2):
+        return self.rxqueue.get_nowait()
+
+    def open(self):
+        return self
+
+    def close(self):
+        pass
+
+    def empty_rxqueue(self):
+        while not self.rxqueue.empty():
+            self.rxqueue.get_nowait()
+
+    def is_open(self):
+        return True
@@ -0,0 +1,27 @@
+"""Option records of the 0xDFFE (read raw CAN) routine, shared by the hardware and offline tests."""
+
+# 60 seconds, 20 CAN IDs: one (bus, 4-byte CAN ID) record each
+# fmt: off
+RAW_CAN_20_IDS = bytes([0x14,0x3C,
+                        0x01,0x00,0x00,0x05,0x00,
+                        0x01,0x00,0x00,0x03,0xC0,
+                        0x01,0x00,0x00,0x02,0x38,
+                        0x01,0x00,0x00,0x02,0x36,
+                        0x01,0x00,0x00,0x02,0x10,
+                        0x02,0x00,0x00,0x05,0x00,
+                        0x02,0x00,0x00,0x04,0x38,
+                        0x02,0x00,0x00,0x04,0x36,
+                        0x02,0x00,0x00,0x04,0x35,
+                        0x02,0x00,0x00,0x03,0xC3,
+                        0x03,0x00,0x00,0x01,0xF0,
+                        0x03,0x00,0x00,0x01,0x86,
+                        0x03,0x00,0x00,0x01,0x82,
+                        0x03,0x00,0x00,0x01,0x54,
+                        0x03,0x00,0x00,0x01,0x16,
+                        0x05,0x00,0x00,0x04,0xF3,
+                        0x05,0x00,0x00,0x01,0xC5,
+                        0x05,0x00,0x00,0x01,0x7A,
+                        0x05,0x00,0x00,0x01,0x18,
+                        0x05,0x00,0x00,0x07,0x77,
+                        ])
+# fmt: on
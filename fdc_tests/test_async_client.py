@@ -0,0 +1,129 @@
+from doipclient.connectors import AsyncDoIPClientUDSConnector
+from udsoncan.async_client import AsyncClient
+from udsoncan.configs import default_client_config
+from udsoncan.exceptions import NegativeResponseException, TimeoutException
+import asyncio
+import pytest
+
+
+class LoopbackDoIPLayer:
+    """Stands for an AsyncDoIPClient: acknowledges after ack_delay seconds and answers with the responses given
+
+    A response given as a list is answered with each of its frames.
+    """
+
+    def __init__(self, responses=None, ack_delay=0.0):
+        self.responses = responses if responses is not None else {}
+        self.ack_delay = ack_delay
+        self.requests = []
+        self.queue = asyncio.Queue()
+
+    def is_open(self):
+        return True
+
+    async def send_diagnostic(self, payload):
+        await asyncio.sleep(self.ack_delay)
+        self.requests.append(bytes(payload))
+        response = self.responses.get(bytes(payload), [])
+        for frame in response if isinstance(response, list) else [response]:
+            self.queue.put_nowait(frame)
+
+    async def receive_diagnostic(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("No diagnostic message received")
+
+    def empty_rxqueue(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+RESPONSES = {
+    b"\x22\xf1\x95": b"\x62\xf1\x95FOXTRONPI1",
+    b"\x22\xf1\x93": b"\x62\xf1\x93HW01",
+    b"\x3e\x00": b"\x7e\x00",
+    b"\x10\x03": b"\x7f\x10\x22",
+}
+
+
+def make_client(layer):
+    config = dict(default_client_config)
+    config["data_identifiers"] = {0xF195: "10s", 0xF193: "4s"}
+    config["request_timeout"] = 0.5
+    return AsyncClient(AsyncDoIPClientUDSConnector(layer), config=config)
+
+
+def test_given_loopback_when_read_data_by_identifier_then_decoded_value():
+    layer = LoopbackDoIPLayer(RESPONSES)
+
+    async def read():
+        async with make_client(layer) as client:
+            response = await client.read_data_by_identifier(0xF195)
+            await client.tester_present()
+            return response
+
+    response = asyncio.run(read())
+    assert response.positive and response.service_data.values[0xF195] == (b"FOXTRONPI1",)
+    assert layer.requests == [b"\x22\xf1\x95", b"\x3e\x00"]
+
+
+def test_given_concurrent_requests_when_gather_then_each_gets_its_response():
+    layer = LoopbackDoIPLayer(RESPONSES, ack_delay=0.01)
+
+    async def read_both():
+        async with make_client(layer) as client:
+            return await asyncio.gather(client.read_data_by_identifier_first(0xF195), client.read_data_by_identifier_first(0xF193))
+
+    assert asyncio.run(read_both()) == [(b"FOXTRONPI1",), (b"HW01",)]
+
+
+def test_given_negative_response_when_change_session_then_negative_response_exception():
+    async def change_session():
+        async with make_client(LoopbackDoIPLayer(RESPONSES)) as client:
+            await client.change_session(0x03)
+
+    with pytest.raises(NegativeResponseException):
+        asyncio.run(change_session())
+
+
+def test_given_periodic_data_and_response_pending_when_request_then_final_response():
+    callbacks = []
+    layer = LoopbackDoIPLayer({b"\x22\xf1\x95": [b"\x6a\x01\x00\x2a", b"\x7f\x22\x78", b"\x6a\x01\x00\x2b", b"\x62\xf1\x95FOXTRONPI1"]})
+
+    async def read():
+        async with make_client(layer) as client:
+            client.set_config("nrc78_callback", lambda: callbacks.append(True))
+            return await client.read_data_by_identifier_first(0xF195)
+
+    assert asyncio.run(read()) == (b"FOXTRONPI1",)
+    assert callbacks == [True]
+
+
+def test_given_no_response_when_request_then_timeout_exception():
+    async def read():
+        async with make_client(LoopbackDoIPLayer()) as client:
+            await client.read_data_by_identifier(0xF195)
+
+    with pytest.raises(TimeoutException):
+        asyncio.run(read())
+
+
+def test_given_no_acknowledgement_in_time_when_send_then_timeout_exception():
+    async def send():
+        async with AsyncDoIPClientUDSConnector(LoopbackDoIPLayer(ack_delay=1.0)) as conn:
+            await conn.send(b"\x3e\x00", timeout=0.05)
+
+    with pytest.raises(TimeoutException):
+        asyncio.run(send())
+
+
+def test_given_acknowledgement_when_send_without_timeout_then_sent():
+    layer = LoopbackDoIPLayer(ack_delay=0.01)
+
+    async def send():
+        async with AsyncDoIPClientUDSConnector(layer) as conn:
+            await conn.send(b"\x3e\x00")
+
+    asyncio.run(send())
+    assert layer.requests == [b"\x3e\x00"]
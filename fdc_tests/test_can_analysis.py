@@ -0,0 +1,77 @@
+from uds.can_analysis import analyze, format_report, load_columns, subscribed_can_ids
+from uds.raw_can import RawCanStore
+from fdc_tests.routine_data import RAW_CAN_20_IDS
+import numpy as np
+import time
+
+
+def write_store(path, can_ids, seconds, period=0.01, drop=(), channel=5):
+    # Frames of every CAN ID every period, the first data byte of each CAN ID counting from 0 to 255
+    steps = int(seconds / period)
+    count = steps * len(can_ids)
+    step = np.repeat(np.arange(steps), len(can_ids))
+    keep = ~np.isin(step, np.asarray(drop))
+    data = np.zeros((count, RawCanStore.DATA_SIZE), dtype="u1")
+    data[:, 0] = step % 256
+    store = RawCanStore(path)
+    for name, values in (
+        ("timestamp", (1700000000 + step * period).astype("<f8")),
+        ("channel", np.full(count, channel, dtype="u1")),
+        ("can_id", np.tile(np.asarray(can_ids, dtype="<u4"), steps)),
+        ("dlc", np.full(count, 8, dtype="u1")),
+        ("data", data),
+    ):
+        values[keep].tofile(store.file(name))
+
+
+def test_given_routine_data_when_subscribed_can_ids_then_20_ids():
+    can_ids = subscribed_can_ids(RAW_CAN_20_IDS)
+
+    assert len(can_ids) == 20
+    assert can_ids[0] == (0x01, 0x500) and can_ids[5] == (0x02, 0x500) and can_ids[-1] == (0x05, 0x777)
+
+
+def test_given_continuous_counter_when_analyze_then_no_error(tmp_path):
+    path = str(tmp_path / "store")
+    write_store(path, [0x777, 0x116], seconds=10)
+
+    reports = analyze(load_columns(path), can_ids=[(5, 0x777), (5, 0x116), (1, 0x500)])
+    report = reports[(5, 0x777)]
+
+    assert report.count == 1000 and report.continuous
+    assert report.wraparounds == 3
+    assert abs(report.period_mean - 0.01) < 1e-6 and report.period_jitter < 1e-6
+    assert report.dropouts == 0
+    assert reports[(1, 0x500)].count == 0
+    assert analyze(load_columns(path)).keys() == {(5, 0x116), (5, 0x777)}
+    print(format_report(reports))
+
+
+def test_given_dropped_frames_when_analyze_then_gaps_and_counter_errors(tmp_path):
+    path = str(tmp_path / "store")
+    write_store(path, [0x777], seconds=10, drop=[100, 101, 102, 500])
+
+    report = analyze(load_columns(path))[(5, 0x777)]
+
+    assert report.count == 996
+    assert report.counter_errors == 2
+    assert report.lost_frames == 4
+    assert report.dropouts == 2
+    assert abs(report.max_gap - 0.04) < 1e-6
+    assert report.error_timestamps == [1700000000 + 1.03, 1700000000 + 5.01]
+
+
+def test_given_8_hours_capture_when_analyze_then_seconds(tmp_path):
+    path = str(tmp_path / "store")
+    can_ids = subscribed_can_ids(RAW_CAN_20_IDS)
+    write_store(path, [can_id for _, can_id in can_ids], seconds=8 * 3600, period=0.1)
+
+    start = time.perf_counter()
+    reports = analyze(load_columns(path), can_ids=can_ids)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(load_columns(path))} frames analyzed in {elapsed:.2f}s")
+    assert len(reports) == 20
+    assert reports[(5, 0x777)].continuous
+    assert reports[(2, 0x500)].count == 0  # All frames are written on channel 5
+    assert elapsed < 10
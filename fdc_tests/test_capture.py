@@ -0,0 +1,116 @@
+from uds.capture import CaptureReader, CaptureRecord, CaptureWriter, Direction, build_index, index_path
+from uds.client_config import client_config
+from uds.replay import ReplayConnection
+from udsoncan.client import Client
+import os
+import time
+
+TESTER_ADDRESS = 0x0E00
+ECU_ADDRESS = 0x1001
+
+
+def write_rdbi_capture(path, count, dids=(0xF195, 0xF193)):
+    with CaptureWriter(path) as writer:
+        for i in range(count):
+            did = dids[i % len(dids)].to_bytes(2, "big")
+            writer.write(CaptureRecord(i * 0.02, Direction.TX, TESTER_ADDRESS, ECU_ADDRESS, b"\x22" + did))
+            writer.write(CaptureRecord(i * 0.02 + 0.01, Direction.RX, ECU_ADDRESS, TESTER_ADDRESS, b"\x62" + did + b"FOXPI%05d" % i))
+
+
+def test_given_capture_when_read_then_same_records(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 100)
+
+    with CaptureReader(path) as reader:
+        assert len(reader) == 200
+        assert reader[1] == CaptureRecord(0.01, Direction.RX, ECU_ADDRESS, TESTER_ADDRESS, b"\x62\xf1\x95FOXPI00000")
+        assert reader[-1].payload == b"\x62\xf1\x93FOXPI00099"
+        assert len(list(reader)) == 200
+
+
+def test_given_capture_when_window_then_only_records_in_time_range(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 100)
+
+    with CaptureReader(path) as reader:
+        records = list(reader.window(1.0, 1.1))
+        assert [r.timestamp for r in records] == [reader.timestamp(i) for i in range(100, 110)]
+        assert all(1.0 <= r.timestamp < 1.1 for r in records)
+
+
+def test_given_capture_when_find_did_and_sid_then_matching_records(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 100)
+
+    with CaptureReader(path) as reader:
+        assert len(reader.find_did(0xF193)) == 100
+        assert all(reader[i].payload[1:3] == b"\xf1\x93" for i in reader.find_did(0xF193))
+        assert reader.find_sid(0x62) == list(range(1, 200, 2))
+        assert reader.find_did(0x1234) == []
+
+
+def test_given_capture_with_truncated_record_when_build_index_then_record_is_left_out(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 10)
+    with open(path, "ab") as f:
+        f.write(b"\x00\x01\x02")  # Beginning of a record header
+    os.remove(index_path(path))
+
+    assert build_index(path) == 20
+    with CaptureReader(path) as reader:
+        assert len(reader) == 20
+
+
+def test_given_writer_not_flushed_when_read_then_no_records(tmp_path):
+    path = str(tmp_path / "session.cap")
+    with CaptureWriter(path) as writer:
+        writer.write(CaptureRecord(0.0, Direction.TX, TESTER_ADDRESS, ECU_ADDRESS, b"\x22\xf1\x95"))
+        with CaptureReader(path) as reader:  # Empty data and index files
+            assert len(reader) == 0 and list(reader) == []
+        os.remove(index_path(path))
+        assert build_index(path) == 0
+
+
+def test_given_capture_when_append_then_records_are_added(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 10)
+    write_rdbi_capture(path, 10)
+
+    with CaptureReader(path) as reader:
+        assert len(reader) == 40
+        assert reader[20].payload == b"\x22\xf1\x95"
+
+
+def test_given_missing_index_when_append_then_index_rebuilt(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 10)
+    os.remove(index_path(path))
+    write_rdbi_capture(path, 10)
+
+    with CaptureReader(path) as reader:
+        assert len(reader) == 40
+        assert reader[0].payload == b"\x22\xf1\x95" and reader[39].payload == b"\x62\xf1\x93FOXPI00009"
+
+
+def test_given_large_capture_when_open_and_window_then_fast(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 200000)
+
+    start = time.perf_counter()
+    with CaptureReader(path) as reader:
+        records = list(reader.window(3000.0, 3001.0))
+    elapsed = time.perf_counter() - start
+
+    print(f"Opened {os.path.getsize(path)} bytes and read a {len(records)} records window in {elapsed * 1000:.1f} ms")
+    assert len(records) == 100
+
+
+def test_given_capture_when_replay_then_client_decodes_recorded_values(tmp_path):
+    path = str(tmp_path / "session.cap")
+    write_rdbi_capture(path, 10, dids=(0xF195,))
+
+    with CaptureReader(path) as reader:
+        with Client(ReplayConnection(reader), config=client_config()) as client:
+            values = [client.read_data_by_identifier_first(0xF195) for _ in range(10)]
+
+    assert values[9] == (b"FOXPI00009",)
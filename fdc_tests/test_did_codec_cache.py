@@ -0,0 +1,35 @@
+from fdc_tests.fake_ecu import LoopbackConnection
+from uds.client_config import client_config
+from udsoncan import CompiledDidConfig, Response
+from udsoncan.client import Client
+from udsoncan.services import ReadDataByIdentifier
+import struct
+
+
+def pack_string_dids(didconfig):
+    return [did for did, codec in didconfig.items() if isinstance(did, int) and isinstance(codec, str)]
+
+
+def test_given_compiled_did_config_when_interpret_response_then_same_values_as_did_config():
+    didconfig = client_config()["data_identifiers"]
+    compiled = CompiledDidConfig(didconfig)
+    dids = pack_string_dids(didconfig)[:8] + [0xFD01]  # 0xFD01 uses the default codec
+    payload = b"\x62" + b"".join(struct.pack(">H", did) + bytes(range(struct.calcsize(didconfig[did]))) for did in dids[:-1])
+    payload += b"\xfd\x01\x01\x02\x03"
+
+    expected = ReadDataByIdentifier.interpret_response(Response.from_payload(payload), dids, didconfig)
+    response = ReadDataByIdentifier.interpret_response(Response.from_payload(payload), dids, compiled)
+
+    assert response.service_data.values == expected.service_data.values
+    assert ReadDataByIdentifier.make_request(dids, compiled).get_payload() == ReadDataByIdentifier.make_request(dids, didconfig).get_payload()
+
+
+def test_given_client_when_set_config_then_compiled_codecs_are_rebuilt():
+    config = client_config()
+    with Client(LoopbackConnection(value=b"FOXTRONPI1"), config=config) as client:
+        assert client.read_data_by_identifier(0xF195).service_data.values[0xF195] == (b"FOXTRONPI1",)
+
+        didconfig = dict(config["data_identifiers"])
+        didconfig[0xF195] = "10B"
+        client.set_config("data_identifiers", didconfig)
+        assert client.read_data_by_identifier(0xF195).service_data.values[0xF195] == tuple(b"FOXTRONPI1")
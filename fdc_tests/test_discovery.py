@@ -0,0 +1,147 @@
+from doipclient import DoIPClient as pyDoIPClient
+from doipclient.messages import VehicleIdentificationResponse
+from uds.discovery import DiscoveryService
+import importlib
+import pytest
+import socket
+import threading
+import time
+import uds.config
+
+VIN = "LFOXPI00000000001"
+
+
+class FakeEntity:
+    """Answers vehicle identification requests on a loopback address, after delay seconds"""
+
+    def __init__(self, ip, port, logical_address, delay=0.0):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((ip, port))
+        self.sock.settimeout(0.05)
+        self.logical_address = logical_address
+        self.delay = delay
+        self.requests = 0
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        response = VehicleIdentificationResponse(VIN, self.logical_address, b"\x00\x11\x22\x33\x44\x55", b"\x00" * 6, 0x00)
+        data = pyDoIPClient._pack_doip(0x02, 0x0004, response.pack())
+        while self.running:
+            try:
+                _, addr = self.sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            self.requests += 1
+            time.sleep(self.delay)
+            self.sock.sendto(data, addr)
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        self.sock.close()
+
+
+@pytest.fixture
+def port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def entities(port):
+    entities = [FakeEntity("127.0.0.1", port, 0x0680, delay=0.1), FakeEntity("127.0.0.2", port, 0x0E80)]
+    yield entities
+    for entity in entities:
+        entity.close()
+
+
+def test_given_candidates_when_probe_then_probed_together(entities, port):
+    discovery = DiscoveryService(timeout=1.0, port=port, grace=0.3)
+
+    start = time.perf_counter()
+    found = discovery.probe(["127.0.0.3", "127.0.0.2", "127.0.0.1"])
+    elapsed = time.perf_counter() - start
+
+    assert sorted(found) == ["127.0.0.1", "127.0.0.2"]  # 127.0.0.3 does not answer
+    assert found["127.0.0.2"].logical_address == 0x0E80 and found["127.0.0.1"].vin == VIN
+    assert found["127.0.0.1"].eid == b"\x00\x11\x22\x33\x44\x55"
+    assert 0.3 <= elapsed < 0.8  # Waited for the first candidate during the grace time only
+
+
+def test_given_preferred_candidate_answers_within_grace_when_find_then_preferred_one(entities, port):
+    discovery = DiscoveryService(timeout=2.0, port=port, grace=0.5)
+
+    start = time.perf_counter()
+    entity = discovery.find(["127.0.0.1", "127.0.0.2"])  # 127.0.0.1 answers 0.1 s after 127.0.0.2
+
+    assert time.perf_counter() - start < 0.5
+    assert (entity.ip, entity.logical_address) == ("127.0.0.1", 0x0680)
+
+
+def test_given_preferred_candidate_silent_when_find_then_other_one_without_timeout(entities, port):
+    discovery = DiscoveryService(timeout=2.0, port=port, grace=0.05)
+
+    start = time.perf_counter()
+    entity = discovery.find(["127.0.0.3", "127.0.0.2"])
+
+    assert time.perf_counter() - start < 0.5
+    assert entity.ip == "127.0.0.2"
+
+
+def test_given_preferred_candidate_answers_when_find_then_no_wait_for_others(entities, port):
+    discovery = DiscoveryService(timeout=2.0, port=port)
+
+    start = time.perf_counter()
+    entity = discovery.find(["127.0.0.2", "127.0.0.3", "127.0.0.1"])
+
+    assert time.perf_counter() - start < 0.5
+    assert (entity.ip, entity.logical_address) == ("127.0.0.2", 0x0E80)
+
+
+def test_given_found_entity_when_find_again_then_answered_from_cache(entities, port):
+    discovery = DiscoveryService(timeout=1.0, port=port)
+    discovery.find(["127.0.0.1"])
+
+    for _ in range(5):
+        assert discovery.find(["127.0.0.1"]).logical_address == 0x0680
+
+    assert entities[0].requests == 1
+
+
+def test_given_ttl_elapsed_when_find_then_probed_again(entities, port):
+    discovery = DiscoveryService(ttl=0.05, timeout=1.0, port=port)
+    discovery.find(["127.0.0.2"])
+    time.sleep(0.1)
+
+    assert discovery.get("127.0.0.2") is None
+    discovery.find(["127.0.0.2"])
+    assert entities[1].requests == 2
+
+
+def test_given_cache_file_when_new_service_then_entities_loaded(entities, port, tmp_path):
+    cache_path = str(tmp_path / "doip.json")
+    DiscoveryService(timeout=1.0, port=port, cache_path=cache_path).probe(["127.0.0.1", "127.0.0.2"])
+
+    discovery = DiscoveryService(timeout=1.0, port=port, cache_path=cache_path)
+
+    assert sorted(entity.ip for entity in discovery.entities()) == ["127.0.0.1", "127.0.0.2"]
+    assert discovery.find(["127.0.0.1"]).eid == b"\x00\x11\x22\x33\x44\x55"
+    assert [entity.requests for entity in entities] == [1, 1]
+
+
+def test_given_no_answer_when_find_then_timeout_error(port):
+    with pytest.raises(TimeoutError):
+        DiscoveryService(timeout=0.1, port=port).find(["127.0.0.3"])
+
+
+def test_given_spaces_and_empty_entries_when_candidate_ips_then_stripped_and_skipped(monkeypatch):
+    monkeypatch.setenv("DOIP_SERVER_IP", "192.168.200.1")
+    monkeypatch.setenv("DOIP_CANDIDATE_IPS", " 192.168.200.1, 169.254.200.1,, ")
+    try:
+        assert importlib.reload(uds.config).DOIP_CANDIDATE_IPS == ("192.168.200.1", "169.254.200.1")
+    finally:
+        monkeypatch.undo()
+        importlib.reload(uds.config)
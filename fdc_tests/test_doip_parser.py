@@ -0,0 +1,79 @@
+from doipclient import DoIPClient
+from doipclient.client import Parser
+from doipclient.messages import DiagnosticMessage, DiagnosticMessagePositiveAcknowledgement, ReservedMessage
+import logging
+
+TESTER_ADDRESS = 0x0E00
+ECU_ADDRESS = 0x1001
+
+
+def pack(message, protocol_version=0x02):
+    return DoIPClient._pack_doip(protocol_version, message.payload_type, message.pack())
+
+
+def diagnostic(user_data):
+    return pack(DiagnosticMessage(ECU_ADDRESS, TESTER_ADDRESS, user_data))
+
+
+def test_given_message_split_inside_header_when_read_message_then_message_once_complete():
+    data = diagnostic(b"\x62\xf1\x95FOXPI")
+    parser = Parser()
+
+    assert parser.read_message(data[:3]) is None  # Incomplete header
+    assert parser.read_message(data[3:10]) is None  # Header complete, payload incomplete
+    message = parser.read_message(data[10:])
+
+    assert isinstance(message, DiagnosticMessage)
+    assert (message.source_address, message.target_address, bytes(message.user_data)) == (ECU_ADDRESS, TESTER_ADDRESS, b"\x62\xf1\x95FOXPI")
+    assert parser.rx_buffer == bytearray()
+
+
+def test_given_message_fed_byte_by_byte_when_read_message_then_one_message():
+    data = diagnostic(b"\x7e\x00")
+    parser = Parser()
+
+    messages = [parser.read_message(data[i:i + 1]) for i in range(len(data))]
+
+    assert messages[:-1] == [None] * (len(data) - 1)
+    assert bytes(messages[-1].user_data) == b"\x7e\x00"
+
+
+def test_given_several_messages_in_one_chunk_when_read_messages_then_all_yielded():
+    ack = pack(DiagnosticMessagePositiveAcknowledgement(ECU_ADDRESS, TESTER_ADDRESS, 0x00))
+    first, second = diagnostic(b"\x62\xf1\x95FOXPI"), diagnostic(b"\x62\xf1\x93HW01")
+    parser = Parser()
+
+    messages = list(parser.read_messages(ack + first + second[:5]))
+    assert [type(m) for m in messages] == [DiagnosticMessagePositiveAcknowledgement, DiagnosticMessage]
+    assert messages[0].ack_code == 0x00 and bytes(messages[1].user_data) == b"\x62\xf1\x95FOXPI"
+
+    # The beginning of the third message is kept for the next chunk
+    assert [bytes(m.user_data) for m in parser.read_messages(second[5:])] == [b"\x62\xf1\x93HW01"]
+    assert parser.rx_buffer == bytearray()
+
+
+def test_given_invalid_header_when_read_message_then_resynchronized_on_next_message(caplog):
+    data = diagnostic(b"\x7e\x00")
+    parser = Parser()
+
+    with caplog.at_level(logging.WARNING):
+        message = parser.read_message(b"\x02\x02\x80\x01\x00" + data)  # Inverse protocol version mismatch
+
+    assert bytes(message.user_data) == b"\x7e\x00"
+    assert "Inverse protocol version does not match" in caplog.text
+    assert parser.read_message(b"") is None
+
+
+def test_given_invalid_header_split_across_chunks_when_read_message_then_resynchronized():
+    data = diagnostic(b"\x7e\x00")
+    parser = Parser()
+
+    assert parser.read_message(b"\x01\x01\x00\x00\x00\x00\x00\x00\x02") is None
+    assert bytes(parser.read_message(data[1:]).user_data) == b"\x7e\x00"
+
+
+def test_given_reserved_payload_type_when_read_message_then_reserved_message():
+    message = Parser().read_message(DoIPClient._pack_doip(0x02, 0xF000, b"\x01\x02"))
+
+    assert isinstance(message, ReservedMessage)
+    assert (message.payload_type, bytes(message.payload)) == (0xF000, b"\x01\x02")
@@ -0,0 +1,97 @@
+from doipclient import DoIPClient
+from doipclient.client import MAX_RX_BUFFER_SIZE
+from doipclient.messages import DiagnosticMessage, DiagnosticMessagePositiveAcknowledgement, EntityStatusResponse
+import pytest
+import socket
+import threading
+
+TESTER_ADDRESS = 0x0E00
+ECU_ADDRESS = 0x1001
+RX_BUFFER_SIZE = 64
+
+
+def pack(message):
+    return DoIPClient._pack_doip(0x02, message.payload_type, message.pack())
+
+
+@pytest.fixture
+def loopback():
+    """A DoIPClient connected to a loopback TCP server socket, without routing activation"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    client = DoIPClient("127.0.0.1", ECU_ADDRESS, tcp_port=server.getsockname()[1], activation_type=None,
+                        rx_buffer_size=RX_BUFFER_SIZE)
+    ecu, _ = server.accept()
+    yield client, ecu
+    client.close()
+    ecu.close()
+    server.close()
+
+
+def test_given_message_larger_than_rx_buffer_when_receive_then_read_in_several_calls(loopback):
+    client, ecu = loopback
+    user_data = bytes(range(200))
+    message = pack(DiagnosticMessage(ECU_ADDRESS, TESTER_ADDRESS, b"\x62\xf1\x95" + user_data))
+    ecu.sendall(message)
+
+    assert bytes(client.receive_diagnostic(timeout=1.0)) == b"\x62\xf1\x95" + user_data
+    assert client.rx_bytes == len(message)
+    assert client.rx_syscalls >= -(-len(message) // RX_BUFFER_SIZE)
+    assert client.rx_buffer_size == RX_BUFFER_SIZE
+
+
+def test_given_several_messages_in_one_read_when_receive_then_no_more_syscalls(loopback):
+    client, ecu = loopback
+    ecu.sendall(pack(DiagnosticMessage(ECU_ADDRESS, TESTER_ADDRESS, b"\x7e\x00")) * 3)
+
+    assert bytes(client.receive_diagnostic(timeout=1.0)) == b"\x7e\x00"
+    syscalls = client.rx_syscalls
+    assert [bytes(client.receive_diagnostic(timeout=1.0)) for _ in range(2)] == [b"\x7e\x00"] * 2
+    assert client.rx_syscalls == syscalls == 1 and client.rx_bytes == 3 * 14
+
+
+def test_given_request_when_send_diagnostic_then_tx_counters_and_reset(loopback):
+    client, ecu = loopback
+    ecu.sendall(pack(DiagnosticMessagePositiveAcknowledgement(ECU_ADDRESS, TESTER_ADDRESS, 0x00)))
+
+    client.send_diagnostic(b"\x22\xf1\x95")
+
+    request = pack(DiagnosticMessage(TESTER_ADDRESS, ECU_ADDRESS, b"\x22\xf1\x95"))
+    assert ecu.recv(64) == request
+    assert (client.tx_syscalls, client.tx_bytes) == (1, len(request))
+    assert client.rx_syscalls == 1 and client.rx_bytes == 13
+    client.reset_io_counters()
+    assert (client.rx_syscalls, client.rx_bytes, client.tx_syscalls, client.tx_bytes) == (0, 0, 0, 0)
+
+
+@pytest.mark.parametrize("max_data_size, rx_buffer_size", [
+    (4096, 4096 + 8),
+    (0xFFFFFFFF, MAX_RX_BUFFER_SIZE),  # "Unlimited"
+])
+def test_given_max_data_size_when_request_entity_status_then_rx_buffer_grown_up_to_max(max_data_size, rx_buffer_size):
+    entity = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    entity.bind(("127.0.0.1", 0))
+    entity.settimeout(1.0)
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    client = DoIPClient("127.0.0.1", ECU_ADDRESS, tcp_port=server.getsockname()[1], udp_port=entity.getsockname()[1],
+                        activation_type=None, rx_buffer_size=RX_BUFFER_SIZE)
+
+    def answer():
+        _, addr = entity.recvfrom(64)
+        entity.sendto(pack(EntityStatusResponse(0x01, 1, 1, max_data_size)), addr)
+
+    thread = threading.Thread(target=answer, daemon=True)
+    thread.start()
+    try:
+        result = client.request_entity_status()
+        thread.join()
+
+        assert result.max_data_size == max_data_size
+        assert client.rx_buffer_size == rx_buffer_size
+    finally:
+        client.close()
+        entity.close()
+        server.close()
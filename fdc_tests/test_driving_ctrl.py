@@ -0,0 +1,111 @@
+from fdc_tests.fake_ecu import WriteConnection, make_manager
+from uds.driving_ctrl import RELEASE_FRAME, DrivingCtrlCommand, DrivingCtrlEncoder, DrivingCtrlWriter
+import math
+import pytest
+import time
+
+
+class DrivingConnection(WriteConnection):
+    """Records the FoxPi_Driving_Ctrl writes, taking write_seconds each"""
+
+    def __init__(self, write_seconds=0.0):
+        WriteConnection.__init__(self)
+        self.write_seconds = write_seconds
+        self.frames = []
+
+    def specific_send(self, payload):
+        if payload[0] == 0x2E:
+            self.frames.append(bytes(payload[3:]))
+            time.sleep(self.write_seconds)
+        WriteConnection.specific_send(self, payload)
+
+
+def reference_encode(values):
+    """The encoding of FoxPiWriteDID.FoxPi_Driving_Ctrl before DrivingCtrlEncoder"""
+    v = [int(x) if isinstance(x, float) and x.is_integer() else x for x in values]
+    aps = (v[12] << 4) | (v[11] << 1) | v[10]
+    return b"".join([
+        math.floor((v[0] - (-15)) / 0.05).to_bytes(3, "big"),
+        math.floor(v[1]).to_bytes(1, "big"),
+        math.floor(v[2] / 0.125).to_bytes(3, "big"),
+        math.floor(v[3]).to_bytes(1, "big"),
+        math.floor(v[4]).to_bytes(1, "big"),
+        math.floor(v[5]).to_bytes(1, "big"),
+        math.floor((v[6] - (-900)) / 0.1).to_bytes(4, "big"),
+        math.floor(v[7]).to_bytes(1, "big"),
+        math.floor(v[8]).to_bytes(1, "big"),
+        math.floor((v[9] - (-10)) / 0.01).to_bytes(3, "big"),
+        aps.to_bytes(1, "big"),
+        math.floor(v[13] / 0.125).to_bytes(1, "big"),
+    ])
+
+
+@pytest.mark.parametrize("values", [
+    [-10, 1, 255.875, 1, 1, 1, -900, 1, 1, -10, 1, 4, 7, 20],
+    [10.55, 0, 0, 0, 0, 0, 900, 0, 0, 10, 0, 0, 0, 0],
+    [-15, 1, 33.3, 1, 1, 1, 12.7, 1, 1, -0.37, 1, 2, 3, 7.3],
+    list(DrivingCtrlCommand(acceleration=1.25, angle_target=-45.5, torque_target=2.5)),
+])
+def test_given_values_when_encode_then_same_bytes_as_foxpi_driving_ctrl(values):
+    assert bytes(DrivingCtrlEncoder().encode(values)) == reference_encode(values)
+
+
+def test_given_invalid_values_when_encode_then_value_error():
+    encoder = DrivingCtrlEncoder()
+    with pytest.raises(ValueError, match="exactly 14"):
+        encoder.encode([0] * 13)
+    with pytest.raises(ValueError, match=r"Angle Target\[6\]"):
+        encoder.encode(DrivingCtrlCommand(angle_target=901))
+
+
+def test_given_setpoints_when_writer_runs_then_written_at_rate():
+    conn = DrivingConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+    command = DrivingCtrlCommand(acceleration=0.5, acceleration_request=1)
+
+    with DrivingCtrlWriter(manager, rate=100, watchdog_timeout=1.0) as writer:
+        for _ in range(30):
+            writer.set(command)
+            time.sleep(0.01)
+
+    assert 20 <= writer.stats.sent - 1 <= 40 and writer.stats.errors == 0
+    assert conn.frames[0] == reference_encode(command) and conn.frames[-1] == RELEASE_FRAME
+    assert conn.requests.count(0x10) == 1 and conn.requests.count(0x27) == 2
+
+
+def test_given_stalled_producer_when_watchdog_then_control_released_once():
+    conn = DrivingConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+
+    with DrivingCtrlWriter(manager, rate=100, watchdog_timeout=0.05) as writer:
+        writer.set(DrivingCtrlCommand())
+        time.sleep(0.2)
+        stalled_frames = len(conn.frames)
+        time.sleep(0.1)
+        assert len(conn.frames) == stalled_frames  # Nothing written while stalled
+        writer.set(DrivingCtrlCommand(torque_target=1))
+        time.sleep(0.05)
+
+    assert writer.stats.watchdog_trips == 1
+    assert conn.frames.count(RELEASE_FRAME) == 2  # Watchdog, then stop
+    assert conn.frames[stalled_frames - 1] == RELEASE_FRAME
+
+
+def test_given_slow_writes_when_writer_runs_then_deadline_misses_counted():
+    conn = DrivingConnection(write_seconds=0.025)
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+    misses = []
+
+    with DrivingCtrlWriter(manager, rate=100, watchdog_timeout=1.0, on_deadline_miss=misses.append) as writer:
+        writer.set(DrivingCtrlCommand())
+        time.sleep(0.3)
+
+    assert writer.stats.missed == sum(misses) and writer.stats.missed >= writer.stats.sent
+    assert writer.stats.max_write_seconds >= 0.025
+
+
+def test_given_rate_out_of_range_when_writer_then_value_error():
+    conn = DrivingConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+    with pytest.raises(ValueError):
+        DrivingCtrlWriter(manager, rate=200)
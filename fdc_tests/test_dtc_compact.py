@@ -0,0 +1,68 @@
+from udsoncan import CompactDtcList
+from udsoncan.Response import Response
+from udsoncan.exceptions import InvalidResponseException
+from udsoncan.services import ReadDTCInformation
+import pytest
+import time
+
+DTC_COUNT = 500
+
+
+def make_response(payload):
+    return Response.from_payload(payload)
+
+
+def dtc_records(count):
+    return b"".join((0x100000 + i * 3).to_bytes(3, "big") + bytes([i & 0xFF]) for i in range(count))
+
+
+def columns(dtcs):
+    return [(dtc.id, dtc.status.get_byte_as_int(), dtc.severity.get_byte_as_int(), dtc.functional_unit) for dtc in dtcs]
+
+
+def interpret(payload, subfunction, **kwargs):
+    return ReadDTCInformation.interpret_response(make_response(payload), subfunction, **kwargs).service_data
+
+
+@pytest.mark.parametrize("payload, subfunction", [
+    (b"\x59\x02\xff" + dtc_records(DTC_COUNT), 0x02),
+    (b"\x59\x02\xff" + dtc_records(3) + b"\x00\x00\x00\x00" + dtc_records(2) + b"\x00\x00", 0x02),  # All-zero DTC and padding
+    (b"\x59\x08\xff" + b"".join(bytes([0x20, 0x10]) + r for r in (dtc_records(40)[i:i + 4] for i in range(0, 160, 4))), 0x08),
+    (b"\x59\x42\x33\xff\xe0\x04" + b"".join(bytes([0x40]) + r for r in (dtc_records(40)[i:i + 4] for i in range(0, 160, 4))), 0x42),
+])
+def test_given_dtc_list_when_compact_then_same_dtcs_as_dtc_instances(payload, subfunction):
+    expected = interpret(payload, subfunction)
+    compact = interpret(payload, subfunction, compact_dtc_records=True)
+
+    assert isinstance(compact.dtcs, CompactDtcList) and compact.dtc_count == expected.dtc_count
+    assert columns(compact.dtcs) == columns(expected.dtcs)
+    assert compact.status_availability.get_byte_as_int() == expected.status_availability.get_byte_as_int()
+
+
+def test_given_compact_dtcs_when_accessed_then_dtc_built_once():
+    dtcs = interpret(b"\x59\x02\xff" + dtc_records(10), 0x02, compact_dtc_records=True).dtcs
+
+    assert dtcs.ids[4] == 0x10000C and dtcs.statuses[4] == 4
+    assert dtcs[4] is dtcs[4] and dtcs[-1] is dtcs[9]
+    assert [dtc.id for dtc in dtcs[2:4]] == [0x100006, 0x100009]
+    with pytest.raises(IndexError):
+        dtcs[10]
+
+
+def test_given_incomplete_record_when_compact_then_error_is_raised():
+    with pytest.raises(InvalidResponseException):
+        interpret(b"\x59\x02\xff" + dtc_records(3) + b"\x12\x34", 0x02, compact_dtc_records=True)
+
+
+def test_given_large_dtc_list_when_compact_then_decoded_faster():
+    payload = b"\x59\x02\xff" + dtc_records(DTC_COUNT)
+
+    def seconds(compact):
+        start = time.perf_counter()
+        for _ in range(20):
+            interpret(payload, 0x02, compact_dtc_records=compact)
+        return time.perf_counter() - start
+
+    normal, compact = seconds(False), seconds(True)
+    print(f"{DTC_COUNT} DTCs: {normal / 20 * 1000:.3f} ms, compact {compact / 20 * 1000:.3f} ms")
+    assert compact < normal
@@ -0,0 +1,126 @@
+from fdc_tests.fake_ecu import FlashConnection
+from uds.client_config import client_config
+from uds.dtc_store import DtcEventType, DtcStore
+from udsoncan.client import Client
+from collections import Counter
+import logging
+import pytest
+
+ECU_ADDRESS = 0x1001
+EXTENDED_DATA_SIZE = 4
+
+
+class DtcConnection(FlashConnection):
+    """Emulates the ReadDTCInformation subfunctions used by DtcStore"""
+
+    def __init__(self, dtcs):
+        FlashConnection.__init__(self, 0)
+        self.dtcs = dict(dtcs)  # DTC id: status
+        self.subfunctions = Counter()
+        self.fail_at = None  # (subfunction, count) raising ConnectionError
+
+    def specific_send(self, payload):
+        subfunction = payload[1]
+        self.subfunctions[subfunction] += 1
+        if self.fail_at == (subfunction, self.subfunctions[subfunction]):
+            raise ConnectionError("Connection lost")
+        if subfunction == 0x01:
+            count = sum(1 for status in self.dtcs.values() if status & payload[2])
+            self.rxqueue.put(b"\x59\x01\xff\x01" + count.to_bytes(2, "big"))
+        elif subfunction == 0x02:
+            records = b"".join(
+                dtc_id.to_bytes(3, "big") + bytes([status]) for dtc_id, status in self.dtcs.items() if status & payload[2]
+            )
+            self.rxqueue.put(b"\x59\x02\xff" + records)
+        elif subfunction == 0x04:
+            dtc_id = int.from_bytes(payload[2:5], "big")
+            self.rxqueue.put(b"\x59\x04" + payload[2:5] + bytes([self.dtcs[dtc_id]]) + b"\x01\x01\xf1\x95" + payload[2:5])
+        elif subfunction == 0x06:
+            dtc_id = int.from_bytes(payload[2:5], "big")
+            self.rxqueue.put(b"\x59\x06" + payload[2:5] + bytes([self.dtcs[dtc_id]]) + b"\x01" + bytes([self.dtcs[dtc_id]]) * EXTENDED_DATA_SIZE)
+
+
+def make_client(conn):
+    client = Client(conn, config=client_config())
+    client.config["data_identifiers"][0xF195] = "3s"
+    for logger in (client.logger, conn.logger):
+        logger.setLevel(logging.WARNING)
+    return client
+
+
+def test_given_new_dtcs_when_refresh_then_added_with_details():
+    conn = DtcConnection({0x100000 + i: 0x09 for i in range(20)})
+    events = []
+    store = DtcStore(extended_data_size=EXTENDED_DATA_SIZE, on_event=events.append)
+
+    refresh = store.refresh(make_client(conn), ECU_ADDRESS)
+
+    assert refresh.changed and len(refresh.events) == 20 and events == refresh.events
+    assert all(event.type == DtcEventType.Added for event in events)
+    assert refresh.requests == 3 + 1 + 20 + 20
+    dtc = store.get(ECU_ADDRESS, 0x100005)
+    assert dtc.status.confirmed and dtc.snapshots[0].data == (b"\x10\x00\x05",)
+    assert dtc.extended_data[0].raw_data == b"\x09" * EXTENDED_DATA_SIZE
+
+
+def test_given_unchanged_ecu_when_refresh_then_only_counts_are_read():
+    conn = DtcConnection({0x100000 + i: 0x09 for i in range(20)})
+    client = make_client(conn)
+    store = DtcStore(extended_data_size=EXTENDED_DATA_SIZE)
+    store.refresh(client, ECU_ADDRESS)
+    conn.subfunctions.clear()
+
+    refresh = store.refresh(client, ECU_ADDRESS)
+
+    assert not refresh.changed and refresh.events == []
+    assert refresh.requests == 3 and conn.subfunctions == Counter({0x01: 3})
+    assert len(store) == 20
+
+
+def test_given_changed_dtcs_when_refresh_then_events_and_details_of_changed_dtcs_only():
+    conn = DtcConnection({0x100000 + i: 0x09 for i in range(20)})
+    client = make_client(conn)
+    store = DtcStore(extended_data_size=EXTENDED_DATA_SIZE)
+    store.refresh(client, ECU_ADDRESS)
+    store.refresh(client, 0x1002)  # Another ECU with the same DTCs
+    conn.subfunctions.clear()
+    conn.dtcs[0x100001] = 0x08  # Test passed, still confirmed
+    del conn.dtcs[0x100002]
+    conn.dtcs[0x200000] = 0x2F
+
+    refresh = store.refresh(client, ECU_ADDRESS)
+
+    assert [(e.type, e.dtc_id, e.previous_status, e.status) for e in refresh.events] == [
+        (DtcEventType.Cleared, 0x100002, 0x09, None),
+        (DtcEventType.StatusChanged, 0x100001, 0x09, 0x08),
+        (DtcEventType.Added, 0x200000, None, 0x2F),
+    ]
+    assert conn.subfunctions == Counter({0x01: 3, 0x02: 1, 0x04: 2, 0x06: 2})
+    assert store.get(ECU_ADDRESS, 0x100001).extended_data[0].raw_data == b"\x08" * EXTENDED_DATA_SIZE
+    assert (ECU_ADDRESS, 0x100002) not in store and (0x1002, 0x100002) in store
+    assert len(store.dtcs(ECU_ADDRESS)) == 20 and len(store.dtcs()) == 40
+
+
+def test_given_failed_details_read_when_refresh_again_then_store_unchanged_and_events_reported():
+    conn = DtcConnection({0x100000 + i: 0x09 for i in range(5)})
+    client = make_client(conn)
+    events = []
+    store = DtcStore(extended_data_size=EXTENDED_DATA_SIZE, on_event=events.append)
+    store.refresh(client, ECU_ADDRESS)
+    events.clear()
+    del conn.dtcs[0x100000]
+    conn.dtcs[0x200000] = 0x2F
+    conn.dtcs[0x200001] = 0x2F
+    conn.fail_at = (0x06, conn.subfunctions[0x06] + 2)  # Extended data of the second new DTC
+
+    with pytest.raises(ConnectionError):
+        store.refresh(client, ECU_ADDRESS)
+
+    assert events == [] and len(store) == 5 and (ECU_ADDRESS, 0x100000) in store
+    refresh = store.refresh(client, ECU_ADDRESS)
+    assert [(e.type, e.dtc_id) for e in refresh.events] == [
+        (DtcEventType.Cleared, 0x100000),
+        (DtcEventType.Added, 0x200000),
+        (DtcEventType.Added, 0x200001),
+    ]
+    assert events == refresh.events and len(store) == 6
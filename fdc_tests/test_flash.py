@@ -0,0 +1,100 @@
+from fdc_tests.fake_ecu import ADDRESS, FlashConnection, make_image, memory_location
+from uds.client_config import client_config
+from uds.flash import FlashJob, FlashOrchestrator, FlashStep, erase_memory_data, format_progress
+from udsoncan.exceptions import TimeoutException
+import logging
+import time
+import zlib
+
+ERASE_TIME = 0.3
+
+
+class EcuConnection(FlashConnection):
+    """Adds the session, security access and routines of a flash sequence to FlashConnection"""
+
+    def __init__(self, size, erase_time=ERASE_TIME):
+        FlashConnection.__init__(self, size)
+        self.erase_time = erase_time
+        self.requests = []
+        self.logger.setLevel(logging.WARNING)
+
+    def specific_send(self, payload):
+        self.requests.append(bytes(payload[:4]))
+        sid = payload[0]
+        if sid == 0x10:
+            self.rxqueue.put(b"\x50" + payload[1:2] + b"\x00\x32\x01\xf4")
+        elif sid == 0x27 and payload[1] == 0x01:
+            self.rxqueue.put(b"\x67\x01\x12\x34\x56\x78")
+        elif sid == 0x27 and payload[1] == 0x02:
+            self.rxqueue.put(b"\x67\x02" if payload[2:] == b"\x78\x56\x34\x12" else b"\x7f\x27\x35")
+        elif sid == 0x31 and payload[2:4] == b"\xff\x00":
+            time.sleep(self.erase_time)
+            self.rxqueue.put(b"\x71\x01\xff\x00")
+        elif sid == 0x31 and payload[2:4] == b"\x02\x02":
+            correct = payload[4:8] == zlib.crc32(self.memory).to_bytes(4, "big")
+            self.rxqueue.put(b"\x71\x01\x02\x02" + (b"\x00" if correct else b"\x01"))
+        else:
+            FlashConnection.specific_send(self, payload)
+
+
+def make_config():
+    config = client_config()
+    config["security_algo"] = lambda level, seed, params=None: seed[::-1]
+    return config
+
+
+def make_jobs(image, targets):
+    crc = zlib.crc32(image).to_bytes(4, "big")
+    return [FlashJob(target, memory_location(len(image)), image, verify_data=crc) for target in targets]
+
+
+def test_given_4_ecus_when_flash_then_flashed_in_parallel():
+    image = make_image(64 * 1024)
+    targets = [0x1001, 0x1002, 0x1003, 0x1004]
+    connections = {target: EcuConnection(len(image)) for target in targets}
+    steps = []
+
+    start = time.perf_counter()
+    progress = FlashOrchestrator(
+        connections.__getitem__, make_config(), on_progress=lambda p: steps.append((p.target, p.step))
+    ).run(make_jobs(image, targets))
+    elapsed = time.perf_counter() - start
+
+    print(format_progress(progress))
+    assert all(p.ok and p.transferred == len(image) for p in progress.values())
+    assert all(conn.memory == image for conn in connections.values())
+    assert elapsed < len(targets) * ERASE_TIME  # The erase routines run together
+    conn = connections[0x1001]
+    assert [r[:1] for r in conn.requests[:5]] == [b"\x10", b"\x27", b"\x27", b"\x31", b"\x34"]
+    assert conn.requests[-1] == b"\x31\x01\x02\x02"
+    assert [step for target, step in steps if target == 0x1001 and step != FlashStep.Download] == [
+        FlashStep.Session, FlashStep.Unlock, FlashStep.Erase, FlashStep.Verify, FlashStep.Done]
+
+
+def test_given_failing_ecu_when_flash_then_other_ecus_are_flashed():
+    image = make_image(16 * 1024)
+    connections = {0x1001: EcuConnection(len(image)), 0x1002: EcuConnection(len(image), erase_time=0)}
+    connections[0x1002].busy = set(range(3, 10))  # BusyRepeatRequest to every retry of the third block
+
+    progress = FlashOrchestrator(connections.__getitem__, make_config()).run(make_jobs(image, connections))
+
+    assert progress[0x1001].ok
+    assert progress[0x1002].step == FlashStep.Failed
+    assert progress[0x1002].failed_step == FlashStep.Download
+    assert progress[0x1002].transferred == 2 * 1024
+
+
+def test_given_budget_when_exceeded_then_ecus_stop_with_timeout():
+    image = make_image(16 * 1024)
+    connections = {0x1001: EcuConnection(len(image), erase_time=0.5), 0x1002: EcuConnection(len(image), erase_time=0.5)}
+
+    progress = FlashOrchestrator(connections.__getitem__, make_config(), budget=0.2).run(make_jobs(image, connections))
+
+    for p in progress.values():
+        assert p.step == FlashStep.Failed and p.failed_step == FlashStep.Erase
+        assert isinstance(p.error, TimeoutException)
+    assert not any(conn.download_requests for conn in connections.values())
+
+
+def test_given_erase_data_when_default_then_address_and_size_of_memory_location():
+    assert erase_memory_data(memory_location(0x1000)) == b"\x44" + ADDRESS.to_bytes(4, "big") + b"\x00\x00\x10\x00"
@@ -0,0 +1,39 @@
+from fdc_tests.fake_ecu import LoopbackConnection
+from uds.client_config import client_config
+from udsoncan.client import Client
+from udsoncan.common.dids import DataIdentifier
+import binascii
+import logging
+
+
+def read_loop(client, count):
+    for _ in range(count):
+        client.read_data_by_identifier(0xF195)
+
+
+def set_log_level(client, level):
+    for logger in (client.logger, client.conn.logger):
+        logger.setLevel(level)
+        logger.propagate = False
+        if not any(isinstance(h, logging.NullHandler) for h in logger.handlers):
+            logger.addHandler(logging.NullHandler())
+
+
+def test_given_log_level_warning_when_read_did_loop_then_no_log_formatting(monkeypatch):
+    calls = []
+
+    def counting(name, func):
+        def wrapper(*args, **kwargs):
+            calls.append(name)
+            return func(*args, **kwargs)
+        return wrapper
+
+    with Client(LoopbackConnection(), config=client_config()) as client:
+        set_log_level(client, logging.WARNING)
+        monkeypatch.setattr(binascii, "hexlify", counting("hexlify", binascii.hexlify))
+        monkeypatch.setattr(DataIdentifier, "name_from_id", counting("name_from_id", DataIdentifier.name_from_id))
+        monkeypatch.setattr(client, "service_log_prefix", counting("service_log_prefix", client.service_log_prefix))
+        read_loop(client, 100)
+
+    assert calls == []
+
@@ -0,0 +1,67 @@
+from uds.client_config import client_config
+from uds.multiplex import MultiplexedDoIPClient
+from udsoncan.client import Client
+import pytest
+import queue
+import time
+
+TESTER_ADDRESS = 0x0E00
+ECU_ADDRESSES = (0x1001, 0x1002)
+
+
+class FakeGateway:
+    """Stands for the DoIPClient: answers every ReadDataByIdentifier request from its target address"""
+
+    def __init__(self):
+        self.target = None
+        self.messages = queue.Queue()
+
+    def set_target_address(self, target):
+        self.target = target
+
+    def send_diagnostic(self, payload, timeout=None):
+        header = b"\x02\xfd\x80\x01\x00\x00\x00\x00" + self.target.to_bytes(2, "big") + TESTER_ADDRESS.to_bytes(2, "big")
+        self.messages.put(header + b"\x62" + bytes(payload[1:3]) + b"ECU%04X" % self.target)
+
+    def receive_multiple_diagnostic_responses(self, timeout):
+        messages = []
+        while not self.messages.empty():
+            messages.append(self.messages.get())
+        if not messages:
+            time.sleep(timeout)
+        return messages
+
+
+def config():
+    config = client_config()
+    config["data_identifiers"] = {0xF195: "7s"}
+    return config
+
+
+def test_given_targets_when_request_then_each_response_routed_to_its_future():
+    with MultiplexedDoIPClient(FakeGateway()) as mux:
+        futures = [mux.submit(target, b"\x22\xf1\x95") for target in ECU_ADDRESSES]
+        responses = [future.result(1.0) for future in futures]
+
+    assert [response.data for response in responses] == [b"\xf1\x95ECU1001", b"\xf1\x95ECU1002"]
+
+
+def test_given_closed_connection_when_connection_again_then_target_reused():
+    with MultiplexedDoIPClient(FakeGateway()) as mux:
+        for _ in range(2):
+            with Client(mux.connection(0x1001), config=config()) as client:
+                assert client.read_data_by_identifier_first(0xF195) == (b"ECU1001",)
+
+        assert mux._connections == {}
+
+
+def test_given_open_connection_when_connection_to_same_target_then_value_error():
+    with MultiplexedDoIPClient(FakeGateway()) as mux:
+        conn = mux.connection(0x1001)
+        with pytest.raises(ValueError, match="already exists"):
+            mux.connection(0x1001)
+        conn.close()
+        other = mux.connection(0x1001)
+        with pytest.raises(ValueError, match="already exists"):
+            conn.open()  # The target is used by the other connection now
+        other.close()
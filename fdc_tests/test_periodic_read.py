@@ -0,0 +1,78 @@
+from udsoncan.client import Client
+from udsoncan.configs import default_client_config
+from udsoncan.connections import QueueConnection
+from udsoncan.exceptions import NegativeResponseException
+from udsoncan.services import ReadDataByPeriodicIdentifier
+import pytest
+
+TransmissionMode = ReadDataByPeriodicIdentifier.TransmissionMode
+DID_CONFIG = {0xF201: ">H", 0xF202: "3s"}
+
+
+class PeriodicConnection(QueueConnection):
+    """Loopback connection answering each request with the frames queued in ``responses``"""
+
+    def __init__(self):
+        QueueConnection.__init__(self, "Periodic")
+        self.responses = []
+        self.requests = []
+
+    def specific_send(self, payload, timeout=None):
+        self.requests.append(bytes(payload))
+        for frame in self.responses.pop(0):
+            self.fromuserqueue.put(frame)
+
+
+def make_client(conn):
+    config = dict(default_client_config)
+    config["data_identifiers"] = DID_CONFIG
+    config["request_timeout"] = 0.5
+    config["p2_timeout"] = 0.2
+    return Client(conn, config=config)
+
+
+def test_given_periodic_ids_when_make_request_then_mode_and_low_bytes():
+    request = ReadDataByPeriodicIdentifier.make_request(TransmissionMode.sendAtFastRate, [0xF201, 0x02])
+
+    assert request.get_payload() == b"\x2a\x03\x01\x02"
+    assert ReadDataByPeriodicIdentifier.make_request(TransmissionMode.stopSending).get_payload() == b"\x2a\x04"
+    with pytest.raises(ValueError):
+        ReadDataByPeriodicIdentifier.make_request(TransmissionMode.sendAtSlowRate)
+    with pytest.raises(ValueError):
+        ReadDataByPeriodicIdentifier.make_request(TransmissionMode.sendAtSlowRate, [0xF300])
+
+
+def test_given_periodic_frames_when_decoded_then_did_and_value():
+    assert ReadDataByPeriodicIdentifier.is_periodic_data(b"\x6a\x01\x12\x34")
+    assert not ReadDataByPeriodicIdentifier.is_periodic_data(b"\x6a")  # The positive response
+    assert ReadDataByPeriodicIdentifier.interpret_periodic_data(b"\x6a\x01\x12\x34", DID_CONFIG) == (0xF201, (0x1234,))
+    assert ReadDataByPeriodicIdentifier.interpret_periodic_data(b"\x02abc", DID_CONFIG, with_sid=False) == (0xF202, (b"abc",))
+    with pytest.raises(ValueError):
+        ReadDataByPeriodicIdentifier.interpret_periodic_data(b"\x6a\x01\x12", DID_CONFIG)
+
+
+def test_given_periodic_frames_before_response_when_start_then_response_found():
+    conn = PeriodicConnection()
+    with make_client(conn) as client:
+        conn.responses.append([b"\x6a"])
+        client.start_periodic_read([0xF201, 0xF202])
+        conn.fromuserqueue.put(b"\x6a\x01\x00\x2a")
+        conn.fromuserqueue.put(b"\x6a\x02xyz")
+
+        values = list(client.periodic_data(timeout=0.05))
+
+        # Periodic data still pushed while the stop request waits for its response
+        conn.responses.append([b"\x6a\x01\x00\x2b", b"\x6a\x02xyz", b"\x6a"])
+        response = client.stop_periodic_read()
+
+    assert values == [(0xF201, (0x2A,)), (0xF202, (b"xyz",))]
+    assert conn.requests == [b"\x2a\x03\x01\x02", b"\x2a\x04"]
+    assert response.positive and response.data == b""
+
+
+def test_given_negative_response_when_start_then_error():
+    conn = PeriodicConnection()
+    with make_client(conn) as client:
+        conn.responses.append([b"\x6a\x01\x00\x2a", b"\x7f\x2a\x31"])
+        with pytest.raises(NegativeResponseException):
+            client.start_periodic_read(0xF201)
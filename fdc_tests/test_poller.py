@@ -0,0 +1,72 @@
+from FoxPi_poller import FoxPiPoller
+from FoxPi_signals import FOXPI_DECODER
+from types import SimpleNamespace
+from uds.client_config import client_config
+import pytest
+
+MOTION_STATUS = 0x1002
+BATTERY_STATUS = 0x100D
+
+
+class FakeClient:
+    """Answers ReadDataByIdentifier with zeroed payloads of the configured DID sizes"""
+
+    def __init__(self, short=(), fail=False):
+        self.config = client_config()
+        self.requests = []
+        self.short = set(short)  # DIDs answered with a payload too short to decode
+        self.fail = fail
+
+    def read_data_by_identifier(self, dids):
+        self.requests.append(list(dids))
+        if self.fail:
+            raise TimeoutError("No response")
+        values = {did: (bytes(1 if did in self.short else FOXPI_DECODER.sizes[did]),) for did in dids}
+        return SimpleNamespace(service_data=SimpleNamespace(values=values))
+
+
+def test_given_rates_when_run_then_dids_read_at_their_rate_in_coalesced_requests():
+    client = FakeClient()
+    poller = FoxPiPoller(client, {MOTION_STATUS: 50, BATTERY_STATUS: 10})
+    samples = []
+    poller.subscribe(samples.append)
+
+    poller.run(duration=0.5)
+
+    motion, battery = poller.stats[MOTION_STATUS], poller.stats[BATTERY_STATUS]
+    assert 20 <= motion.samples <= 26 and 4 <= battery.samples <= 6
+    assert motion.rounds == motion.samples and motion.errors == 0
+    assert client.requests[0] == [MOTION_STATUS, BATTERY_STATUS]  # Both due at start, one request
+    assert poller.requests == len(client.requests)
+    assert len(samples) == motion.samples + battery.samples
+    assert samples[0].values == FOXPI_DECODER.decode(MOTION_STATUS, bytes(FOXPI_DECODER.sizes[MOTION_STATUS]))
+
+
+def test_given_failing_subscriber_and_decode_when_run_then_errors_counted_and_polling_goes_on():
+    client = FakeClient(short=[BATTERY_STATUS])
+    poller = FoxPiPoller(client, {MOTION_STATUS: 50, BATTERY_STATUS: 50})
+
+    def subscriber(sample):
+        raise RuntimeError("Subscriber bug")
+
+    poller.subscribe(subscriber)
+    poller.run(duration=0.1)
+
+    motion, battery = poller.stats[MOTION_STATUS], poller.stats[BATTERY_STATUS]
+    assert motion.samples >= 4 and motion.errors == motion.samples  # Subscriber errors
+    assert battery.samples == 0 and battery.errors == battery.rounds >= 4  # Decode errors
+
+
+def test_given_failed_reads_when_jitter_mean_then_averaged_over_rounds():
+    poller = FoxPiPoller(FakeClient(fail=True), {MOTION_STATUS: 50})
+
+    poller.run(duration=0.1)
+
+    stats = poller.stats[MOTION_STATUS]
+    assert stats.samples == 0 and stats.errors == stats.rounds >= 4
+    assert stats.jitter_mean == stats.jitter_sum / stats.rounds
+
+
+def test_given_no_rates_when_poller_then_value_error():
+    with pytest.raises(ValueError):
+        FoxPiPoller(FakeClient(), {})
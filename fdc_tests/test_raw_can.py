@@ -0,0 +1,119 @@
+from uds.raw_can import RawCanData, RawCanDecoder, RawCanStore, decode_raw_can_data
+import json
+import re
+import time
+
+CAN_IDS = [0x500, 0x3C0, 0x238, 0x236, 0x210, 0x438, 0x436, 0x435, 0x3C3, 0x1F0,
+           0x186, 0x182, 0x154, 0x116, 0x4F3, 0x1C5, 0x17A, 0x118, 0x777, 0x777]
+
+
+def make_dump(count):
+    objects = []
+    for i in range(count):
+        can_id = CAN_IDS[i % len(CAN_IDS)]
+        objects.append(json.dumps({
+            "Timestamp": "%.3f" % (1700000000 + i * 0.0005),
+            "Channel": 5,
+            "CAN_ID": "0x%08X" % can_id,
+            "DLC": 8,
+            "CAN_Data": "0x%02X00000000000000" % (i % 256),
+        }))
+    return ("[" + ",".join(objects) + "]").encode("ascii")
+
+
+def test_given_dump_when_decode_then_all_frames():
+    frames = list(decode_raw_can_data(make_dump(40)))
+
+    assert len(frames) == 40
+    assert frames[18] == RawCanData("1700000000.009", 5, 0x777, 8, "0x1200000000000000")
+
+
+def test_given_dump_in_chunks_when_feed_then_same_frames_as_whole_dump():
+    dump = make_dump(200)
+    decoder = RawCanDecoder()
+    frames = []
+    for i in range(0, len(dump), 97):
+        frames.extend(decoder.feed(dump[i:i + 97]))
+
+    assert frames == list(decode_raw_can_data(dump))
+    assert decoder.frame_count == 200
+
+
+def test_given_can_id_filter_when_decode_then_only_matching_frames():
+    decoder = RawCanDecoder(can_ids=[0x777])
+    frames = list(decoder.feed(make_dump(200)))
+
+    assert len(frames) == 20 and all(frame.can_id == 0x777 for frame in frames)
+    assert decoder.skipped_count == 180
+
+
+def test_given_invalid_object_when_decode_then_skipped():
+    decoder = RawCanDecoder()
+    frames = list(decoder.feed(b'[{"Timestamp": "1", "CAN_ID": }, ' + make_dump(1)[1:]))
+
+    assert len(frames) == 1
+    assert decoder.error_count == 1
+
+
+def test_given_store_when_extend_twice_then_frames_are_appended(tmp_path):
+    path = str(tmp_path / "store")
+    with RawCanStore(path) as store:
+        store.extend(decode_raw_can_data(make_dump(40)))
+    with RawCanStore(path) as store:
+        store.extend(decode_raw_can_data(make_dump(40)))
+
+    store = RawCanStore(path)
+    assert len(store) == 80
+    assert len(store.rows(0x777)) == 8
+    frame = next(store.frames(0x777))
+    assert (frame.can_id, frame.channel, frame.dlc, frame.data) == (0x777, 5, 8, "0x1200000000000000")
+    assert float(frame.timestamp) == 1700000000.009
+
+
+def test_given_truncate_when_store_then_previous_frames_removed(tmp_path):
+    path = str(tmp_path / "store")
+    with RawCanStore(path) as store:
+        store.extend(decode_raw_can_data(make_dump(40)))
+    with RawCanStore(path, truncate=True) as store:
+        store.extend(decode_raw_can_data(make_dump(20)))
+
+    assert len(RawCanStore(path)) == 20
+
+
+def test_given_appended_frames_when_frames_then_round_trip(tmp_path):
+    frames = [
+        RawCanData("1700000000.010", 1, 0x77000000, 8, "0x0102030405060708"),
+        RawCanData("1700000000.020", 2, 0x00000007, 2, "0x1234"),  # 0x777 across the two CAN IDs, not aligned
+        RawCanData("1700000000.030", 5, 0x777, 1, "0xEF"),
+    ]
+    with RawCanStore(str(tmp_path / "store"), buffer_size=2) as store:
+        for frame in frames:
+            store.append(frame)
+        assert len(store) == 3
+
+    assert list(store.frames()) == frames
+    assert store.rows(0x777) == [2]
+    assert list(store.frames(0x777)) == frames[2:]
+
+
+def test_given_60s_dump_when_decode_and_store_then_faster_than_regex(tmp_path):
+    dump = make_dump(120000)
+
+    start = time.perf_counter()
+    objects = [json.loads(match) for match in re.findall(r"\{.*?\}", dump.decode("ascii"))]
+    with open(str(tmp_path / "dump.json"), "w") as f:
+        json.dump(objects, f)
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with RawCanStore(str(tmp_path / "store")) as store:
+        store.extend(RawCanDecoder().feed(dump))
+    store_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frames = list(RawCanDecoder(can_ids=[0x777]).feed(dump))
+    filter_time = time.perf_counter() - start
+
+    print(f"{len(objects)} frames: regex + json {regex_time:.2f}s, decoder + store {store_time:.2f}s, 0x777 only {filter_time:.2f}s")
+    assert len(frames) == 12000
+    assert filter_time < regex_time
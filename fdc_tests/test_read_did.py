@@ -1,5 +1,13 @@
 from uds.connection import DoIPConnection
 from uds.client_config import client_config
+from uds.multiplex import MultiplexedDoIPClient
+from uds.capture import CaptureReader, CaptureWriter, Direction
+from uds.replay import ReplayConnection
+from uds.config import DOIP_SERVER_IP, DOIP_DEFAULT_LOGICAL_ADDRESS
+from doipclient import AsyncDoIPClient
+from doipclient.connectors import AsyncDoIPClientUDSConnector
+from udsoncan.async_client import AsyncClient
+import asyncio
 import udsoncan
 import datetime
 from udsoncan.client import Client
@@ -63,3 +71,69 @@ def test_given_open_doip_client_when_read_did_partition_f181_then_success(doip_c
     # Assert
     assert response.positive
     debug_print(response.service_data.values[0xF181])
+
+
+def test_given_multiplexed_client_when_read_did_f195_then_same_as_direct_read(doip_client):
+
+    # Arrange
+    assert doip_client.is_open()
+    fdc_address = 0x680
+    config = client_config()
+    connection = DoIPConnection(doip_client)
+    with Client(connection, config=config) as client:
+        expected = client.read_data_by_identifier(0xF195).service_data.values[0xF195]
+
+    # Act
+    with MultiplexedDoIPClient(doip_client) as mux:
+        futures = [mux.submit(fdc_address, ReadDataByIdentifier.make_request([0xF195], config["data_identifiers"])) for _ in range(2)]
+        responses = [future.result() for future in futures]
+
+    # Assert
+    for response in responses:
+        assert response.positive
+        ReadDataByIdentifier.interpret_response(response, [0xF195], config["data_identifiers"])
+        assert response.service_data.values[0xF195] == expected
+
+
+def test_given_async_client_when_read_did_f195_then_same_as_direct_read(doip_client):
+
+    # Arrange
+    assert doip_client.is_open()
+    config = client_config()
+    connection = DoIPConnection(doip_client)
+    with Client(connection, config=config) as client:
+        expected = client.read_data_by_identifier(0xF195).service_data.values[0xF195]
+
+    async def read_f195():
+        doip = await AsyncDoIPClient.connect(DOIP_SERVER_IP, DOIP_DEFAULT_LOGICAL_ADDRESS, protocol_version=0x03)
+        async with AsyncClient(AsyncDoIPClientUDSConnector(doip, close_connection=True), config=config) as async_client:
+            return await async_client.read_data_by_identifier(0xF195)
+
+    # Act
+    response = asyncio.run(read_f195())
+
+    # Assert
+    assert response.positive
+    assert response.service_data.values[0xF195] == expected
+
+
+def test_given_capture_when_read_did_f195_then_replay_returns_same_value(doip_client, tmp_path):
+
+    # Arrange
+    assert doip_client.is_open()
+    path = str(tmp_path / "read_did.cap")
+
+    # Act
+    with CaptureWriter(path) as capture:
+        with Client(DoIPConnection(doip_client, capture=capture), config=client_config()) as client:
+            expected = client.read_data_by_identifier(0xF195).service_data.values[0xF195]
+
+    with CaptureReader(path) as reader:
+        records = list(reader)
+        with Client(ReplayConnection(reader), config=client_config()) as client:
+            replayed = client.read_data_by_identifier(0xF195).service_data.values[0xF195]
+
+    # Assert
+    assert [record.direction for record in records] == [Direction.TX, Direction.RX]
+    assert records[0].source == records[1].target
+    assert replayed == expected
@@ -0,0 +1,56 @@
+from uds import ffi
+from uds.client import DoIPClient
+import ctypes
+import pytest
+
+MESSAGE = b"\x02\xfd\x80\x01\x00\x00\x00\x07\x06\x80\x0e\x80\x62\xf1\x90"
+
+
+class FakeSlice:
+    """Stands for the ffi.Sliceu8 given to the receive callback"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def copy_into(self, target):
+        target[:len(self.data)] = self.data
+
+
+@pytest.fixture
+def client(monkeypatch):
+    messages = []
+
+    def receive_diagnostic(client_ptr, timeout, retmsg):
+        for message in messages:
+            retmsg(FakeSlice(message))
+        return ffi.FFIError.Ok
+
+    monkeypatch.setattr(ffi, "doipclient_receive_diagnostic", receive_diagnostic)
+    client = DoIPClient.__new__(DoIPClient)
+    client._client_ptr = ctypes.c_void_p()  # Null: close() does not call the native library
+    client.messages = messages
+    return client
+
+
+def test_given_message_when_receive_into_buffer_then_view_of_message(client):
+    client.messages.append(MESSAGE)
+    buffer = bytearray(64)
+
+    view = client.receive_diagnostic_into(buffer)
+
+    assert view.obj is buffer and view == MESSAGE
+    assert client.receive_diagnostic() == MESSAGE
+
+
+def test_given_no_message_when_receive_then_empty(client):
+    assert client.receive_diagnostic() == b""
+    assert len(client.receive_diagnostic_into(bytearray(64))) == 0
+
+
+def test_given_small_buffer_when_receive_into_then_value_error(client):
+    client.messages.append(MESSAGE)
+    with pytest.raises(ValueError, match="too small"):
+        client.receive_diagnostic_into(bytearray(8))
@@ -0,0 +1,86 @@
+from uds.capture import CaptureRecord, Direction, read_text_capture, write_text_capture
+from uds.client_config import client_config
+from uds.replay import ReplayConnection
+from udsoncan.client import Client
+from udsoncan.exceptions import TimeoutException
+import pytest
+import time
+
+TESTER_ADDRESS = 0x0E00
+ECU_ADDRESS = 0x1001
+
+
+def rdbi_session(count, period=0.02, latency=0.01):
+    records = []
+    for i in range(count):
+        t = i * period
+        value = b"FOXPI%05d" % i
+        records.append(CaptureRecord(t, Direction.TX, TESTER_ADDRESS, ECU_ADDRESS, b"\x22\xf1\x95"))
+        records.append(CaptureRecord(t + latency, Direction.RX, ECU_ADDRESS, TESTER_ADDRESS, b"\x62\xf1\x95" + value))
+    return records
+
+
+def test_given_text_capture_when_read_then_same_records(tmp_path):
+    path = str(tmp_path / "session.txt")
+    records = rdbi_session(3) + [CaptureRecord(1.0, Direction.TX, TESTER_ADDRESS, ECU_ADDRESS, b"")]
+    write_text_capture(path, records)
+
+    assert list(read_text_capture(path)) == records
+
+
+def test_given_capture_when_replay_at_max_speed_then_client_decodes_recorded_values():
+    conn = ReplayConnection(rdbi_session(1000))
+    with Client(conn, config=client_config()) as client:
+        start = time.perf_counter()
+        values = [client.read_data_by_identifier_first(0xF195) for _ in range(1000)]
+        elapsed = time.perf_counter() - start
+
+    print(f"1000 requests replayed in {elapsed:.3f}s")
+    assert values[0] == (b"FOXPI00000",) and values[-1] == (b"FOXPI00999",)
+    assert conn.at_end()
+
+
+def test_given_capture_when_replay_requests_then_every_response_is_returned():
+    conn = ReplayConnection(rdbi_session(10))
+    with Client(conn, config=client_config()) as client:
+        responses = [client.send_request(request) for request in conn.requests()]
+
+    assert [r.data[2:] for r in responses] == [b"FOXPI%05d" % i for i in range(10)]
+
+
+def test_given_speed_when_replay_then_original_timing_is_compressed():
+    conn = ReplayConnection(rdbi_session(10, period=0.1), speed=4.0)
+    with Client(conn, config=client_config()) as client:
+        start = time.perf_counter()
+        for _ in range(10):
+            client.read_data_by_identifier(0xF195)
+        elapsed = time.perf_counter() - start
+
+    assert 0.9 * 0.25 < elapsed < 0.4  # 0.9 s of capture replayed 4 times faster
+
+
+def test_given_speed_and_no_timeout_when_wait_frame_then_waits_for_recorded_frame():
+    conn = ReplayConnection(rdbi_session(1, latency=0.1), speed=1.0)
+    conn.open()
+    conn.send(b"\x22\xf1\x95")
+    start = time.perf_counter()
+
+    assert conn.wait_frame(timeout=None) == b"\x62\xf1\x95FOXPI00000"
+    assert time.perf_counter() - start > 0.05
+    with pytest.raises(TimeoutException):
+        conn.wait_frame(timeout=None, exception=True)
+    conn.close()
+
+
+def test_given_different_request_when_replay_then_raises():
+    conn = ReplayConnection(rdbi_session(1))
+    with Client(conn, config=client_config()) as client:
+        with pytest.raises(ValueError):
+            client.read_data_by_identifier(0xF193)
+
+
+def test_given_request_without_response_when_replay_then_timeout():
+    records = [CaptureRecord(0.0, Direction.TX, TESTER_ADDRESS, ECU_ADDRESS, b"\x22\xf1\x95")]
+    with Client(ReplayConnection(records), config=client_config()) as client:
+        with pytest.raises(TimeoutException):
+            client.read_data_by_identifier(0xF195)
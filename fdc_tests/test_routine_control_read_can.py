@@ -1,16 +1,17 @@
 from uds.connection import DoIPConnection
 from uds.client_config import client_config
+from uds.raw_can import RawCanDecoder, RawCanStore
+from uds.can_analysis import analyze, format_report, load_columns, subscribed_can_ids
 import udsoncan
 import datetime
 from udsoncan.client import Client
 from udsoncan.services import *
-import json
 import time
-import re
-import dataclasses
 import os
 import pytest
 
+from fdc_tests.routine_data import RAW_CAN_20_IDS as data
+
 OVERNIGHT_TEST = False
 OVERNIGHT_TEST_FILE = "raw_can_data_20_ids_with_60s_over_night_"
 HAPPY_PATH_TEST_FILE = "raw_can_data_20_ids_with_60s_happy_path"
@@ -18,55 +19,13 @@ KEEP_NEWEST_TEST_FILE = "raw_can_data_20_ids_with_60s_after_70s"
 RESUBSCRIBE_TEST_FILE = "raw_can_data_20_ids_with_60s_resubscribe"
 
 
-@dataclasses.dataclass
-class RawCanData:
-    timestamp: str
-    channel: int
-    can_id: int
-    dlc: int
-    data: str
-
-
-# fmt: off
-# Define data bytes for routine control
-data = bytes([0x14,0x3C,
-              0x01,0x00,0x00,0x05,0x00,
-              0x01,0x00,0x00,0x03,0xC0,
-              0x01,0x00,0x00,0x02,0x38,
-              0x01,0x00,0x00,0x02,0x36,
-              0x01,0x00,0x00,0x02,0x10,
-              0x02,0x00,0x00,0x05,0x00,
-              0x02,0x00,0x00,0x04,0x38,
-              0x02,0x00,0x00,0x04,0x36,
-              0x02,0x00,0x00,0x04,0x35,
-              0x02,0x00,0x00,0x03,0xC3,
-              0x03,0x00,0x00,0x01,0xF0,
-              0x03,0x00,0x00,0x01,0x86,
-              0x03,0x00,0x00,0x01,0x82,
-              0x03,0x00,0x00,0x01,0x54,
-              0x03,0x00,0x00,0x01,0x16,
-              0x05,0x00,0x00,0x04,0xF3,
-              0x05,0x00,0x00,0x01,0xC5,
-              0x05,0x00,0x00,0x01,0x7A,
-              0x05,0x00,0x00,0x01,0x18,
-              0x05,0x00,0x00,0x07,0x77,
-              ])
-# fmt: on
-
-
-def decode_raw_can_data(data, file_name="raw_can_data.json"):
-    pattern = r"\{.*?\}"
-    matchs = re.findall(pattern, data)
-    json_objects = []
-    for match in matchs:
-        try:
-            json_obj = json.loads(match)
-            json_objects.append(json_obj)
-        except json.JSONDecodeError as e:
-            print(e)
-    # Write to file and print total number of CAN messages
-    with open(file_name, "w") as f:
-        json.dump(json_objects, f)
+def decode_raw_can_data(data, store_path="raw_can_data", truncate=True):
+    # Store the CAN frames of the routine status record, replacing the frames of previous runs unless truncate is False
+    decoder = RawCanDecoder()
+    with RawCanStore(store_path, truncate=truncate) as store:
+        count = store.extend(decoder.feed(data))
+    decoder.flush()
+    print(f"{count} CAN frames stored in {store_path}, {decoder.error_count} invalid")
 
 
 def debug_print(msg):
@@ -99,8 +58,8 @@ def test_when_routine_control_0xdffe_then_correct_result(doip_client):
         # Assert
         assert response.positive
         decode_raw_can_data(
-            response.service_data.routine_status_record.decode("ascii"),
-            HAPPY_PATH_TEST_FILE + ".json",
+            response.service_data.routine_status_record,
+            HAPPY_PATH_TEST_FILE,
         )
 
 
@@ -133,8 +92,8 @@ def test_when_routine_control_dffe_over_70s_then_only_newest_60s_data(doip_clien
         # Assert
         assert response.positive
         decode_raw_can_data(
-            response.service_data.routine_status_record.decode("ascii"),
-            KEEP_NEWEST_TEST_FILE + ".json",
+            response.service_data.routine_status_record,
+            KEEP_NEWEST_TEST_FILE,
         )
 
 
@@ -175,8 +134,8 @@ def test_when_routine_control_dffe_resubscribe_then_correct_result(doip_client):
         response = client.get_routine_result(0xDFFE)
         assert response.positive
         decode_raw_can_data(
-            response.service_data.routine_status_record.decode("ascii"),
-            RESUBSCRIBE_TEST_FILE + ".json",
+            response.service_data.routine_status_record,
+            RESUBSCRIBE_TEST_FILE,
         )
 
 
@@ -246,8 +205,9 @@ def test_when_routine_control_dffe_run_over_8_hours_then_correct_result(doip_cli
         # Act
         response = client.routine_control(0xDFFE, control_type=0x01, data=data)
         assert response.positive
-        for i in range(8 * 60):
-            file_name = OVERNIGHT_TEST_FILE + str(1) + f"_{i}.json"
+        for minute in range(8 * 60):
+            # Every minute is appended to the same store
+            file_name = OVERNIGHT_TEST_FILE + str(1)
             # Send tester present for 60 seconds to keep the routine running
             for i in range(60):
                 response = client.tester_present()
@@ -258,7 +218,7 @@ def test_when_routine_control_dffe_run_over_8_hours_then_correct_result(doip_cli
             # Assert
             assert response.positive
             decode_raw_can_data(
-                response.service_data.routine_status_record.decode("ascii"), file_name
+                response.service_data.routine_status_record, file_name, truncate=minute == 0
             )
 
 
@@ -289,8 +249,8 @@ def test_when_routine_control_dffe_resubscribe_over_8_hours_then_correct_result(
         # Act
         response = client.routine_control(0xDFFE, control_type=0x01, data=data)
         assert response.positive
-        for i in range(8 * 60):
-            file_name = OVERNIGHT_TEST_FILE + str(2) + f"_{i}.json"
+        for minute in range(8 * 60):
+            file_name = OVERNIGHT_TEST_FILE + str(2)
             # Send tester present for 60 seconds to keep the routine running
             for i in range(60):
                 response = client.tester_present()
@@ -300,7 +260,7 @@ def test_when_routine_control_dffe_resubscribe_over_8_hours_then_correct_result(
             # Assert
             assert response.positive
             decode_raw_can_data(
-                response.service_data.routine_status_record.decode("ascii"), file_name
+                response.service_data.routine_status_record, file_name, truncate=minute == 0
             )
             response = client.stop_routine(0xDFFE)
             assert response.positive
@@ -309,33 +269,16 @@ def test_when_routine_control_dffe_resubscribe_over_8_hours_then_correct_result(
 
 
 def check_signal_continuity(file_name):
-
-    def transform_bytes_to_decimal(data):
-        # The raw CAN data is represented as a hexadecimal string.
-        # The last two bytes of the data represent the CAN data.
-        # For example: 0xEF00000000000000
-        bytes_str = data[2:4]
-        value = int(bytes_str, 16)
-        return value
-
     # Check if the signal is continuous
-    # By parsing the raw CAN data and check if the data is continuous
-    # If not, print the CAN ID and the timestamp
-
-    with open(file_name, "r") as f:
-        data = json.load(f)
-    data = [d for d in data if d["CAN_ID"] == "0x00000777"]
-    prev_value = 0
-    for i in range(len(data) - 1):
-        prev_index = 0
-        if i == 0:
-            prev_value = transform_bytes_to_decimal(data[i]["CAN_Data"])
-        else:
-            value = transform_bytes_to_decimal(data[i]["CAN_Data"])
-            if value - prev_value != 1 and prev_value - value != 255:
-                print(f"CAN ID: {data[i]['CAN_ID']}, Timestamp: {data[i]['Timestamp']}")
-                print(f"Value: {value}, Previous Value:  {prev_value}")
-            prev_value = value
+    # The first data byte of CAN ID 0x777 counts from 0 to 255 and loops back to 0
+    # Print the period statistics of every subscribed CAN ID, and the timestamps of counter errors
+
+    reports = analyze(load_columns(file_name), can_ids=subscribed_can_ids(data))
+    print(format_report(reports))
+    report = reports[(0x05, 0x777)]
+    for timestamp in report.error_timestamps:
+        print(f"CAN ID: 0x777, Timestamp: {timestamp}")
+    return report
 
 
 def when_over_night_done_then_check_data():
@@ -0,0 +1,51 @@
+from udsoncan import Response
+from udsoncan.BaseService import BaseService
+from udsoncan.services import ReadDataByIdentifier, ControlDTCSetting
+import gc
+import pytest
+
+
+@pytest.fixture
+def service_index():
+    """Removes the service classes defined by a test from the SID index"""
+    yield
+    BaseService._request_id_index.clear()
+    BaseService._response_id_index.clear()
+    gc.collect()  # A class is only freed by the cycle collector
+    assert BaseService.from_request_id(0xBA) is None
+
+
+def test_given_response_payloads_when_from_payload_then_service_is_found():
+    assert Response.from_payload(b"\x62\xf1\x95").service is ReadDataByIdentifier
+    response = Response.from_payload(b"\x7f\x22\x31")
+    assert response.service is ReadDataByIdentifier
+    assert response.code_name == "RequestOutOfRange"
+    assert BaseService.from_response_id(0x00) is None
+
+
+def test_given_new_service_class_when_from_request_id_then_index_is_refreshed(service_index):
+    assert BaseService.from_request_id(0xBA) is None
+
+    class VendorService(BaseService):
+        _sid = 0xBA
+
+    assert BaseService.from_request_id(0xBA) is VendorService
+    assert BaseService.from_response_id(0xFA) is VendorService
+
+
+def test_given_subfunction_when_get_name_then_same_name_on_every_call():
+    for _ in range(2):
+        assert ControlDTCSetting.SettingType.get_name(0x01) == "on"
+        assert ControlDTCSetting.SettingType.get_name(0x02) == "off"
+
+
+def test_given_many_frames_when_from_payload_then_index_built_once():
+    frames = [b"\x62\xf1\x95\x00", b"\x7f\x22\x31", b"\x50\x03\x00\x32\x01\xf4", b"\x7e\x00"]
+    Response.from_payload(frames[0])
+    index = BaseService._response_id_index[BaseService]
+
+    for _ in range(100):
+        for frame in frames:
+            assert Response.from_payload(frame).service is not None
+
+    assert BaseService._response_id_index[BaseService] is index
@@ -0,0 +1,108 @@
+from fdc_tests.fake_ecu import WriteConnection, make_manager
+from uds.session import memoize_security_algo
+from udsoncan.exceptions import NegativeResponseException
+import pytest
+import time
+
+
+def test_given_established_session_when_write_then_only_write_is_sent():
+    conn = WriteConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+
+    for value in range(5):
+        manager.write_data_by_identifier(0x1012, bytes([value]))
+
+    assert conn.requests == [0x10, 0x27, 0x27] + [0x2E] * 5
+    assert manager.session_changes == 1 and manager.unlocks == 1
+
+
+def test_given_ecu_reset_when_write_then_session_established_again_and_write_sent_again():
+    conn = WriteConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+    manager.write_data_by_identifier(0x1012, b"\x01")
+    conn.requests.clear()
+
+    conn.unlocked = False  # Security access lost, e.g. by a timeout of the ECU
+    manager.write_data_by_identifier(0x1012, b"\x00")
+    conn.reset()
+    manager.write_data_by_identifier(0x1012, b"\x01")
+
+    assert conn.requests == [0x2E, 0x27, 0x27, 0x2E] + [0x2E, 0x10, 0x27, 0x27, 0x2E]
+
+
+def test_given_connection_lost_when_write_again_then_session_established_again():
+    conn = WriteConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None)
+    manager.write_data_by_identifier(0x1012, b"\x01")
+    conn.fail_next = True
+
+    with pytest.raises(ConnectionError):
+        manager.write_data_by_identifier(0x1012, b"\x00")
+    conn.reset()  # Reconnected
+    conn.requests.clear()
+    manager.write_data_by_identifier(0x1012, b"\x00")
+
+    assert conn.requests == [0x10, 0x27, 0x27, 0x2E]
+
+
+def test_given_refused_write_when_session_was_just_established_then_error_is_raised():
+    conn = WriteConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None, session=0x02)
+
+    with pytest.raises(NegativeResponseException):
+        manager.write_data_by_identifier(0x1012, b"\x01")
+    assert conn.requests.count(0x2E) == 1
+
+
+def test_given_idle_session_when_keep_alive_then_tester_present_without_response():
+    conn = WriteConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=0.05, s3_timeout=0.2)
+
+    with manager:
+        manager.write_data_by_identifier(0x1012, b"\x01")
+        time.sleep(0.4)
+        manager.write_data_by_identifier(0x1012, b"\x00")
+
+    assert manager.keep_alives >= 4 and conn.requests.count(0x3E) == manager.keep_alives
+    assert conn.requests.count(0x10) == 1 and conn.rxqueue.empty()
+
+
+def test_given_s3_timeout_elapsed_when_write_then_session_established_again():
+    conn = WriteConnection()
+    manager, _ = make_manager(conn, keep_alive_interval=None, s3_timeout=0.05)
+    manager.write_data_by_identifier(0x1012, b"\x01")
+    time.sleep(0.1)
+
+    manager.write_data_by_identifier(0x1012, b"\x00")
+
+    assert conn.requests.count(0x10) == 2
+
+
+def test_given_same_seed_when_unlock_again_then_key_computed_once():
+    conn = WriteConnection(same_seed=True)
+    manager, keys = make_manager(conn, keep_alive_interval=None, memoize_keys=True)
+
+    for _ in range(3):
+        manager.invalidate()
+        manager.ensure()
+
+    assert manager.unlocks == 3 and len(keys) == 1
+
+
+def test_given_default_manager_when_unlock_then_client_security_algo_untouched():
+    conn = WriteConnection(same_seed=True)
+    manager, keys = make_manager(conn, keep_alive_interval=None)
+    security_algo = manager.client.config["security_algo"]
+
+    for _ in range(2):
+        manager.invalidate()
+        manager.ensure()
+
+    assert manager.client.config["security_algo"] is security_algo and len(keys) == 2
+
+
+def test_given_algo_without_params_when_memoized_then_called_with_its_arguments():
+    algo = memoize_security_algo(lambda seed: seed[::-1])
+
+    assert algo(1, b"\x01\x02") == b"\x02\x01" and algo(level=1, seed=b"\x01\x02", params=None) == b"\x02\x01"
+    assert len(algo.cache) == 1
@@ -0,0 +1,169 @@
+from FoxPi_signals import FOXPI_DECODER, INVALID
+import pytest
+import random
+
+
+def test_given_random_payloads_when_decode_bulk_then_same_values_as_decode():
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    for did, size in FOXPI_DECODER.sizes.items():
+        payloads = [bytes(rng.randrange(256) for _ in range(size)) for _ in range(50)]
+        payloads.append(b"\xff" * size)  # Every ff_invalid signal invalid
+
+        bulk = FOXPI_DECODER.decode_bulk(did, b"".join(payloads))
+
+        assert bulk.count == len(payloads)
+        for row, payload in enumerate(payloads):
+            for name, value in FOXPI_DECODER.decode(did, payload).items():
+                if name in bulk.valid:
+                    assert bulk.valid[name][row] == (value != INVALID), (hex(did), name, row)
+                if value != INVALID:
+                    assert bulk.values[name][row] == pytest.approx(value), (hex(did), name, row)
+
+
+def test_given_partial_payload_when_decode_bulk_then_value_error():
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="whole number"):
+        FOXPI_DECODER.decode_bulk(0x100D, bytes(7))
+
+
+# fmt: off
+KNOWN_PAYLOADS = {
+    0x1001: ("000190 01 000050 01 01 01 00002328 01 01 0003E8 35 50", {
+        "AccReq": 5.0, "AccReq_A": 1, "TargetSpdReq": 10.0, "TargetSpdReq_A": 1,
+        "Angle_Target_Valid": 1, "Angle_Target_Req": 1, "Angle_Target": 0.0,
+        "Torque_Target_Valid": 1, "Torque_Target_Req": 1, "Torque_Target": 0.0,
+        "APSVMCReqA_flg": 1, "APSStaSystem_enum": 2, "APSShiftPosnReq_enum": 3, "APS_SpeedCMD": 10.0}),
+    0x1002: ("000320 007F 01 00C8 00 0003F2 01", {
+        "VehicleSpeed": 100.0, "LongAccel": 0.0, "LongAccel_V": 1, "LatAccel": 0.73, "LatAccel_V": 0,
+        "YawRate": 1.0, "YawRate_V": 1}),
+    0x1003: ("01 01 00007B 01 00 00 01 00 01 00 01", {
+        "BrkSw_Sta": 1, "BrkSw_V": 1, "MCPressure": 2.6, "MCPressure_V": 1, "PBA_Active": 0, "PBA_Failed": 0,
+        "ABS_Active": 1, "ABS_Failed": 0, "EBD_Active": 1, "EBD_Failed": 0, "ACC_Availiability": 1}),
+    0x1004: ("000321 01 000320 01 000001 00 000000 01", {
+        "RR_RawwhlSpeed": 50.0625, "RR_RawwhlSpeed_V": 1, "LR_RawwhlSpeed": 50.0, "LR_RawwhlSpeed_V": 1,
+        "RF_RawwhlSpeed": 0.0625, "RF_RawwhlSpeed_V": 0, "LF_RawwhlSpeed": 0.0, "LF_RawwhlSpeed_V": 1}),
+    0x1005: ("000022C4 01 01 00 00 01 00 00", {
+        "SAS_Angle": -10.0, "SAS_V": 1, "SAS_CAL": 1, "EPS_AOI_Control": 0, "EpasFailed": 0,
+        "EPS_TOI_Activation": 1, "EPS_TOI_Unavailable": 0, "EPS_TOI_Fault": 0}),
+    0x1006: ("85 42", {
+        "SWC_ACC_sta": 1, "SWC_CANCEL_Sta": 0, "SWC_SET_down_Sta": 1, "SWC_RES_up_Sta": 0,
+        "SWC_Distance_Sta": 0, "SWC_mode_Sta": 0, "SWC_Up_Sta": 0, "SWC_Down_Sta": 1,
+        "SWC_Left_Sta": 0, "SWC_Right_Sta": 1, "SWC_RegenDown": 0, "SWC_Undefined_Sta": 0,
+        "SWC_VR_Sta": 0, "SWC_LKA_Sta": 0, "SWC_RegenUp": 1, "SWC_Trip_Sta": 0}),
+    0x1007: ("21 43 65 87 0A 0B 0C 0D 0E 0F 10 11 12 13 14 15 01 02 03 00", {
+        "PAS_A_RMR": 1, "PAS_A_RML": 2, "PAS_A_RCR": 3, "PAS_A_RCL": 4,
+        "PAS_A_FMR": 5, "PAS_A_FML": 6, "PAS_A_FCR": 7, "PAS_A_FCL": 8,
+        "PAS_D_RMR": 10, "PAS_D_RML": 11, "PAS_D_RCR": 12, "PAS_D_RCL": 13,
+        "PAS_D_FMR": 14, "PAS_D_FML": 15, "PAS_D_FCR": 16, "PAS_D_FCL": 17,
+        "APS_D_FLL": 18, "APS_D_FLR": 19, "APS_D_RLL": 20, "APS_D_RLR": 21,
+        "PAS_Chime": 1, "PAS_SNSR_Layout": 2, "PAS_Mod_Operation": 3, "PAS_Sta_F_Sys": 0}),
+    0x1008: ("81 0A", {
+        "USS_Sta_RMR": 1, "USS_Sta_RML": 0, "USS_Sta_RCR": 0, "USS_Sta_RCL": 0,
+        "USS_Sta_FMR": 0, "USS_Sta_FML": 0, "USS_Sta_FCR": 0, "USS_Sta_FCL": 1,
+        "USS_Sta_RLR": 0, "USS_Sta_RLL": 1, "USS_Sta_FLR": 0, "USS_Sta_FLL": 1}),
+    0x1009: ("01", {"PTG_USS_SW_Sta": 1}),
+    0x100A: ("06 01", {
+        "Crash_Detect_Status": 0, "Driver_Lock_Status": 1, "All_Door_Switch_Status": 1,
+        "Driver_Door_Switch_Status": 0, "Passenger_Door_Switch_Status": 0,
+        "Rear_Left_Door_Switch_Status": 0, "Rear_Right_Door_Switch_Status": 0,
+        "Tailgate_Switch_Status": 0, "Hood_Switch_Status": 1}),
+    0x100B: ("B6 2D", {
+        "Column_Turn_Lamp_Switch_Status": 2, "Column_Dim_Switch_Status": 1, "Column_Pass_Switch_Status": 0,
+        "Position_Lamp_Status": 1, "Low_Beam_Status": 1, "High_Beam_Status": 0,
+        "Right_Daytime_Running_Light_Status": 1, "Left_Daytime_Running_Light_Status": 1,
+        "Left_Turn_Lamp_Status": 0, "Right_Turn_Lamp_Status": 1, "Brake_Lamp_Status": 1,
+        "Reverse_Lamp_Status": 0, "Rear_Fog_Lamp_Status": 1}),
+    0x100C: ("03 0C B0 02 64 FF", {
+        "Position_Lamp_Control_Enable": 1, "Position_Lamp": 1, "Low_Beam_Control_Enable": 0, "Low_Beam": 0,
+        "High_Beam_Control_Enable": 0, "High_Beam": 0,
+        "Right_Daytime_Running_Light_Control_Enable": 0, "Right_Daytime_Running_Light": 0,
+        "Left_Daytime_Running_Light_Control_Enable": 0, "Left_Daytime_Running_Light": 0,
+        "Left_TurnLamp_Control_Enable": 1, "Left_TurnLamp": 1, "Right_TurnLamp_Control_Enable": 0,
+        "Right_TurnLamp": 0, "Brake_Lamp_Control_Enable": 0, "Brake_Lamp": 0,
+        "Reverse_Lamp_Control_Enable": 0, "Reverse_Lamp": 0, "Rear_Fog_Lamp_Control_Enable": 0,
+        "Rear_Fog_Lamp": 0, "Amblight_Control_Enable": 1, "Control_Area": 5,
+        "RGB_Color": 2, "Bright": 100, "Mode": INVALID}),
+    0x100D: ("7E C8 41 40", {
+        "LVBattDet12V": 12.6, "HVBattSOC": 80.0, "CellTempAvg": 25, "HVBContactorSta": 1, "HVBattErr": 0}),
+    0x100E: ("80 81 82 83 41 42 43 44 70 70 70 70 02", {
+        "LF_Wheel_Pressure": 39.26, "RF_Wheel_Pressure": 39.51, "LR_Wheel_Pressure": 39.76,
+        "RR_Wheel_Pressure": 40.01, "LF_Wheel_Temperature": 25, "RF_Wheel_Temperature": 26,
+        "LR_Wheel_Temperature": 27, "RR_Wheel_Temperature": 28,
+        "LF_Low_Pressure_Threshold": 35.26, "RF_Low_Pressure_Threshold": 35.26,
+        "LR_Low_Pressure_Threshold": 35.26, "RR_Low_Pressure_Threshold": 35.26, "TPMSWarnindi": 2}),
+    0x100F: ("32 00FA", {"ActAPSPosn": 19.6, "BrkPedalPos": 100.0}),
+    0x1010: ("02 0212 0409 07FE 0000 83E7", {
+        "Rr_TqSource": 2, "Rr_TMTqReq_toNidec": 0, "Rr_EDURealTMTq_Nidec": 10,
+        "Rr_MotorAvailTq_Nidec": 1023, "Rr_RegenAvailTq_Nidec": -1023, "Rr_TMSpd_Nidec": 1000}),
+    0x1011: ("01 00 01", {"VTQD_ExternalTqAllow_flg": 1, "VTQD_ExtShftAllow_flg": 0, "VTQD_ExtDoorAllow_flg": 1}),
+    0x1012: ("01", {"Ctrl_Enable_Switch": 1}),
+}
+# fmt: on
+
+
+def assert_values(values, expected):
+    assert list(values) == list(expected)
+    for name, value in expected.items():
+        if isinstance(value, float):
+            assert isinstance(values[name], float) and values[name] == pytest.approx(value), name
+        else:
+            assert values[name] == value, name
+
+
+def test_known_payloads_cover_every_did():
+    assert sorted(KNOWN_PAYLOADS) == sorted(FOXPI_DECODER.sizes)
+
+
+@pytest.mark.parametrize("did", sorted(KNOWN_PAYLOADS))
+def test_given_known_payload_when_decode_then_expected_values(did):
+    payload, expected = KNOWN_PAYLOADS[did]
+    payload = bytes.fromhex(payload)
+    assert len(payload) == FOXPI_DECODER.sizes[did]
+
+    assert_values(FOXPI_DECODER.decode(did, payload), expected)
+
+
+def driving_ctrl(**patches):
+    payload = bytearray.fromhex(KNOWN_PAYLOADS[0x1001][0])
+    for start, data in patches.values():
+        payload[start:start + len(data)] = data
+    return FOXPI_DECODER.decode(0x1001, bytes(payload))
+
+
+def test_given_angle_target_bytes_when_decode_then_invalid_only_if_all_4_bytes_ff():
+    assert driving_ctrl(angle=(10, b"\xff" * 4))["Angle_Target"] == INVALID
+    # Bytes 10..12 were the only ones checked before the signal table
+    assert driving_ctrl(angle=(10, b"\xff\xff\xff\x00"))["Angle_Target"] == pytest.approx(0xFFFFFF00 * 0.1 - 900)
+
+
+def test_given_torque_target_bytes_when_decode_then_invalid_only_if_bytes_16_to_18_ff():
+    values = driving_ctrl(torque=(16, b"\xff" * 3))
+    assert values["Torque_Target"] == INVALID and values["Torque_Target_Req"] == 1
+    # Bytes 15..17 were checked before the signal table: byte 15 is Torque_Target_Req
+    values = driving_ctrl(torque=(15, b"\xff" * 3))
+    assert values["Torque_Target_Req"] == INVALID
+    assert values["Torque_Target"] == pytest.approx(0xFFFFE8 * 0.01 - 10)
+
+
+def test_given_aps_bits_all_ff_when_decode_then_invalid():
+    values = driving_ctrl(aps=(19, b"\xff"))
+    assert [values[name] for name in ("APSVMCReqA_flg", "APSStaSystem_enum", "APSShiftPosnReq_enum")] == [INVALID] * 3
+
+
+def test_given_scaled_signals_when_decode_then_float_not_truncated_decimal():
+    # MCPressure was a Decimal rounded down to 0.1 bar, the wheel speeds Decimals rounded down to 0.0001 km/h
+    brake = FOXPI_DECODER.decode(0x1003, bytes.fromhex("01 01 000003 01 00 00 00 00 00 00 00"))
+    assert isinstance(brake["MCPressure"], float) and brake["MCPressure"] == pytest.approx(-9.4)  # Was Decimal("-9.3")
+    wheels = FOXPI_DECODER.decode(0x1004, bytes.fromhex("000003 01" * 4))
+    assert all(isinstance(wheels[name], float) and wheels[name] == 0.1875 for name in wheels if not name.endswith("_V"))
+
+
+def test_given_ctrl_enable_switch_when_decode_then_ff_invalid():
+    assert FOXPI_DECODER.decode(0x1012, b"\xff") == {"Ctrl_Enable_Switch": INVALID}
+    assert FOXPI_DECODER.decode(0x1012, b"\xfe") == {"Ctrl_Enable_Switch": 0}
+
+
+def test_given_short_payload_when_decode_then_value_error():
+    with pytest.raises(ValueError):
+        FOXPI_DECODER.decode(0x1001, bytes(20))
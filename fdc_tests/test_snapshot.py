@@ -0,0 +1,74 @@
+from FoxPi_read import SNAPSHOT_MAX_PAYLOAD, FoxPiReadDID
+from FoxPi_signals import FOXPI_DECODER, FOXPI_DIDS
+from types import SimpleNamespace
+from uds.client_config import client_config
+import pytest
+
+MOTION_STATUS = 0x1002  # 13 bytes
+POWER_STATUS = 0x1009  # 1 byte
+
+
+class FakeClient:
+    """Answers ReadDataByIdentifier with zeroed payloads of the configured DID sizes"""
+
+    def __init__(self, data_identifiers=None):
+        self.config = client_config()
+        self.config["data_identifiers"] = dict(self.config["data_identifiers"])
+        self.config["data_identifiers"].update(data_identifiers or {})
+        self.requests = []
+
+    def read_data_by_identifier(self, dids):
+        self.requests.append(list(dids))
+        values = {did: (bytes(FOXPI_DECODER.sizes[did]),) for did in dids}
+        return SimpleNamespace(service_data=SimpleNamespace(values=values))
+
+
+@pytest.mark.parametrize("sizes, groups", [
+    ((2045, 2045, 1), [[0xF000, 0xF001], [0xF002]]),  # 1 + 2047 + 2047 == 4095 fits exactly
+    ((2045, 2046, 1), [[0xF000], [0xF001, 0xF002]]),  # One byte more starts a new request
+    ((4092, 1, 1), [[0xF000], [0xF001, 0xF002]]),  # Largest DID alone in a request
+])
+def test_given_dids_around_max_payload_when_group_then_split_at_boundary(sizes, groups):
+    dids = [0xF000, 0xF001, 0xF002]
+    reader = FoxPiReadDID(FakeClient({did: "%ds" % size for did, size in zip(dids, sizes)}))
+
+    assert reader.group_dids(dids) == groups
+    for group in groups:
+        assert 1 + sum(2 + reader.did_size(did) for did in group) <= SNAPSHOT_MAX_PAYLOAD
+
+
+def test_given_did_larger_than_max_payload_when_group_then_value_error():
+    reader = FoxPiReadDID(FakeClient({0xF000: "4093s"}))
+
+    with pytest.raises(ValueError, match="4096 bytes"):
+        reader.group_dids([0xF000])
+
+
+def test_given_small_max_payload_when_read_snapshot_then_one_request_per_group():
+    client = FakeClient()
+    reader = FoxPiReadDID(client)
+
+    # 1 + (2 + 13) + (2 + 1) == 19: both fit in 19 bytes, not in 18
+    snapshot = reader.read_snapshot([MOTION_STATUS, POWER_STATUS], max_payload=19)
+    reader.read_snapshot([MOTION_STATUS, POWER_STATUS], max_payload=18)
+
+    assert client.requests == [[MOTION_STATUS, POWER_STATUS], [MOTION_STATUS], [POWER_STATUS]]
+    assert snapshot[FOXPI_DIDS[MOTION_STATUS]] == FOXPI_DECODER.decode(MOTION_STATUS, bytes(13))
+    assert list(snapshot) == [FOXPI_DIDS[MOTION_STATUS], FOXPI_DIDS[POWER_STATUS]]
+
+
+def test_given_all_dids_when_read_snapshot_then_one_request():
+    client = FakeClient()
+
+    snapshot = FoxPiReadDID(client).read_snapshot()
+
+    assert client.requests == [list(FOXPI_DIDS)]
+    assert len(snapshot) == len(FOXPI_DIDS)
+
+
+def test_given_unknown_did_when_read_snapshot_then_value_error():
+    client = FakeClient()
+
+    with pytest.raises(ValueError):
+        FoxPiReadDID(client).read_snapshot([0xF190])
+    assert client.requests == []
@@ -0,0 +1,212 @@
+from fdc_tests.fake_ecu import ADDRESS, MAX_LENGTH, FlashConnection, make_image, memory_location
+from uds.client_config import client_config
+from uds.transfer import TransferState, download, download_file, upload_file
+from udsoncan.client import Client
+from udsoncan.exceptions import NegativeResponseException
+import hashlib
+import logging
+import os
+import pytest
+import tracemalloc
+import zlib
+
+
+class FileConnection(FlashConnection):
+    """Emulates the RequestFileTransfer service of an ECU on top of FlashConnection"""
+
+    def __init__(self, max_length=MAX_LENGTH):
+        FlashConnection.__init__(self, 0, max_length)
+        self.files = {}
+        self.file = None
+        self.read_position = 0
+        self.last_block = b""
+
+    def specific_send(self, payload):
+        sid = payload[0]
+        if sid == 0x38:
+            moop = payload[1]
+            length = int.from_bytes(payload[2:4], "big")
+            name = payload[4:4 + length].decode("ascii")
+            max_length = b"\x02" + self.max_length.to_bytes(2, "big") + b"\x00"
+            self.next_sequence_number = 1
+            if moop in (0x01, 0x03):
+                self.files[name] = self.file = bytearray()
+                self.rxqueue.put(b"\x78" + payload[1:2] + max_length)
+            elif moop == 0x06:
+                self.file = self.files[name]
+                self.rxqueue.put(b"\x78\x06" + max_length + len(self.file).to_bytes(8, "big"))
+            elif moop == 0x04:
+                self.file = None
+                self.read_file = self.files[name]
+                self.read_position = 0
+                size = len(self.read_file).to_bytes(4, "big")
+                self.rxqueue.put(b"\x78\x04" + max_length + b"\x00\x04" + size + size)
+        elif sid == 0x36:
+            self.transfer_data_count += 1
+            if self.transfer_data_count == self.disconnect_at:
+                raise ConnectionError("Connection lost")
+            sequence_number = payload[1]
+            if sequence_number == self.next_sequence_number:
+                if self.file is not None:
+                    self.file += payload[2:]
+                    self.last_block = b""
+                else:
+                    self.last_block = bytes(self.read_file[self.read_position:self.read_position + self.max_length - 2])
+                    self.read_position += len(self.last_block)
+                self.next_sequence_number = (sequence_number + 1) & 0xFF
+            if self.transfer_data_count not in self.drop:
+                self.rxqueue.put(b"\x76" + payload[1:2] + self.last_block)  # A repeated block is answered again
+        elif sid == 0x37:
+            self.rxqueue.put(b"\x77")
+
+
+def make_client(conn):
+    client = Client(conn, config=client_config())
+    for logger in (client.logger, conn.logger):
+        logger.setLevel(logging.WARNING)
+    return client
+
+
+def test_given_image_file_when_download_then_memory_holds_image(tmp_path):
+    image = make_image(300 * 1024 + 17)  # More than 256 blocks, so that the block sequence counter wraps around
+    path = str(tmp_path / "image.bin")
+    with open(path, "wb") as f:
+        f.write(image)
+    conn = FlashConnection(len(image))
+    progress = []
+
+    result = download(make_client(conn), memory_location(len(image)), path, progress=lambda done, size: progress.append(done))
+
+    assert conn.memory == image
+    assert result.blocks == 301 and result.transferred == len(image) and result.retries == 0
+    assert progress[0] == 1024 and progress[-1] == len(image)
+    assert not conn.active
+    print(f"{result.transferred} bytes in {result.seconds:.3f}s, {result.bytes_per_second:.0f} bytes/s")
+
+
+def test_given_lost_and_busy_responses_when_download_then_blocks_sent_again():
+    image = make_image(10 * 1024)
+    conn = FlashConnection(len(image))
+    conn.drop = {3}
+    conn.busy = {6, 7}
+
+    result = download(make_client(conn), memory_location(len(image)), image)
+
+    assert conn.memory == image
+    assert result.blocks == 10 and result.retries == 3
+
+
+def test_given_too_many_failures_when_download_then_error_is_raised():
+    image = make_image(4 * 1024)
+    conn = FlashConnection(len(image))
+    conn.busy = {2, 3, 4}
+
+    with pytest.raises(NegativeResponseException):
+        download(make_client(conn), memory_location(len(image)), image, max_retries=2)
+
+
+def test_given_lost_connection_when_download_again_then_resumed_from_last_block(tmp_path):
+    image = make_image(20 * 1024)
+    state_path = str(tmp_path / "image.state")
+    conn = FlashConnection(len(image))
+    conn.disconnect_at = 8
+    client = make_client(conn)
+
+    with pytest.raises(ConnectionError):
+        download(client, memory_location(len(image)), image, state_path=state_path)
+    state = TransferState.load(state_path)
+    assert (state.offset, state.sequence_number) == (7 * 1024, 8)
+
+    result = download(client, memory_location(len(image)), image, state_path=state_path)
+
+    assert conn.memory == image
+    assert result.resumed and result.blocks == 13 and result.transferred == 13 * 1024
+    assert conn.download_requests == [(ADDRESS, len(image))]
+    assert not os.path.exists(state_path)
+
+
+def test_given_reset_server_when_resume_then_download_requested_from_last_block():
+    image = make_image(8 * 1024)
+    conn = FlashConnection(len(image))
+    conn.disconnect_at = 4
+    client = make_client(conn)
+    state = TransferState(ADDRESS, len(image), len(image))
+
+    with pytest.raises(ConnectionError):
+        download(client, memory_location(len(image)), image, state=state)
+    conn.active = False  # The server does not know the transfer anymore
+
+    result = download(client, memory_location(len(image)), image, state=state)
+
+    assert conn.memory == image
+    assert result.blocks == 5
+    assert conn.download_requests == [(ADDRESS, len(image)), (ADDRESS + 3 * 1024, 5 * 1024)]
+
+
+def test_given_local_file_when_upload_file_then_server_file_and_checksum(tmp_path):
+    image = make_image(1024 * 1024)
+    path = str(tmp_path / "config.bin")
+    with open(path, "wb") as f:
+        f.write(image)
+    conn = FileConnection()
+
+    result = upload_file(make_client(conn), path)
+    sha256 = upload_file(make_client(conn), path, remote="config.sha", checksum="sha256")
+
+    assert conn.files["config.bin"] == image
+    assert result.checksum == zlib.crc32(image).to_bytes(4, "big")
+    assert sha256.checksum == hashlib.sha256(image).digest()
+    assert result.blocks == 1024
+    print(f"{result.transferred} bytes in {result.seconds:.3f}s, {result.bytes_per_second:.0f} bytes/s")
+
+
+def test_given_interrupted_upload_when_resume_then_rest_of_file_is_sent(tmp_path):
+    image = make_image(50 * 1024 + 100)
+    path = str(tmp_path / "config.bin")
+    with open(path, "wb") as f:
+        f.write(image)
+    conn = FileConnection()
+    conn.disconnect_at = 21
+    client = make_client(conn)
+
+    with pytest.raises(ConnectionError):
+        upload_file(client, path)
+    assert len(conn.files["config.bin"]) == 20 * 1024
+
+    result = upload_file(client, path, resume=True)
+
+    assert conn.files["config.bin"] == image
+    assert result.resumed and result.transferred == len(image) - 20 * 1024 and result.blocks == 31
+    assert result.checksum == zlib.crc32(image).to_bytes(4, "big")
+
+
+def test_given_server_file_when_download_file_then_local_file_and_checksum(tmp_path):
+    image = make_image(300 * 1024 + 5)
+    conn = FileConnection()
+    conn.files["fdc.log"] = image
+    conn.drop = {10}
+    path = str(tmp_path / "fdc.log")
+
+    result = download_file(make_client(conn), "fdc.log", path)
+
+    with open(path, "rb") as f:
+        assert f.read() == image
+    assert result.checksum == zlib.crc32(image).to_bytes(4, "big")
+    assert result.blocks == 301 and result.retries == 1
+    assert not os.path.exists(path + ".part")
+
+
+def test_given_large_server_file_when_download_file_then_memory_does_not_grow_with_file(tmp_path):
+    conn = FileConnection()
+    conn.files["fdc.log"] = make_image(256 * 1024) * 16  # 4 MB
+    client = make_client(conn)
+
+    tracemalloc.start()
+    try:
+        download_file(client, "fdc.log", str(tmp_path / "fdc.log"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert os.path.getsize(str(tmp_path / "fdc.log")) == 4 * 1024 * 1024
+    assert peak < 512 * 1024
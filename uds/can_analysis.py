@@ -0,0 +1,184 @@
+"""Vectorized analysis of raw CAN frames stored by ``uds.raw_can.RawCanStore``.
+
+For each CAN ID, the report gives the message period statistics and the
+continuity of a rolling counter carried by one data byte, e.g. the counter
+sent on CAN ID 0x777 by the overnight tests, which counts from 0 to 255 and
+wraps around to 0.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import dataclasses
+import os
+
+from uds.raw_can import RawCanStore
+
+try:
+    import numpy as np  # type:ignore
+    _import_numpy_err = None
+except Exception as e:
+    _import_numpy_err = e
+
+
+@dataclasses.dataclass
+class CanColumns:
+    """The columns of a RawCanStore, as NumPy arrays. ``data`` has one row of DATA_SIZE bytes per frame."""
+
+    timestamp: "np.ndarray"
+    channel: "np.ndarray"
+    can_id: "np.ndarray"
+    dlc: "np.ndarray"
+    data: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.can_id)
+
+
+@dataclasses.dataclass
+class CanIdReport:
+    channel: Optional[int]  # None for the frames of every channel
+    can_id: int
+    count: int
+    first_timestamp: float = float("nan")
+    last_timestamp: float = float("nan")
+    period_mean: float = float("nan")  # Seconds
+    period_jitter: float = float("nan")  # Standard deviation of the period, in seconds
+    max_gap: float = float("nan")  # Longest time between two frames, in seconds
+    dropouts: int = 0  # Gaps longer than the dropout threshold
+    counter_errors: int = 0  # Counter steps other than +1
+    lost_frames: int = 0  # Frames missing according to the counter
+    wraparounds: int = 0  # Counter steps from the maximum value back to 0
+    error_timestamps: List[float] = dataclasses.field(default_factory=list)  # Timestamps of the first counter errors
+
+    @property
+    def continuous(self) -> bool:
+        return self.counter_errors == 0
+
+
+def load_columns(path: str) -> CanColumns:
+    """Maps the column files of a RawCanStore, without reading them.
+
+    :param path: The RawCanStore directory.
+    """
+    if _import_numpy_err is not None:
+        raise _import_numpy_err
+
+    store = RawCanStore(path)
+    dtypes = {"timestamp": "<f8", "channel": "u1", "can_id": "<u4", "dlc": "u1"}
+    columns = {}
+    for name, dtype in dtypes.items():
+        file = store.file(name)
+        if os.path.exists(file) and os.path.getsize(file) > 0:
+            columns[name] = np.memmap(file, dtype=dtype, mode="r")
+        else:
+            columns[name] = np.empty(0, dtype=dtype)
+    count = len(columns["can_id"])
+    file = store.file("data")
+    if count > 0:
+        data = np.memmap(file, dtype="u1", mode="r", shape=(count, RawCanStore.DATA_SIZE))
+    else:
+        data = np.empty((0, RawCanStore.DATA_SIZE), dtype="u1")
+    return CanColumns(data=data, **columns)
+
+
+def subscribed_can_ids(routine_data: bytes) -> List[Tuple[int, int]]:
+    """Returns the (channel, CAN ID) pairs subscribed by the option record of routine 0xDFFE:
+    the number of CAN IDs, the duration in seconds, then per CAN ID a channel byte
+    and a 4 bytes CAN ID."""
+    count = routine_data[0]
+    return [
+        (routine_data[2 + i * 5], int.from_bytes(routine_data[2 + i * 5 + 1:2 + i * 5 + 5], "big"))
+        for i in range(count)
+    ]
+
+
+def analyze_can_id(
+    columns: CanColumns,
+    can_id: int,
+    channel: Optional[int] = None,
+    counter_byte: Optional[int] = 0,
+    counter_modulo: int = 256,
+    dropout_factor: float = 1.5,
+    max_error_timestamps: int = 100,
+) -> CanIdReport:
+    """Computes the report of one CAN ID.
+
+    :param channel: The channel of the CAN ID, or None for the frames of every channel.
+    :param counter_byte: Index of the data byte holding a rolling counter, or None to skip the counter check.
+    :param counter_modulo: The counter wraps around from ``counter_modulo - 1`` to 0.
+    :param dropout_factor: A gap longer than ``dropout_factor`` times the median period is a dropout.
+    :param max_error_timestamps: Maximum number of counter error timestamps kept in the report.
+    """
+    if _import_numpy_err is not None:
+        raise _import_numpy_err
+
+    selected = columns.can_id == can_id
+    if channel is not None:
+        selected &= columns.channel == channel
+    rows = np.flatnonzero(selected)
+    report = CanIdReport(channel=channel, can_id=can_id, count=len(rows))
+    if len(rows) == 0:
+        return report
+
+    timestamps = np.asarray(columns.timestamp[rows])
+    report.first_timestamp = float(timestamps[0])
+    report.last_timestamp = float(timestamps[-1])
+    if len(rows) >= 2:
+        periods = np.diff(timestamps)
+        report.period_mean = float(np.nanmean(periods))
+        report.period_jitter = float(np.nanstd(periods))
+        report.max_gap = float(np.nanmax(periods))
+        report.dropouts = int(np.count_nonzero(periods > dropout_factor * np.nanmedian(periods)))
+
+        if counter_byte is not None:
+            counters = np.asarray(columns.data[rows, counter_byte], dtype=np.int64) % counter_modulo
+            steps = np.diff(counters) % counter_modulo
+            errors = np.flatnonzero(steps != 1)
+            report.counter_errors = len(errors)
+            report.lost_frames = int(np.sum((steps[errors] - 1) % counter_modulo))
+            report.wraparounds = int(np.count_nonzero((counters[:-1] == counter_modulo - 1) & (counters[1:] == 0)))
+            report.error_timestamps = timestamps[errors[:max_error_timestamps] + 1].tolist()
+    return report
+
+
+def analyze(
+    columns: CanColumns,
+    can_ids: Optional[Iterable[Tuple[int, int]]] = None,
+    counter_byte: Optional[int] = 0,
+    counter_modulo: int = 256,
+    dropout_factor: float = 1.5,
+) -> Dict[Tuple[int, int], CanIdReport]:
+    """Computes the report of each CAN ID, by channel.
+
+    :param can_ids: The (channel, CAN ID) pairs to report, e.g. the subscribed CAN IDs,
+        so that a CAN ID that was never received is reported with a count of 0. When
+        None, every pair found in the frames is reported.
+    """
+    if _import_numpy_err is not None:
+        raise _import_numpy_err
+
+    if can_ids is None:
+        keys = np.unique(columns.channel.astype(np.uint64) << np.uint64(32) | columns.can_id)
+        can_ids = [(int(key) >> 32, int(key) & 0xFFFFFFFF) for key in keys]
+    return {
+        (channel, can_id): analyze_can_id(columns, can_id, channel, counter_byte, counter_modulo, dropout_factor)
+        for channel, can_id in dict.fromkeys(can_ids)  # Without duplicates, in order
+    }
+
+
+def format_report(reports: Dict[Tuple[int, int], CanIdReport], counter: bool = True) -> str:
+    """Formats reports as a text table."""
+    lines = ["Channel  CAN ID       count  period ms  jitter ms  max gap ms  dropouts" + ("  counter errors  lost  wraps" if counter else "")]
+    for report in reports.values():
+        line = "%7s  0x%08X %7d %10.3f %10.3f %11.3f %9d" % (
+            "*" if report.channel is None else report.channel,
+            report.can_id,
+            report.count,
+            report.period_mean * 1000,
+            report.period_jitter * 1000,
+            report.max_gap * 1000,
+            report.dropouts,
+        )
+        if counter:
+            line += " %15d %5d %6d" % (report.counter_errors, report.lost_frames, report.wraparounds)
+        lines.append(line)
+    return "\n".join(lines)
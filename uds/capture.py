@@ -0,0 +1,325 @@
+"""Recorded UDS traffic.
+
+A capture is a sequence of :class:`CaptureRecord`, one per UDS payload sent
+to or received from an ECU. The text format stores one record per line::
+
+    <timestamp> <TX|RX> <source address> <target address> <payload>
+
+with the timestamp in seconds and the addresses and payload in hexadecimal.
+Empty lines and lines starting with ``#`` are ignored.
+
+The binary format is made for long recordings. The data file starts with
+``CAPTURE_MAGIC``, followed by the records, each made of a fixed-size
+header (``RECORD_HEADER``) and its payload. Records are only ever appended.
+A sidecar index file (``<data file>.idx``) holds one fixed-size entry
+(``INDEX_ENTRY``) per record, with its timestamp, its offset in the data
+file, its SID and its DID, if any.
+"""
+
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+import dataclasses
+import mmap
+import os
+import struct
+
+
+class Direction(IntEnum):
+    TX = 0  # Request sent by the tester
+    RX = 1  # Response received from the ECU
+
+
+@dataclasses.dataclass
+class CaptureRecord:
+    timestamp: float
+    direction: Direction
+    source: int
+    target: int
+    payload: bytes
+
+
+class TextCaptureWriter:
+    """Writes records to a text capture file.
+
+    :param path: The capture file, created or truncated.
+    """
+
+    def __init__(self, path: str):
+        self._file: Optional[TextIO] = open(path, "w")
+
+    def write(self, record: CaptureRecord) -> None:
+        assert self._file is not None, "TextCaptureWriter is closed"
+        self._file.write(
+            "%.6f %s %04x %04x %s\n"
+            % (record.timestamp, record.direction.name, record.source, record.target, record.payload.hex())
+        )
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "TextCaptureWriter":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+
+def write_text_capture(path: str, records: Iterable[CaptureRecord]) -> None:
+    """Writes records to a text capture file."""
+    with TextCaptureWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+
+
+def read_text_capture(path: str) -> Iterator[CaptureRecord]:
+    """Reads the records of a text capture file, one line at a time.
+
+    :raises ValueError: If a line is not a valid record.
+    """
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            if len(fields) == 4:
+                fields.append("")  # Empty payload
+            try:
+                timestamp, direction, source, target, payload = fields
+                yield CaptureRecord(
+                    float(timestamp),
+                    Direction[direction],
+                    int(source, 16),
+                    int(target, 16),
+                    bytes.fromhex(payload),
+                )
+            except (KeyError, ValueError):
+                raise ValueError(f"{path}:{line_number}: invalid capture record: {line}")
+
+
+CAPTURE_MAGIC = b"FOXCAP01"
+# timestamp | direction | source address | target address | payload length
+RECORD_HEADER = struct.Struct("<dBHHI")
+# timestamp | record offset | SID | has DID | DID
+INDEX_ENTRY = struct.Struct("<dQBBH")
+
+# Services whose payload starts with a DID, after the SID: ReadDataByIdentifier,
+# WriteDataByIdentifier and InputOutputControlByIdentifier, requests and responses
+DID_SERVICES = frozenset([0x22, 0x62, 0x2E, 0x6E, 0x2F, 0x6F])
+
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def _index_entry(record: CaptureRecord, offset: int) -> bytes:
+    payload = record.payload
+    sid = payload[0] if len(payload) > 0 else 0
+    if sid in DID_SERVICES and len(payload) >= 3:
+        return INDEX_ENTRY.pack(record.timestamp, offset, sid, 1, (payload[1] << 8) | payload[2])
+    return INDEX_ENTRY.pack(record.timestamp, offset, sid, 0, 0)
+
+
+class CaptureWriter:
+    """Appends records to a binary capture file and its index.
+
+    Records are written through buffered files: call ``flush`` to make them
+    visible to a reader opened meanwhile.
+
+    :param path: The capture data file. It is created if it does not exist,
+        and appended to otherwise. The index of an existing data file is
+        rebuilt first if it is missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path) and not os.path.exists(index_path(path)):
+            build_index(path)  # Otherwise the records already written would not be indexed
+        self._data = open(path, "ab")
+        self._index = open(index_path(path), "ab")
+        if self._data.tell() == 0:
+            self._data.write(CAPTURE_MAGIC)
+        self._offset = self._data.tell()
+
+    def write(self, record: CaptureRecord) -> None:
+        payload = record.payload
+        self._data.write(
+            RECORD_HEADER.pack(record.timestamp, record.direction, record.source, record.target, len(payload))
+        )
+        self._data.write(payload)
+        self._index.write(_index_entry(record, self._offset))
+        self._offset += RECORD_HEADER.size + len(payload)
+
+    def flush(self) -> None:
+        self._data.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        if not self._data.closed:
+            self._data.close()
+            self._index.close()
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+
+def build_index(path: str) -> int:
+    """(Re)builds the index of a binary capture file by scanning its records.
+
+    A truncated record at the end of the file, e.g. after a crash, is left out.
+    An empty file, e.g. of a writer that did not flush yet, has no records.
+
+    :return: The number of records.
+    """
+    count = 0
+    with open(path, "rb") as f, open(index_path(path), "wb") as index:
+        magic = f.read(len(CAPTURE_MAGIC))
+        if magic != CAPTURE_MAGIC:
+            if not magic:
+                return 0
+            raise ValueError(f"{path} is not a capture file")
+        offset = len(CAPTURE_MAGIC)
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            timestamp, direction, source, target, length = RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                break
+            index.write(_index_entry(CaptureRecord(timestamp, Direction(direction), source, target, payload), offset))
+            offset += RECORD_HEADER.size + length
+            count += 1
+    return count
+
+
+class CaptureReader:
+    """Random access to a binary capture file.
+
+    The data file and its index are memory-mapped: opening a capture does not
+    read it, and only the records accessed are loaded. Records are numbered
+    in the order they were written. The time lookups expect records to be
+    written in time order.
+
+    :param path: The capture data file. Its index is built if it is missing.
+        Use :func:`build_index` to recover the index of a capture that was not closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if not os.path.exists(index_path(path)):
+            build_index(path)
+        self._data_file = open(path, "rb")
+        self._index_file = open(index_path(path), "rb")
+        data_size = os.fstat(self._data_file.fileno()).st_size
+        self._data: Union[mmap.mmap, bytes] = (
+            mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ) if data_size > 0 else b""
+        )
+        index_size = os.fstat(self._index_file.fileno()).st_size
+        self._index: Union[mmap.mmap, bytes] = (
+            mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ) if index_size > 0 else b""
+        )
+        if data_size > 0 and self._data[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a capture file")
+        self._count = index_size // INDEX_ENTRY.size
+        # Entries written while the data was still buffered point past the end of the data file
+        while self._count > 0 and self._record_end(self._count - 1) > len(self._data):
+            self._count -= 1
+        self._by_sid: Optional[Dict[int, List[int]]] = None
+        self._by_did: Optional[Dict[int, List[int]]] = None
+
+    def close(self) -> None:
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._index_file.close()
+        self._data_file.close()
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record_end(self, i: int) -> int:
+        offset = INDEX_ENTRY.unpack_from(self._index, i * INDEX_ENTRY.size)[1]
+        if offset + RECORD_HEADER.size > len(self._data):
+            return offset + RECORD_HEADER.size
+        return offset + RECORD_HEADER.size + RECORD_HEADER.unpack_from(self._data, offset)[4]
+
+    def __getitem__(self, i: int) -> CaptureRecord:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("capture record index out of range")
+        offset = INDEX_ENTRY.unpack_from(self._index, i * INDEX_ENTRY.size)[1]
+        timestamp, direction, source, target, length = RECORD_HEADER.unpack_from(self._data, offset)
+        start = offset + RECORD_HEADER.size
+        return CaptureRecord(timestamp, Direction(direction), source, target, self._data[start:start + length])
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records(0, self._count)
+
+    def records(self, start: int, stop: int) -> Iterator[CaptureRecord]:
+        """Yields the records numbered from ``start`` to ``stop`` (excluded)."""
+        for i in range(max(start, 0), min(stop, self._count)):
+            yield self[i]
+
+    def timestamp(self, i: int) -> float:
+        return INDEX_ENTRY.unpack_from(self._index, i * INDEX_ENTRY.size)[0]
+
+    def _bisect(self, t: float) -> int:
+        """Returns the number of the first record with a timestamp >= t."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def time_range(self, start: float, end: float) -> Tuple[int, int]:
+        """Returns the numbers of the first record at or after ``start`` and of the
+        first record at or after ``end``."""
+        return self._bisect(start), self._bisect(end)
+
+    def window(self, start: float, end: float) -> Iterator[CaptureRecord]:
+        """Yields the records with a timestamp in [start, end)."""
+        return self.records(*self.time_range(start, end))
+
+    def _build_key_indexes(self) -> None:
+        by_sid: Dict[int, List[int]] = {}
+        by_did: Dict[int, List[int]] = {}
+        for i, (_, _, sid, has_did, did) in enumerate(INDEX_ENTRY.iter_unpack(self._index[: self._count * INDEX_ENTRY.size])):
+            by_sid.setdefault(sid, []).append(i)
+            if has_did:
+                by_did.setdefault(did, []).append(i)
+        self._by_sid = by_sid
+        self._by_did = by_did
+
+    def find_sid(self, sid: int) -> List[int]:
+        """Returns the numbers of the records whose payload starts with ``sid``,
+        e.g. 0x62 for the positive responses of ReadDataByIdentifier."""
+        if self._by_sid is None:
+            self._build_key_indexes()
+        assert self._by_sid is not None
+        return self._by_sid.get(sid, [])
+
+    def find_did(self, did: int) -> List[int]:
+        """Returns the numbers of the requests and responses of DID services for ``did``.
+        Only the first DID of a request reading several DIDs is indexed."""
+        if self._by_did is None:
+            self._build_key_indexes()
+        assert self._by_did is not None
+        return self._by_did.get(did, [])
@@ -77,6 +77,8 @@ class DoIPClient:
         :raises Exception: If the client could not be created.
         """
         target_ip_address_bytes = bytes(target_ip_address, "ascii")
+        self.source_logical_address = source_logical_address
+        self.target_logical_address = target_logical_address
         # Initialize to a null pointer. The FFI function will fill this.
         self._client_ptr = ctypes.c_void_p()
         ffi._errcheck(
@@ -149,6 +151,28 @@ class DoIPClient:
 
         :param timeout: The unit of timeout is seconds.
 
+        :raises Exception: If the response could not be received.
+        """
+        return bytes(self.receive_diagnostic_into(timeout=timeout))
+
+    def receive_diagnostic_into(
+        self, buffer: Optional[bytearray] = None, timeout: Optional[float] = None
+    ) -> memoryview:
+        """Receive a diagnostic response into a buffer, without intermediate copies.
+
+        The message is copied once, from the FFI slice into `buffer`, or into a new
+        bytearray of the exact message size when `buffer` is None. When a buffer is
+        reused, views returned by a previous call see the new content.
+
+        This function will not timeout if the timeout value is None, infinity or NaN.
+
+        :param buffer: Optional writable buffer to receive the message into.
+        :param timeout: The unit of timeout is seconds.
+
+        :return: A view of the received DoIP message (header included).
+        :rtype: memoryview
+
+        :raises ValueError: If `buffer` is too small for the received message.
         :raises Exception: If the response could not be received.
         """
         if self._client_ptr is None:
@@ -156,16 +180,27 @@ class DoIPClient:
         if timeout is None or not math.isfinite(timeout):
             timeout = float("inf")
 
-        msg = bytearray()
+        received = []
 
         def retmsg(s: ffi.Sliceu8) -> None:
-            msg.extend(s.bytearray())
+            # Exceptions raised in a ctypes callback are swallowed, so only record the size here
+            target = bytearray(len(s)) if buffer is None else buffer
+            if len(target) >= len(s):
+                s.copy_into(target)
+            received.append((target, len(s)))
 
         ffi._errcheck(
             ffi.doipclient_receive_diagnostic(self._client_ptr, timeout, retmsg),
             ffi.FFIError.Ok,
         )
-        return bytes(msg)
+        if not received:  # Ok without a message
+            return memoryview(bytearray() if buffer is None else buffer)[:0]
+        target, size = received[-1]
+        if len(target) < size:
+            raise ValueError(
+                f"Receive buffer of {len(target)} bytes is too small for a {size} bytes message"
+            )
+        return memoryview(target)[:size]
 
     def receive_multiple_diagnostic_responses(
         self, timeout: Optional[float] = None
@@ -221,6 +256,7 @@ class DoIPClient:
             ffi.doipclient_set_target_address(self._client_ptr, new_target_address),
             ffi.FFIError.Ok,
         )
+        self.target_logical_address = new_target_address
 
 
 def get_dids_by_app_category(
@@ -1,18 +1,58 @@
-from typing import Optional
+from typing import Optional, Union
+from uds.capture import CaptureRecord, CaptureWriter, Direction, TextCaptureWriter
 from uds.client import DoIPClient
 from udsoncan.connections import BaseConnection
+import time
 
 
 class DoIPConnection(BaseConnection):
-    def __init__(self, doip_client: DoIPClient, name: Optional[str] = None):
+    def __init__(
+        self,
+        doip_client: DoIPClient,
+        name: Optional[str] = None,
+        rx_buffer: Optional[bytearray] = None,
+        capture: Optional[Union[CaptureWriter, TextCaptureWriter]] = None,
+        close_client: bool = False,
+    ):
+        """
+        :param rx_buffer: Optional buffer reused for every received message. Frames returned by
+            `wait_frame` are then views of this buffer and are only valid until the next frame
+            is received. When None, each frame gets its own buffer.
+        :param capture: Optional writer recording every payload sent and received (see `uds.capture`).
+            The connection does not close it.
+        :param close_client: Close the DoIPClient when the connection is closed.
+        """
         BaseConnection.__init__(self, name)
         self.doip_client = doip_client
+        self.rx_buffer = rx_buffer
+        self.capture = capture
+        self.close_client = close_client
 
     def specific_send(self, payload):
         self.doip_client.send_diagnostic(payload, 2)
+        if self.capture is not None:
+            self.capture.write(
+                CaptureRecord(
+                    time.time(),
+                    Direction.TX,
+                    self.doip_client.source_logical_address,
+                    self.doip_client.target_logical_address,
+                    bytes(payload),
+                )
+            )
 
     def specific_wait_frame(self, timeout=2):
-        msg = self.doip_client.receive_diagnostic(timeout)
+        msg = self.doip_client.receive_diagnostic_into(self.rx_buffer, timeout)
+        if self.capture is not None:
+            self.capture.write(
+                CaptureRecord(
+                    time.time(),
+                    Direction.RX,
+                    int.from_bytes(msg[8:10], "big"),
+                    int.from_bytes(msg[10:12], "big"),
+                    bytes(msg[12:]),
+                )
+            )
         # 12 bytes include 8 bytes header and source and target address
         # [version | inverse of version | payload length | source address | target address | user data]
         return msg[12:]
@@ -21,7 +61,8 @@ class DoIPConnection(BaseConnection):
         pass
 
     def close(self):
-        pass
+        if self.close_client:
+            self.doip_client.close()
 
     def empty_rxqueue(self):
         pass
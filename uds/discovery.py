@@ -0,0 +1,257 @@
+"""Discovery of DoIP entities, with a cache of the entities found.
+
+``doipclient.DoIPClient.get_entity`` opens a UDP socket for each call and
+returns the first VehicleIdentificationResponse, or times out after
+A_DOIP_CTRL when the IP address is wrong. ``DiscoveryService`` sends its
+VehicleIdentificationRequests from one socket:
+
+- :meth:`DiscoveryService.broadcast` sends one request to a broadcast
+  address and collects every response received within a window;
+- :meth:`DiscoveryService.probe` sends one unicast request to each
+  candidate IP address at once, e.g. the FoxPi (gen1) and FD gen2 addresses,
+  and waits for all of them together. Once a candidate answered, the ones
+  preferred to it are only waited for during a short grace period.
+
+The VIN, EID, GID and logical address of each responding entity are kept per
+IP address for ``ttl`` seconds, optionally in a JSON file shared by several
+processes, so that :meth:`DiscoveryService.find` answers from the cache
+without any request.
+"""
+
+from typing import Dict, Iterable, List, Optional
+import dataclasses
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+from doipclient import DoIPClient as pyDoIPClient
+from doipclient.client import DEFAULT_RX_BUFFER_SIZE, Parser
+from doipclient.constants import A_DOIP_CTRL, UDP_DISCOVERY
+from doipclient.messages import VehicleIdentificationRequest, VehicleIdentificationResponse, payload_message_to_type
+from uds.config import DOIP_CANDIDATE_IPS
+
+logger = logging.getLogger("Discovery")
+
+BROADCAST_ADDRESS = "255.255.255.255"
+DEFAULT_PROTOCOL_VERSION = 0xFF  # Default protocol version of vehicle identification requests
+DEFAULT_TTL = 300.0
+DEFAULT_GRACE = 0.2  # Time the preferred candidates are waited for once another candidate answered
+
+
+@dataclasses.dataclass
+class DoIPEntity:
+    """A DoIP entity found by a vehicle identification request."""
+
+    ip: str
+    logical_address: int
+    vin: str
+    eid: bytes
+    gid: bytes
+    further_action_required: int
+    found_at: float  # time.time() of the response
+
+    @classmethod
+    def from_response(cls, ip: str, response: VehicleIdentificationResponse) -> "DoIPEntity":
+        return cls(ip, response.logical_address, response.vin, bytes(response.eid), bytes(response.gid),
+                   response.further_action_required, time.time())
+
+    def to_json(self) -> Dict[str, object]:
+        fields = dataclasses.asdict(self)
+        fields["eid"] = self.eid.hex()
+        fields["gid"] = self.gid.hex()
+        return fields
+
+    @classmethod
+    def from_json(cls, fields: Dict[str, object]) -> "DoIPEntity":
+        fields = dict(fields)
+        fields["eid"] = bytes.fromhex(str(fields["eid"]))
+        fields["gid"] = bytes.fromhex(str(fields["gid"]))
+        return cls(**fields)  # type: ignore[arg-type]
+
+
+class DiscoveryService:
+    """Finds DoIP entities and remembers them.
+
+    :param ttl: Time an entity is kept in the cache, in seconds.
+    :param timeout: Default time waited for responses, in seconds.
+    :param protocol_version: DoIP protocol version of the requests.
+    :param port: UDP port of the DoIP entities.
+    :param cache_path: JSON file the cache is read from and written to, or None to keep it in memory only.
+    :param grace: Time a probe waits for the candidates preferred to one that answered, in seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        timeout: float = A_DOIP_CTRL,
+        protocol_version: int = DEFAULT_PROTOCOL_VERSION,
+        port: int = UDP_DISCOVERY,
+        cache_path: Optional[str] = None,
+        grace: float = DEFAULT_GRACE,
+    ):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.protocol_version = protocol_version
+        self.port = port
+        self.cache_path = cache_path
+        self.grace = grace
+        self._entities: Dict[str, DoIPEntity] = {}
+        self._lock = threading.Lock()
+        if cache_path is not None:
+            self._load()
+
+    def get(self, ip: str) -> Optional[DoIPEntity]:
+        """The cached entity of an IP address, if found less than ``ttl`` seconds ago."""
+        with self._lock:
+            entity = self._entities.get(ip)
+        if entity is None or time.time() - entity.found_at >= self.ttl:
+            return None
+        return entity
+
+    def entities(self) -> List[DoIPEntity]:
+        """The cached entities found less than ``ttl`` seconds ago."""
+        with self._lock:
+            ips = list(self._entities)
+        return [entity for entity in map(self.get, ips) if entity is not None]
+
+    def invalidate(self, ip: Optional[str] = None) -> None:
+        """Removes an IP address, or every IP address, from the cache."""
+        with self._lock:
+            if ip is None:
+                self._entities.clear()
+            else:
+                self._entities.pop(ip, None)
+        self._save()
+
+    def find(self, candidates: Iterable[str] = DOIP_CANDIDATE_IPS, timeout: Optional[float] = None) -> DoIPEntity:
+        """Returns the entity of the first candidate IP address that answers, from the cache if possible.
+
+        The candidates missing from the cache are probed together.
+
+        :raises TimeoutError: If no candidate answers.
+        """
+        candidates = list(dict.fromkeys(candidates))
+        for ip in candidates:
+            entity = self.get(ip)
+            if entity is not None:
+                return entity
+        found = self.probe(candidates, timeout)
+        for ip in candidates:
+            if ip in found:
+                return found[ip]
+        raise TimeoutError("No DoIP entity answered at %s" % ", ".join(candidates))
+
+    def probe(self, candidates: Iterable[str], timeout: Optional[float] = None) -> Dict[str, DoIPEntity]:
+        """Sends a vehicle identification request to each candidate IP address at once.
+
+        Waits until the first candidate answers, as the next ones are only
+        alternatives, or until every candidate answered, or for ``timeout``.
+        Once any candidate answered, the ones before it are only waited for
+        ``grace`` more seconds.
+
+        :return: The responding entities, by IP address.
+        """
+        candidates = list(dict.fromkeys(candidates))
+        found: Dict[str, DoIPEntity] = {}
+        unreachable = set()
+
+        def done() -> bool:
+            for ip in candidates:
+                if ip in found:
+                    return True
+                if ip not in unreachable:
+                    return False
+            return True
+
+        with self._socket() as sock:
+            for ip in candidates:
+                try:
+                    sock.sendto(self._request, (ip, self.port))
+                except OSError as e:
+                    logger.debug("Cannot send vehicle identification request to %s: %s", ip, e)
+                    unreachable.add(ip)
+            for entity in self._receive(sock, timeout, done, self.grace):
+                if entity.ip in candidates:
+                    found[entity.ip] = entity
+        return found
+
+    def broadcast(self, address: str = BROADCAST_ADDRESS, window: Optional[float] = None) -> List[DoIPEntity]:
+        """Sends one vehicle identification request to a broadcast address and collects the responses for ``window`` seconds."""
+        with self._socket() as sock:
+            sock.sendto(self._request, (address, self.port))
+            return list(self._receive(sock, window, lambda: False))
+
+    @property
+    def _request(self) -> bytes:
+        message = VehicleIdentificationRequest()
+        return pyDoIPClient._pack_doip(self.protocol_version, payload_message_to_type[type(message)], message.pack())
+
+    def _socket(self) -> socket.socket:
+        return pyDoIPClient._create_udp_socket(udp_port=0)
+
+    def _receive(
+        self, sock: socket.socket, timeout: Optional[float], done, grace: Optional[float] = None
+    ) -> Iterable[DoIPEntity]:
+        """Yields the entity of each response until ``done()`` or the timeout, and caches them.
+
+        With a ``grace`` time, stops at the latest ``grace`` seconds after the first response.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        parser = Parser()
+        rx_buffer = bytearray(DEFAULT_RX_BUFFER_SIZE)
+        received = []
+        try:
+            while not done():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
+                try:
+                    size, addr = sock.recvfrom_into(rx_buffer)
+                except socket.timeout:
+                    break
+                except OSError as e:  # E.g. ICMP port unreachable reported on Windows
+                    logger.debug("Vehicle identification receive error: %s", e)
+                    continue
+                # One DoIP message per datagram
+                parser.reset()
+                message = parser.read_message(memoryview(rx_buffer)[:size])
+                if isinstance(message, VehicleIdentificationResponse):
+                    entity = DoIPEntity.from_response(addr[0], message)
+                    logger.info("Found DoIP entity %s at %s, logical address 0x%04X", entity.vin, entity.ip, entity.logical_address)
+                    with self._lock:
+                        self._entities[entity.ip] = entity
+                    if not received and grace is not None:
+                        deadline = min(deadline, time.monotonic() + grace)
+                    received.append(entity)
+                    yield entity
+        finally:
+            if received:
+                self._save()
+
+    def _load(self) -> None:
+        assert self.cache_path is not None
+        try:
+            with open(self.cache_path) as f:
+                entities = [DoIPEntity.from_json(fields) for fields in json.load(f)]
+        except FileNotFoundError:
+            return
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("Ignoring the DoIP entity cache %s: %s", self.cache_path, e)
+            return
+        with self._lock:
+            self._entities.update((entity.ip, entity) for entity in entities)
+
+    def _save(self) -> None:
+        if self.cache_path is None:
+            return
+        with self._lock:
+            entities = [entity.to_json() for entity in self._entities.values()]
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entities, f)
+        os.replace(tmp_path, self.cache_path)
+
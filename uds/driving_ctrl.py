@@ -0,0 +1,287 @@
+"""Streaming of FoxPi_Driving_Ctrl (DID 0x1001) setpoints at a fixed rate.
+
+``DrivingCtrlEncoder`` checks the 14 values of a :class:`DrivingCtrlCommand`
+and packs them into the 21 bytes of the DID with one precompiled
+``struct.Struct``, into a buffer reused from one command to the next.
+
+``DrivingCtrlWriter`` writes the last setpoint given by the producer at a
+fixed rate, through a :class:`uds.session.SessionManager` keeping the ECU in
+the unlocked extended session. A period starting after the end of the next
+one is a deadline miss: it is counted and skipped rather than written late.
+When the producer gives no setpoint for ``watchdog_timeout``, the writer
+releases the control by writing 0xFF to every byte, as
+``FoxPiWriteDID.Driving_Ctrl_toFF`` does, and writes nothing more until the
+next setpoint.
+"""
+
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Union
+import dataclasses
+import logging
+import math
+import struct
+import threading
+import time
+
+from uds.session import SessionManager
+
+logger = logging.getLogger("DrivingCtrl")
+
+DRIVING_CTRL_DID = 0x1001
+DRIVING_CTRL_SIZE = 21
+RELEASE_FRAME = bytes([0xFF] * DRIVING_CTRL_SIZE)  # Driving_Ctrl_toFF
+MIN_RATE = 20.0
+MAX_RATE = 100.0
+
+# 3-byte fields are packed as a high byte and a 16-bit word
+_LAYOUT = struct.Struct(
+    ">"
+    "BH"  # Acceleration Request, 0.05 m/s2, offset -15
+    "B"  # Acceleration Request A
+    "BH"  # Target Speed Request, 0.125 kph
+    "B"  # Target Speed Request A
+    "B"  # Angle Target Valid
+    "B"  # Angle Target Request
+    "I"  # Angle Target, 0.1 deg, offset -900
+    "B"  # Torque Target Valid
+    "B"  # Torque Target Request
+    "BH"  # Torque Target, 0.01 Nm, offset -10
+    "B"  # APS: VINP_APSShiftPosnReq_enum << 4 | VINP_APSStaSystem_enum << 1 | APS_flg
+    "B"  # VINP_APSSpeedCMD_kph, 0.125 kph
+)
+assert _LAYOUT.size == DRIVING_CTRL_SIZE
+
+
+class DrivingCtrlCommand(NamedTuple):
+    """The 14 values of FoxPi_Driving_Ctrl, in the order of ``FoxPiWriteDID.FoxPi_Driving_Ctrl``."""
+
+    acceleration: float = 0.0  # m/s2
+    acceleration_request: int = 0
+    target_speed: float = 0.0  # kph
+    target_speed_request: int = 0
+    angle_target_valid: int = 0
+    angle_target_request: int = 0
+    angle_target: float = 0.0  # deg
+    torque_target_valid: int = 0
+    torque_target_request: int = 0
+    torque_target: float = 0.0  # Nm
+    aps_flag: int = 0
+    aps_system_state: int = 0
+    aps_shift_position_request: int = 0
+    aps_speed_command: float = 0.0  # kph
+
+
+# (minimum, maximum, name) of each value
+VALUE_LIMITS = (
+    (-15, 10.55, "Acceleration Request"),
+    (0, 1, "Acceleration Request A"),
+    (0, 255.875, "Target Speed Request"),
+    (0, 1, "Target Speed Request A"),
+    (0, 1, "Angle Target Valid"),
+    (0, 1, "Angle Target Request"),
+    (-900, 900, "Angle Target"),
+    (0, 1, "Torque Target Valid"),
+    (0, 1, "Torque Target Request"),
+    (-10, 10, "Torque Target"),
+    (0, 1, "APS_flg"),
+    (0, 4, "VINP_APSStaSystem_enum"),
+    (0, 7, "VINP_APSShiftPosnReq_enum"),
+    (0, 20, "VINP_APSSpeedCMD_kph"),
+)
+_MINIMUMS = tuple(limit[0] for limit in VALUE_LIMITS)
+_MAXIMUMS = tuple(limit[1] for limit in VALUE_LIMITS)
+
+
+class DrivingCtrlEncoder:
+    """Packs DrivingCtrlCommand values into the 21 bytes of FoxPi_Driving_Ctrl.
+
+    The scaling is the one of ``FoxPiWriteDID.FoxPi_Driving_Ctrl``, so both
+    give the same bytes.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray(DRIVING_CTRL_SIZE)
+
+    def check(self, values: Sequence[float]) -> None:
+        """Raises a ValueError if there are not 14 values or if a value is out of its range."""
+        if len(values) != len(VALUE_LIMITS):
+            raise ValueError(
+                "FoxPi_Driving_Ctrl Input must contain exactly %d values but you only provided %d values." % (len(VALUE_LIMITS), len(values))
+            )
+        if all(map(_within, _MINIMUMS, values, _MAXIMUMS)):
+            return
+        for idx, (value, (minimum, maximum, name)) in enumerate(zip(values, VALUE_LIMITS)):
+            if not _within(minimum, value, maximum):
+                raise ValueError(
+                    "FoxPi_Driving_Ctrl %s[%d] must be between %s and %s but you provided <%s>" % (name, idx, minimum, maximum, value)
+                )
+
+    def pack_into(self, buffer: Union[bytearray, memoryview], values: Sequence[float], offset: int = 0) -> None:
+        """Checks the values and packs them into ``buffer`` at ``offset``."""
+        self.check(values)
+        (acceleration, acceleration_request, target_speed, target_speed_request, angle_target_valid, angle_target_request,
+         angle_target, torque_target_valid, torque_target_request, torque_target, aps_flag, aps_system_state,
+         aps_shift_position_request, aps_speed_command) = values
+        acceleration_raw = math.floor((acceleration + 15) / 0.05)
+        target_speed_raw = math.floor(target_speed / 0.125)
+        torque_target_raw = math.floor((torque_target + 10) / 0.01)
+        _LAYOUT.pack_into(
+            buffer, offset,
+            acceleration_raw >> 16, acceleration_raw & 0xFFFF,
+            math.floor(acceleration_request),
+            target_speed_raw >> 16, target_speed_raw & 0xFFFF,
+            math.floor(target_speed_request),
+            math.floor(angle_target_valid),
+            math.floor(angle_target_request),
+            math.floor((angle_target + 900) / 0.1),
+            math.floor(torque_target_valid),
+            math.floor(torque_target_request),
+            torque_target_raw >> 16, torque_target_raw & 0xFFFF,
+            int(aps_shift_position_request) << 4 | int(aps_system_state) << 1 | int(aps_flag),
+            math.floor(aps_speed_command / 0.125),
+        )
+
+    def encode(self, values: Sequence[float]) -> bytearray:
+        """Packs the values into :attr:`buffer` and returns it. The buffer is overwritten by the next call."""
+        self.pack_into(self.buffer, values)
+        return self.buffer
+
+
+def _within(minimum: float, value: float, maximum: float) -> bool:
+    return minimum <= value <= maximum
+
+
+@dataclasses.dataclass
+class DrivingCtrlStats:
+    sent: int = 0  # Setpoints written
+    missed: int = 0  # Periods skipped because the previous write ended too late
+    max_lateness: float = 0.0  # Largest delay between the start of a period and its write, in seconds
+    max_write_seconds: float = 0.0
+    total_write_seconds: float = 0.0
+    watchdog_trips: int = 0  # Stalls of the producer, each releasing the control once
+    errors: int = 0  # Failed writes
+    last_error: Optional[BaseException] = None
+
+    @property
+    def mean_write_seconds(self) -> float:
+        return self.total_write_seconds / self.sent if self.sent else 0.0
+
+
+class DrivingCtrlWriter:
+    """Writes the last FoxPi_Driving_Ctrl setpoint at a fixed rate, from its own thread.
+
+    :param session: The session manager of the client, keeping the ECU in the
+        unlocked extended session. Its keep-alive is not needed while the
+        writer runs, but keeps the session during watchdog stalls.
+    :param rate: Writes per second, between 20 and 100.
+    :param watchdog_timeout: Time without new setpoint before the control is
+        released, in seconds. Defaults to 5 periods.
+    :param release_on_stop: Release the control when the writer stops.
+    :param on_deadline_miss: Called from the writer thread with the number of
+        periods skipped.
+    """
+
+    def __init__(
+        self,
+        session: SessionManager,
+        rate: float = 50.0,
+        watchdog_timeout: Optional[float] = None,
+        release_on_stop: bool = True,
+        on_deadline_miss: Optional[Callable[[int], Any]] = None,
+    ):
+        if not MIN_RATE <= rate <= MAX_RATE:
+            raise ValueError("rate must be between %s and %s Hz" % (MIN_RATE, MAX_RATE))
+        self.session = session
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.watchdog_timeout = watchdog_timeout if watchdog_timeout is not None else 5 * self.period
+        self.release_on_stop = release_on_stop
+        self.on_deadline_miss = on_deadline_miss
+        self.encoder = DrivingCtrlEncoder()
+        self.stats = DrivingCtrlStats()
+        self._setpoint = bytearray(DRIVING_CTRL_SIZE)  # Written by the producer
+        self._frame = bytearray(DRIVING_CTRL_SIZE)  # Sent by the writer thread
+        self._setpoint_time = float("-inf")  # time.monotonic() of the last setpoint, -inf before the first one
+        self._released = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "DrivingCtrlWriter":
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.stop()
+
+    def set(self, values: Sequence[float]) -> None:
+        """Gives the next setpoint, e.g. a DrivingCtrlCommand. Raises a ValueError if a value is out of range."""
+        with self._lock:
+            self.encoder.pack_into(self._setpoint, values)
+            self._setpoint_time = time.monotonic()
+
+    def start(self) -> None:
+        """Establishes the session and starts writing. No setpoint is written before the first ``set``."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.session.ensure()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="DrivingCtrl", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops writing, and releases the control unless ``release_on_stop`` is False."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.release_on_stop and not self._released:
+            self._write(RELEASE_FRAME)
+            self._released = True
+
+    def _write(self, frame: Union[bytes, bytearray]) -> bool:
+        start = time.monotonic()
+        try:
+            self.session.request(self.session.client.write_data_by_identifier, DRIVING_CTRL_DID, frame)
+        except Exception as e:
+            self.stats.errors += 1
+            self.stats.last_error = e
+            logger.error("Writing FoxPi_Driving_Ctrl failed: %s", e)
+            return False
+        seconds = time.monotonic() - start
+        self.stats.sent += 1
+        self.stats.total_write_seconds += seconds
+        self.stats.max_write_seconds = max(self.stats.max_write_seconds, seconds)
+        return True
+
+    def _run(self) -> None:
+        period = self.period
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now < deadline:
+                if self._stop.wait(deadline - now):
+                    break
+                now = time.monotonic()
+
+            lateness = now - deadline
+            if lateness >= period:
+                missed = int(lateness / period)
+                self.stats.missed += missed
+                deadline += missed * period
+                lateness -= missed * period
+                if self.on_deadline_miss is not None:
+                    self.on_deadline_miss(missed)
+            self.stats.max_lateness = max(self.stats.max_lateness, lateness)
+            deadline += period
+
+            with self._lock:
+                setpoint_age = now - self._setpoint_time
+                if setpoint_age <= self.watchdog_timeout:
+                    self._frame[:] = self._setpoint
+            if setpoint_age <= self.watchdog_timeout:
+                self._released = False
+                self._write(self._frame)
+            elif not self._released:
+                self.stats.watchdog_trips += 1
+                logger.warning("No FoxPi_Driving_Ctrl setpoint for %.3f s, releasing the control", setpoint_age)
+                self._released = self._write(RELEASE_FRAME)
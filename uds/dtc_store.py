@@ -0,0 +1,198 @@
+"""Local copy of the DTCs of several ECUs, kept up to date with few requests.
+
+``DtcStore.refresh`` first reads the number of DTCs matching a few status
+masks (reportNumberOfDTCByStatusMask). When every number is unchanged since
+the last refresh, nothing else is read. Otherwise the DTC list is read, and
+snapshots and extended data are only read for the DTCs that are new or whose
+status changed. Each difference is reported as a :class:`DtcEvent`.
+"""
+
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import dataclasses
+import logging
+import time
+
+from udsoncan.client import Client
+from udsoncan.common.dtc import Dtc
+from udsoncan.exceptions import NegativeResponseException
+
+logger = logging.getLogger("DtcStore")
+
+STATUS_MASK_ALL = 0xFF
+STATUS_TEST_FAILED = 0x01
+STATUS_CONFIRMED = 0x08
+
+
+class DtcEventType(Enum):
+    Added = "added"  # The DTC was not reported by the last refresh
+    Cleared = "cleared"  # The DTC is not reported anymore
+    StatusChanged = "status changed"
+
+
+@dataclasses.dataclass
+class DtcEvent:
+    type: DtcEventType
+    ecu: int  # Logical address of the ECU
+    dtc_id: int
+    status: Optional[int]  # Status byte, None for a cleared DTC
+    previous_status: Optional[int]  # Status byte at the last refresh, None for an added DTC
+    dtc: Optional[Dtc]  # The stored DTC, with its snapshots and extended data. None for a cleared DTC
+
+
+@dataclasses.dataclass
+class DtcRefresh:
+    """Outcome of the refresh of one ECU."""
+
+    ecu: int
+    events: List[DtcEvent]
+    requests: int  # Requests sent
+    changed: bool  # False when the DTC counts were unchanged and the DTC list was not read
+    seconds: float
+
+
+class DtcStore:
+    """DTCs of several ECUs, keyed by (ECU address, DTC id).
+
+    :param status_mask: Status mask of the DTCs to keep.
+    :param count_masks: Status masks of the DTC counts compared at each
+        refresh. A change leaving every count unchanged, e.g. a DTC cleared while
+        another one is set, is only seen by the next forced refresh. Defaults to
+        ``status_mask``, testFailed and confirmedDTC.
+    :param read_snapshots: Read the snapshots of new and changed DTCs.
+    :param read_extended_data: Read the extended data of new and changed DTCs,
+        when their size is given by ``extended_data_size`` or by the client
+        configuration.
+    :param extended_data_size: Size of an extended data record, see
+        ``Client.get_dtc_extended_data_by_dtc_number``.
+    :param on_event: Called with each event, in order.
+    """
+
+    def __init__(
+        self,
+        status_mask: int = STATUS_MASK_ALL,
+        count_masks: Optional[Iterable[int]] = None,
+        read_snapshots: bool = True,
+        read_extended_data: bool = True,
+        extended_data_size: Optional[Union[int, Dict[int, int]]] = None,
+        on_event: Optional[Callable[[DtcEvent], None]] = None,
+    ):
+        self.status_mask = status_mask
+        self.count_masks: Tuple[int, ...] = tuple(
+            dict.fromkeys(count_masks if count_masks is not None else (status_mask, STATUS_TEST_FAILED, STATUS_CONFIRMED))
+        )
+        self.read_snapshots = read_snapshots
+        self.read_extended_data = read_extended_data
+        self.extended_data_size = extended_data_size
+        self.on_event = on_event
+        self._dtcs: Dict[Tuple[int, int], Dtc] = {}
+        self._counts: Dict[int, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._dtcs)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._dtcs
+
+    def get(self, ecu: int, dtc_id: int) -> Optional[Dtc]:
+        return self._dtcs.get((ecu, dtc_id))
+
+    def dtcs(self, ecu: Optional[int] = None) -> List[Dtc]:
+        """The stored DTCs of one ECU, or of every ECU."""
+        return [dtc for (dtc_ecu, _), dtc in self._dtcs.items() if ecu is None or dtc_ecu == ecu]
+
+    def ecus(self) -> List[int]:
+        return list(self._counts)
+
+    def forget(self, ecu: int) -> None:
+        """Removes the DTCs of an ECU without events, so that the next refresh reads them all."""
+        for key in [key for key in self._dtcs if key[0] == ecu]:
+            del self._dtcs[key]
+        self._counts.pop(ecu, None)
+
+    def refresh(self, client: Client, ecu: int, force: bool = False) -> DtcRefresh:
+        """Brings the DTCs of one ECU up to date.
+
+        :param client: The client of the ECU.
+        :param ecu: The logical address of the ECU, used as key.
+        :param force: Read the DTC list even if the DTC counts are unchanged.
+        """
+        start = time.perf_counter()
+        requests = 0
+
+        counts = []
+        for mask in self.count_masks:
+            counts.append(client.get_number_of_dtc_by_status_mask(mask).service_data.dtc_count)
+            requests += 1
+        counts = tuple(counts)
+        if not force and self._counts.get(ecu) == counts:
+            return DtcRefresh(ecu, [], requests, False, time.perf_counter() - start)
+
+        response = client.get_dtc_by_status_mask(self.status_mask)
+        requests += 1
+        statuses = {dtc.id: dtc.status.get_byte_as_int() for dtc in response.service_data.dtcs}
+
+        # Every read is done before the store is changed, so that a failed refresh
+        # leaves it as it was and the next refresh reports the same events
+        events = []
+        for key in [key for key in self._dtcs if key[0] == ecu and key[1] not in statuses]:
+            dtc = self._dtcs[key]
+            events.append(DtcEvent(DtcEventType.Cleared, ecu, key[1], None, dtc.status.get_byte_as_int(), None))
+
+        for dtc_id, status in statuses.items():
+            stored = self._dtcs.get((ecu, dtc_id))
+            previous_status = stored.status.get_byte_as_int() if stored is not None else None
+            if previous_status == status:
+                continue
+            dtc = Dtc(dtc_id)
+            dtc.status.set_byte(status)
+            requests += self._read_details(client, dtc)
+            event_type = DtcEventType.Added if stored is None else DtcEventType.StatusChanged
+            events.append(DtcEvent(event_type, ecu, dtc_id, status, previous_status, dtc))
+
+        for event in events:
+            if event.dtc is None:
+                del self._dtcs[(ecu, event.dtc_id)]
+            else:
+                self._dtcs[(ecu, event.dtc_id)] = event.dtc
+        # The counts are read before the list: a change in between is seen by the next refresh
+        self._counts[ecu] = counts
+        if self.on_event is not None:
+            for event in events:
+                self.on_event(event)
+        return DtcRefresh(ecu, events, requests, True, time.perf_counter() - start)
+
+    def refresh_all(self, clients: Dict[int, Client], force: bool = False) -> List[DtcRefresh]:
+        """Refreshes several ECUs, one after the other. ``clients`` maps ECU addresses to their client."""
+        return [self.refresh(client, ecu, force) for ecu, client in clients.items()]
+
+    def _read_details(self, client: Client, dtc: Dtc) -> int:
+        """Reads the snapshots and extended data of a DTC. Returns the number of requests sent."""
+        requests = 0
+        if self.read_snapshots:
+            requests += 1
+            try:
+                response = client.get_dtc_snapshot_by_dtc_number(dtc.id)
+                if response.service_data.dtcs:
+                    dtc.snapshots = response.service_data.dtcs[0].snapshots
+            except NegativeResponseException as e:
+                logger.debug("No snapshot for DTC 0x%06X: %s", dtc.id, e)
+        extended_data_size = self.extended_data_size
+        if extended_data_size is None:
+            extended_data_size = client.config.get("extended_data_size")
+        data_size = _size_of(extended_data_size, dtc.id)
+        if self.read_extended_data and data_size is not None:
+            requests += 1
+            try:
+                response = client.get_dtc_extended_data_by_dtc_number(dtc.id, data_size=data_size)
+                if response.service_data.dtcs:
+                    dtc.extended_data = response.service_data.dtcs[0].extended_data
+            except NegativeResponseException as e:
+                logger.debug("No extended data for DTC 0x%06X: %s", dtc.id, e)
+        return requests
+
+
+def _size_of(extended_data_size: Optional[Union[int, Dict[int, int]]], dtc_id: int) -> Optional[int]:
+    if isinstance(extended_data_size, dict):
+        return extended_data_size.get(dtc_id)
+    return extended_data_size
@@ -475,10 +475,18 @@ class Sliceu8(ctypes.Structure):
     def bytearray(self):
         """Returns a bytearray with the content of this slice."""
         rval = bytearray(len(self))
-        for i in range(len(self)):
-            rval[i] = self[i]
+        self.copy_into(rval)
         return rval
 
+    def copy_into(self, buffer, offset: int = 0) -> int:
+        """Copies the content of this slice into a writable buffer (e.g. a bytearray) starting at
+        `offset`, with a single memmove. Returns the number of bytes copied."""
+        size = len(self)
+        if size:
+            target = (ctypes.c_uint8 * size).from_buffer(buffer, offset)
+            ctypes.memmove(target, self.data, size)
+        return size
+
 
 class SliceFFIDidListEntry(ctypes.Structure):
     # These fields represent the underlying C data layout
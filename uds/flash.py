@@ -0,0 +1,251 @@
+"""Flashing of several ECUs behind one DoIP entity at the same time.
+
+Each ECU is flashed by its own worker thread with its own
+``udsoncan.client.Client``, through the steps of :class:`FlashStep`:
+diagnostic session change, security access unlock, erase routine, download
+(see :mod:`uds.transfer`) and verify routine. While one ECU erases its
+memory, the others are already downloading.
+
+The connection of each ECU comes from a factory called with its logical
+address, e.g. ``MultiplexedDoIPClient.connection`` to share one DoIP
+connection (see :mod:`uds.multiplex`), or :func:`doip_connections` to open
+one DoIP connection per ECU.
+"""
+
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional
+import concurrent.futures
+import dataclasses
+import logging
+import threading
+import time
+
+from uds.client import ActivationType, DoIPClient, decrypt_seed_with_model
+from uds.connection import DoIPConnection
+from uds.transfer import Source, download
+from udsoncan.client import Client
+from udsoncan.common.DataFormatIdentifier import DataFormatIdentifier
+from udsoncan.common.MemoryLocation import MemoryLocation
+from udsoncan.connections import BaseConnection
+from udsoncan.exceptions import TimeoutException
+
+logger = logging.getLogger("Flash")
+
+PROGRAMMING_SESSION = 0x02
+ERASE_MEMORY_ROUTINE = 0xFF00
+CHECK_MEMORY_ROUTINE = 0x0202
+
+
+class FlashStep(Enum):
+    Waiting = "waiting"
+    Session = "session"
+    Unlock = "unlock"
+    Erase = "erase"
+    Download = "download"
+    Verify = "verify"
+    Done = "done"
+    Failed = "failed"
+
+
+@dataclasses.dataclass
+class FlashJob:
+    """What to flash on one ECU, and how."""
+
+    target: int  # Logical address of the ECU
+    memory_location: MemoryLocation
+    source: Source  # A file path, or the bytes to download
+    dfi: Optional[DataFormatIdentifier] = None
+    session: int = PROGRAMMING_SESSION
+    security_level: Optional[int] = 0x01  # None to skip the security access
+    model: Optional[int] = None  # Car model of the seed decryption, instead of the security_algo of the client configuration
+    erase_routine: Optional[int] = ERASE_MEMORY_ROUTINE  # None to skip the erase
+    erase_data: Optional[bytes] = None  # Defaults to the address and size of the memory location
+    verify_routine: Optional[int] = CHECK_MEMORY_ROUTINE  # None to skip the verify
+    verify_data: Optional[bytes] = None
+    state_path: Optional[str] = None  # Resume file of the download, see uds.transfer.download
+
+
+@dataclasses.dataclass
+class FlashProgress:
+    target: int
+    step: FlashStep = FlashStep.Waiting
+    size: int = 0  # Bytes to download
+    transferred: int = 0  # Bytes acknowledged by the ECU
+    started: float = float("nan")  # time.monotonic() of the first step
+    finished: float = float("nan")  # time.monotonic() of the end of the last step
+    bytes_per_second: float = 0.0  # Download throughput
+    error: Optional[BaseException] = None
+    failed_step: Optional[FlashStep] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.step == FlashStep.Done
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+def erase_memory_data(memory_location: MemoryLocation) -> bytes:
+    """Option record of the erase memory routine: addressAndLengthFormatIdentifier, address and size."""
+    return memory_location.alfid.get_byte() + memory_location.get_address_bytes() + memory_location.get_memorysize_bytes()
+
+
+def doip_connections(
+    ecu_ip_address: str,
+    source_logical_address: int = 0x0E00,
+    activation_type: ActivationType = ActivationType.Default,
+) -> Callable[[int], BaseConnection]:
+    """Returns a connection factory opening one DoIP connection per ECU, closed with its udsoncan connection."""
+
+    def connect(target: int) -> BaseConnection:
+        doip_client = DoIPClient(ecu_ip_address, target, source_logical_address, activation_type=activation_type)
+        return DoIPConnection(doip_client, name="FoxtronPi %s" % hex(target), close_client=True)
+
+    return connect
+
+
+class FlashOrchestrator:
+    """Flashes several ECUs at the same time, one worker thread per ECU.
+
+    :param connection_factory: Returns the udsoncan connection of an ECU logical address.
+    :param config: The udsoncan client configuration, e.g. ``uds.client_config.client_config()``.
+        Each ECU gets its own copy.
+    :param budget: Total time allowed to flash every ECU, in seconds, or None.
+        Once spent, the ECUs still flashing stop before their next step or
+        block, and fail with a TimeoutException.
+    :param max_workers: Maximum number of ECUs flashed at the same time. Defaults to all of them.
+    :param on_progress: Called with the FlashProgress of an ECU when it changes
+        step and after each downloaded block, from its worker thread.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[int], BaseConnection],
+        config: Dict[str, Any],
+        budget: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[FlashProgress], None]] = None,
+    ):
+        self.connection_factory = connection_factory
+        self.config = config
+        self.budget = budget
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.progress: Dict[int, FlashProgress] = {}
+        self._deadline = float("inf")
+        self._cancel = threading.Event()
+
+    def run(self, jobs: Iterable[FlashJob]) -> Dict[int, FlashProgress]:
+        """Flashes the ECUs of the jobs and waits for the end of every job.
+
+        :return: The progress of each ECU, by logical address. A failed ECU does
+            not stop the others; its step is FlashStep.Failed.
+        """
+        jobs = list(jobs)
+        if len({job.target for job in jobs}) != len(jobs):
+            raise ValueError("Each ECU can only be flashed by one job")
+        self.progress = {job.target: FlashProgress(job.target) for job in jobs}
+        self._cancel.clear()
+        start = time.monotonic()
+        self._deadline = start + self.budget if self.budget is not None else float("inf")
+        if not jobs:
+            return self.progress
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers or len(jobs), thread_name_prefix="Flash") as executor:
+            futures = [executor.submit(self._flash, job) for job in jobs]
+            for future in futures:
+                timeout = self._deadline - time.monotonic()
+                try:
+                    future.result(timeout=max(timeout, 0) if self.budget is not None else None)
+                except concurrent.futures.TimeoutError:
+                    self._cancel.set()
+            # Jobs in flight stop at their next check, after their current request
+
+        failed = [p for p in self.progress.values() if not p.ok]
+        logger.info("Flashed %d of %d ECUs in %.3f s", len(jobs) - len(failed), len(jobs), time.monotonic() - start)
+        return self.progress
+
+    def cancel(self) -> None:
+        """Stops every ECU before its next step or block."""
+        self._cancel.set()
+
+    def _check_budget(self) -> None:
+        if time.monotonic() > self._deadline:
+            self._cancel.set()
+            raise TimeoutException("Flashing budget of %s s exceeded" % self.budget)
+        if self._cancel.is_set():
+            raise TimeoutException("Flashing cancelled")
+
+    def _set_step(self, progress: FlashProgress, step: FlashStep) -> None:
+        if step not in (FlashStep.Done, FlashStep.Failed):
+            self._check_budget()
+        progress.step = step
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+    def _flash(self, job: FlashJob) -> None:
+        progress = self.progress[job.target]
+        progress.started = time.monotonic()
+        try:
+            self._set_step(progress, FlashStep.Session)
+            config = dict(self.config)
+            if job.model is not None:
+                config["security_algo"] = decrypt_seed_with_model(job.model)
+            with Client(self.connection_factory(job.target), config=config) as client:
+                self._run_steps(client, job, progress)
+            progress.finished = time.monotonic()
+            self._set_step(progress, FlashStep.Done)
+        except Exception as e:
+            progress.finished = time.monotonic()
+            progress.error = e
+            progress.failed_step = progress.step
+            logger.error("Flashing %s failed at step %s: %s", hex(job.target), progress.step.value, e)
+            self._set_step(progress, FlashStep.Failed)
+
+    def _run_steps(self, client: Client, job: FlashJob, progress: FlashProgress) -> None:
+        client.change_session(job.session)
+
+        if job.security_level is not None:
+            self._set_step(progress, FlashStep.Unlock)
+            client.unlock_security_access(job.security_level)
+
+        if job.erase_routine is not None:
+            self._set_step(progress, FlashStep.Erase)
+            data = job.erase_data if job.erase_data is not None else erase_memory_data(job.memory_location)
+            client.start_routine(job.erase_routine, data)
+
+        self._set_step(progress, FlashStep.Download)
+
+        def on_block(transferred: int, size: int) -> None:
+            progress.transferred = transferred
+            progress.size = size
+            if self.on_progress is not None:
+                self.on_progress(progress)
+            self._check_budget()
+
+        result = download(client, job.memory_location, job.source, job.dfi, state_path=job.state_path, progress=on_block)
+        progress.size = result.size
+        progress.transferred = result.size
+        progress.bytes_per_second = result.bytes_per_second
+
+        if job.verify_routine is not None:
+            self._set_step(progress, FlashStep.Verify)
+            client.start_routine(job.verify_routine, job.verify_data)
+
+
+def format_progress(progress: Dict[int, FlashProgress]) -> str:
+    """Formats the progress of each ECU as a text table."""
+    lines = ["Target  step      bytes          %   seconds   bytes/s  error"]
+    for p in progress.values():
+        percent = 100.0 * p.transferred / p.size if p.size else 0.0
+        lines.append("%6s  %-8s %10d %6.1f %9.3f %9.0f  %s" % (
+            "%04X" % p.target,
+            p.step.value,
+            p.transferred,
+            percent,
+            p.seconds if p.seconds == p.seconds else 0.0,  # NaN while flashing
+            p.bytes_per_second,
+            "" if p.error is None else "%s at %s: %s" % (type(p.error).__name__, p.failed_step.value, p.error),
+        ))
+    return "\n".join(lines)
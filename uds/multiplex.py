@@ -0,0 +1,270 @@
+"""Concurrent UDS requests to several ECUs over one DoIP connection.
+
+``DoIPClient`` has a single target address and only returns responses coming
+from it, so talking to several ECUs behind the gateway is fully serialized.
+``MultiplexedDoIPClient`` owns the ``DoIPClient`` and does all FFI calls from
+one I/O thread: requests are sent to their target as soon as they are
+submitted, and responses are collected from every source and routed back by
+the source address of their DoIP header.
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, Optional, Union
+import logging
+import queue
+import threading
+import time
+
+from uds.client import DoIPClient
+from udsoncan.Request import Request
+from udsoncan.Response import Response
+from udsoncan.connections import BaseConnection
+from udsoncan.exceptions import TimeoutException
+
+# [version | inverse of version | payload type | payload length | source address | target address | user data]
+DOIP_SOURCE_ADDRESS_OFFSET = 8
+DOIP_USER_DATA_OFFSET = 12
+
+
+class _PendingRequest:
+    def __init__(self, target: int, payload: bytes, future: Optional["Future[Response]"]):
+        self.target = target
+        self.payload = payload
+        self.future = future  # None for frames sent by a MultiplexedConnection
+        self.deadline = 0.0
+
+
+class MultiplexedDoIPClient:
+    """Multiplexes requests to several target logical addresses over one DoIP connection.
+
+    One request per target address is in flight at a time, as UDS requires;
+    requests to different targets are in flight together. Each request gets
+    its own future.
+
+    Once started, the multiplexer is the only user of the ``DoIPClient``: do
+    not call it, or change its target address, from other threads.
+
+    :param doip_client: An open DoIPClient.
+    :param p2_timeout: Time allowed for a server to respond, in seconds.
+    :param p2_star_timeout: Time allowed for a server to respond after a
+        responsePending (0x78) negative response, in seconds.
+    :param rx_window: Duration of each receive call of the I/O thread, in
+        seconds. It bounds the delay before a submitted request is sent.
+    """
+
+    def __init__(
+        self,
+        doip_client: DoIPClient,
+        p2_timeout: float = 1.0,
+        p2_star_timeout: float = 5.0,
+        rx_window: float = 0.005,
+    ):
+        self.doip_client = doip_client
+        self.p2_timeout = p2_timeout
+        self.p2_star_timeout = p2_star_timeout
+        self.rx_window = rx_window
+        self.logger = logging.getLogger("MultiplexedDoIPClient")
+
+        self._outbox: "queue.SimpleQueue[_PendingRequest]" = queue.SimpleQueue()
+        self._in_flight: Dict[int, _PendingRequest] = {}
+        self._waiting: Dict[int, Deque[_PendingRequest]] = {}
+        self._connections: Dict[int, "MultiplexedConnection"] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MultiplexedDoIPClient":
+        """Start the I/O thread."""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("MultiplexedDoIPClient is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MultiplexedDoIPClient", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the I/O thread. Requests not answered yet fail with a RuntimeError."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._fail_all(RuntimeError("MultiplexedDoIPClient was stopped"))
+
+    def __enter__(self) -> "MultiplexedDoIPClient":
+        return self.start()
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.stop()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, target: int, request: Union[bytes, Request]) -> "Future[Response]":
+        """Send a request to a target logical address without waiting for the response.
+
+        :param target: The logical address of the ECU.
+        :param request: The request, or its UDS payload.
+
+        :return: A future resolved with the final response of the ECU, positive or
+            negative. It fails with a TimeoutException if the ECU does not respond in time.
+        :rtype: Future[Response]
+        """
+        if not self.is_running():
+            raise RuntimeError("MultiplexedDoIPClient is not running")
+        payload = request.get_payload() if isinstance(request, Request) else bytes(request)
+        future: "Future[Response]" = Future()
+        self._outbox.put(_PendingRequest(target, payload, future))
+        return future
+
+    def request(self, target: int, request: Union[bytes, Request], timeout: Optional[float] = None) -> Response:
+        """Send a request to a target logical address and wait for its response.
+
+        :param timeout: Overall time to wait for the response, on top of the P2 timeouts.
+        """
+        return self.submit(target, request).result(timeout)
+
+    def connection(self, target: int, name: Optional[str] = None) -> "MultiplexedConnection":
+        """Returns a udsoncan connection to one target, so that a ``udsoncan.client.Client``
+        per ECU can run in its own thread over the shared DoIP connection.
+
+        Do not ``submit`` requests to a target while a udsoncan Client uses its connection.
+        Closing the connection releases the target, and opening it again takes it back.
+        """
+        conn = MultiplexedConnection(self, target, name)
+        self._register(conn)
+        return conn
+
+    def _register(self, conn: "MultiplexedConnection") -> None:
+        if self._connections.setdefault(conn.target, conn) is not conn:
+            raise ValueError(f"A connection to target {hex(conn.target)} already exists")
+
+    def _unregister(self, conn: "MultiplexedConnection") -> None:
+        if self._connections.get(conn.target) is conn:
+            del self._connections[conn.target]
+
+    def _send_frame(self, target: int, payload: bytes) -> None:
+        self._outbox.put(_PendingRequest(target, payload, None))
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self._flush_outbox()
+                for msg in self.doip_client.receive_multiple_diagnostic_responses(self.rx_window):
+                    self._dispatch(msg)
+                self._expire(time.monotonic())
+        except Exception as e:
+            self.logger.error("I/O thread failed: [%s] %s", e.__class__.__name__, e)
+            self._fail_all(e)
+
+    def _flush_outbox(self) -> None:
+        while True:
+            try:
+                pending = self._outbox.get_nowait()
+            except queue.Empty:
+                return
+            if pending.future is None:
+                self._send(pending)
+            elif pending.target in self._in_flight:
+                self._waiting.setdefault(pending.target, deque()).append(pending)
+            elif pending.future.set_running_or_notify_cancel():
+                self._send(pending)
+
+    def _send(self, pending: _PendingRequest) -> None:
+        try:
+            self.doip_client.set_target_address(pending.target)
+            self.doip_client.send_diagnostic(pending.payload, self.p2_timeout)
+        except Exception as e:
+            if pending.future is None:
+                raise
+            pending.future.set_exception(e)
+            self._send_next(pending.target)
+            return
+        if pending.future is not None:
+            pending.deadline = time.monotonic() + self.p2_timeout
+            self._in_flight[pending.target] = pending
+
+    def _send_next(self, target: int) -> None:
+        waiting = self._waiting.get(target)
+        while waiting:
+            pending = waiting.popleft()
+            if pending.future.set_running_or_notify_cancel():
+                self._send(pending)
+                return
+
+    def _dispatch(self, msg: bytes) -> None:
+        source = int.from_bytes(msg[DOIP_SOURCE_ADDRESS_OFFSET:DOIP_USER_DATA_OFFSET - 2], "big")
+        data = msg[DOIP_USER_DATA_OFFSET:]
+        pending = self._in_flight.get(source)
+        if pending is not None:
+            response = Response.from_payload(data)
+            if not response.positive and response.code == Response.Code.RequestCorrectlyReceived_ResponsePending:
+                pending.deadline = time.monotonic() + self.p2_star_timeout
+                return
+            del self._in_flight[source]
+            pending.future.set_result(response)
+            self._send_next(source)
+            return
+        conn = self._connections.get(source)  # Read once, a connection may close meanwhile
+        if conn is not None:
+            conn.rxqueue.put(data)
+        else:
+            self.logger.debug("Dropping %d bytes from %s with no pending request", len(data), hex(source))
+
+    def _expire(self, now: float) -> None:
+        for target, pending in list(self._in_flight.items()):
+            if now > pending.deadline:
+                del self._in_flight[target]
+                pending.future.set_exception(
+                    TimeoutException("Did not receive response from %s in time" % hex(target))
+                )
+                self._send_next(target)
+
+    def _fail_all(self, error: Exception) -> None:
+        for pending in list(self._in_flight.values()):
+            if not pending.future.done():
+                pending.future.set_exception(error)
+        self._in_flight.clear()
+        for waiting in self._waiting.values():
+            for pending in waiting:
+                if pending.future.set_running_or_notify_cancel():
+                    pending.future.set_exception(error)
+        self._waiting.clear()
+        while True:
+            try:
+                pending = self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            if pending.future is not None and pending.future.set_running_or_notify_cancel():
+                pending.future.set_exception(error)
+
+
+class MultiplexedConnection(BaseConnection):
+    """udsoncan connection to one target logical address of a ``MultiplexedDoIPClient``."""
+
+    def __init__(self, mux: MultiplexedDoIPClient, target: int, name: Optional[str] = None):
+        BaseConnection.__init__(self, name if name is not None else "FoxtronPi %s" % hex(target))
+        self.mux = mux
+        self.target = target
+        self.rxqueue: "queue.Queue[bytes]" = queue.Queue()
+
+    def specific_send(self, payload):
+        self.mux._send_frame(self.target, payload)
+
+    def specific_wait_frame(self, timeout=2):
+        try:
+            return self.rxqueue.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutException("Did not receive frame from %s in time (timeout=%s sec)" % (hex(self.target), timeout))
+
+    def open(self):
+        self.mux._register(self)
+
+    def close(self):
+        self.mux._unregister(self)
+
+    def empty_rxqueue(self):
+        while not self.rxqueue.empty():
+            self.rxqueue.get()
+
+    def is_open(self) -> bool:
+        return self.mux.is_running()
@@ -0,0 +1,304 @@
+"""Raw CAN frames recorded by routine 0xDFFE.
+
+The routine status record of routine 0xDFFE is ASCII text holding one JSON
+object per CAN frame, e.g.::
+
+    {"Timestamp": "1700000000.010", "Channel": 5, "CAN_ID": "0x00000777", "DLC": 8, "CAN_Data": "0xEF00000000000000"}
+
+``RawCanDecoder`` extracts the frames as the text arrives, chunk by chunk.
+``RawCanStore`` keeps decoded frames in a column store on disk, one file
+per field, that runs can append to.
+"""
+
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import dataclasses
+import json
+import logging
+import math
+import os
+import sys
+
+TIMESTAMP_KEY = "Timestamp"
+CHANNEL_KEY = "Channel"
+CAN_ID_KEY = "CAN_ID"
+DLC_KEY = "DLC"
+CAN_DATA_KEY = "CAN_Data"
+
+logger = logging.getLogger("RawCan")
+_json_decoder = json.JSONDecoder()
+
+
+@dataclasses.dataclass
+class RawCanData:
+    timestamp: str
+    channel: int
+    can_id: int
+    dlc: int
+    data: str
+
+
+def _parse_int(value: Union[int, str]) -> int:
+    return value if isinstance(value, int) else int(value, 0)
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Returns a frame timestamp in seconds: a number of seconds, or an ISO 8601 date. NaN if it is neither."""
+    try:
+        return float(timestamp)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        return math.nan
+
+
+def data_bytes(data: str) -> bytes:
+    """Returns the bytes of a CAN_Data hexadecimal string, e.g. "0xEF00000000000000"."""
+    if data[:2] in ("0x", "0X"):
+        data = data[2:]
+    return bytes.fromhex(data)
+
+
+class RawCanDecoder:
+    """Incremental decoder of the routine 0xDFFE raw CAN text.
+
+    Text is given with ``feed`` as it is received. Frames are yielded as soon as
+    their JSON object is complete; the end of an incomplete object is waited for
+    in the next chunk.
+
+    :param can_ids: Optional CAN IDs to keep. The frames of other CAN IDs are
+        skipped after reading their CAN_ID value, without parsing the object.
+    """
+
+    def __init__(self, can_ids: Optional[Iterable[int]] = None):
+        self.can_ids = frozenset(can_ids) if can_ids is not None else None
+        self.frame_count = 0  # Frames yielded
+        self.skipped_count = 0  # Frames of other CAN IDs
+        self.error_count = 0  # Objects that are not valid frames
+        self._pending = ""
+        self._can_id_key = '"' + CAN_ID_KEY + '"'
+
+    def feed(self, chunk: Union[bytes, bytearray, memoryview, str]) -> Iterator[RawCanData]:
+        """Decodes a chunk of the routine status record and yields its complete frames."""
+        if not isinstance(chunk, str):
+            chunk = str(chunk, "ascii")
+        buffer = self._pending + chunk if self._pending else chunk
+        pos = 0
+        while True:
+            start = buffer.find("{", pos)
+            if start < 0:
+                pos = len(buffer)
+                break
+            end = buffer.find("}", start)
+            if end < 0:
+                pos = start
+                break
+            pos = end + 1
+            frame = self._decode(buffer, start, pos)
+            if frame is not None:
+                yield frame
+        self._pending = buffer[pos:]
+
+    def flush(self) -> None:
+        """Drops an incomplete object left at the end of the text."""
+        if self._pending.strip():
+            self.error_count += 1
+        self._pending = ""
+
+    def _decode(self, buffer: str, start: int, end: int) -> Optional[RawCanData]:
+        if self.can_ids is not None:
+            can_id = self._peek_can_id(buffer, start, end)
+            if can_id is not None and can_id not in self.can_ids:
+                self.skipped_count += 1
+                return None
+        try:
+            # The objects are flat: the object ends at the first closing brace
+            obj, obj_end = _json_decoder.raw_decode(buffer, start)
+            if obj_end != end:
+                raise ValueError("Unexpected closing brace")
+            frame = RawCanData(
+                timestamp=str(obj[TIMESTAMP_KEY]),
+                channel=_parse_int(obj[CHANNEL_KEY]),
+                can_id=_parse_int(obj[CAN_ID_KEY]),
+                dlc=_parse_int(obj[DLC_KEY]),
+                data=obj[CAN_DATA_KEY],
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            self.error_count += 1
+            logger.debug("Invalid raw CAN object %s: %s", buffer[start:end], e)
+            return None
+        if self.can_ids is not None and frame.can_id not in self.can_ids:
+            self.skipped_count += 1
+            return None
+        self.frame_count += 1
+        return frame
+
+    def _peek_can_id(self, buffer: str, start: int, end: int) -> Optional[int]:
+        """Reads the CAN_ID value of an object, or returns None to let json parse it."""
+        key = buffer.find(self._can_id_key, start, end)
+        if key < 0:
+            return None
+        colon = buffer.find(":", key + len(self._can_id_key), end)
+        if colon < 0:
+            return None
+        value_end = buffer.find(",", colon, end)
+        if value_end < 0:
+            value_end = end - 1
+        try:
+            return int(buffer[colon + 1:value_end].strip().strip('"'), 0)
+        except ValueError:
+            return None
+
+
+def decode_raw_can_data(
+    routine_status_record: Union[bytes, str], can_ids: Optional[Iterable[int]] = None
+) -> Iterator[RawCanData]:
+    """Yields the frames of a complete routine 0xDFFE status record."""
+    decoder = RawCanDecoder(can_ids)
+    yield from decoder.feed(routine_status_record)
+    decoder.flush()
+
+
+class RawCanStore:
+    """Column store of raw CAN frames, appended to by successive runs.
+
+    The store is a directory with one file per column, in little-endian byte order:
+
+        - ``timestamp.f8``: timestamps in seconds (double), NaN if not parsable
+        - ``channel.u1``: channels (uint8)
+        - ``can_id.u4``: CAN IDs (uint32)
+        - ``dlc.u1``: DLCs (uint8)
+        - ``data.bin``: the data of each frame, padded with zeros to ``DATA_SIZE`` bytes
+
+    Row ``i`` of each column describes the same frame. Frames are buffered and
+    written by ``flush``, or when ``buffer_size`` frames are buffered.
+
+    :param path: The store directory, created if it does not exist.
+    :param truncate: Removes the frames stored by previous runs instead of appending to them.
+    """
+
+    DATA_SIZE = 8
+    COLUMNS = {"timestamp": "d", "channel": "B", "can_id": "I", "dlc": "B"}
+    FILES = {"timestamp": "timestamp.f8", "channel": "channel.u1", "can_id": "can_id.u4", "dlc": "dlc.u1", "data": "data.bin"}
+
+    def __init__(self, path: str, buffer_size: int = 65536, truncate: bool = False):
+        self.path = path
+        self.buffer_size = buffer_size
+        os.makedirs(path, exist_ok=True)
+        if truncate:
+            for column in self.FILES:
+                if os.path.exists(self.file(column)):
+                    os.remove(self.file(column))
+        self._columns: Dict[str, array] = {name: array(typecode) for name, typecode in self.COLUMNS.items()}
+        self._data = bytearray()
+
+    def file(self, column: str) -> str:
+        return os.path.join(self.path, self.FILES[column])
+
+    def append(self, frame: RawCanData) -> None:
+        self.extend([frame])
+
+    def extend(self, frames: Iterable[RawCanData]) -> int:
+        """Appends frames, e.g. as they are yielded by a RawCanDecoder.
+
+        :return: The number of frames appended.
+        """
+        count = 0
+        timestamps = self._columns["timestamp"]
+        channels = self._columns["channel"]
+        can_ids = self._columns["can_id"]
+        dlcs = self._columns["dlc"]
+        flush_size = self.buffer_size * self.DATA_SIZE
+        for frame in frames:
+            data = data_bytes(frame.data)
+            if len(data) > self.DATA_SIZE:
+                raise ValueError(f"CAN data of {len(data)} bytes is longer than {self.DATA_SIZE} bytes")
+            timestamps.append(parse_timestamp(frame.timestamp))
+            channels.append(frame.channel)
+            can_ids.append(frame.can_id)
+            dlcs.append(frame.dlc)
+            self._data += data.ljust(self.DATA_SIZE, b"\x00")
+            count += 1
+            if len(self._data) >= flush_size:
+                self.flush()
+        return count
+
+    def flush(self) -> None:
+        for name, column in self._columns.items():
+            if sys.byteorder == "big":
+                column.byteswap()
+            with open(self.file(name), "ab") as f:
+                column.tofile(f)
+            del column[:]
+        with open(self.file("data"), "ab") as f:
+            f.write(self._data)
+        self._data = bytearray()
+
+    def __enter__(self) -> "RawCanStore":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        path = self.file("can_id")
+        stored = os.path.getsize(path) // 4 if os.path.exists(path) else 0
+        return stored + len(self._columns["can_id"])
+
+    def read_column(self, column: str) -> Union[array, bytes]:
+        """Reads a stored column: an array, or the bytes of the data column."""
+        path = self.file(column)
+        if column == "data":
+            if not os.path.exists(path):
+                return b""
+            with open(path, "rb") as f:
+                return f.read()
+        values = array(self.COLUMNS[column])
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                values.frombytes(f.read())
+            if sys.byteorder == "big":
+                values.byteswap()
+        return values
+
+    def rows(self, can_id: int) -> List[int]:
+        """Returns the rows of the stored frames of a CAN ID."""
+        return self._rows(self.read_column("can_id"), can_id)
+
+    @staticmethod
+    def _rows(can_ids: array, can_id: int) -> List[int]:
+        # Searches the CAN ID in the bytes of the column, keeping the 4-byte aligned matches
+        column = can_ids.tobytes()
+        key = array("I", [can_id]).tobytes()
+        rows = []
+        pos = column.find(key)
+        while pos >= 0:
+            if pos % 4 == 0:
+                rows.append(pos // 4)
+                pos = column.find(key, pos + 4)
+            else:
+                pos = column.find(key, pos + 1)
+        return rows
+
+    def frames(self, can_id: Optional[int] = None) -> Iterator[RawCanData]:
+        """Yields the stored frames, or only the frames of a CAN ID.
+
+        Timestamps are given in seconds with millisecond resolution, as in the
+        routine status record, and data is given as ``dlc`` bytes.
+        """
+        columns = {name: self.read_column(name) for name in self.FILES}
+        data = columns["data"]
+        rows = range(len(columns["can_id"])) if can_id is None else self._rows(columns["can_id"], can_id)
+        for i in rows:
+            dlc = columns["dlc"][i]
+            start = i * self.DATA_SIZE
+            yield RawCanData(
+                timestamp="%.3f" % columns["timestamp"][i],
+                channel=columns["channel"][i],
+                can_id=columns["can_id"][i],
+                dlc=dlc,
+                data="0x" + data[start:start + min(dlc, self.DATA_SIZE)].hex().upper(),
+            )
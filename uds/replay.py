@@ -0,0 +1,143 @@
+"""Replay of recorded UDS traffic through udsoncan, without a vehicle.
+
+``ReplayConnection`` answers the requests of a ``udsoncan.client.Client``
+with the responses of a capture (see :mod:`uds.capture`). Records are read
+as a stream, so captures of any length can be replayed.
+"""
+
+from collections import deque
+from typing import Deque, Iterable, Iterator, Optional, Tuple
+import time
+
+from uds.capture import CaptureRecord, Direction
+from udsoncan.Request import Request
+from udsoncan.connections import BaseConnection
+from udsoncan.exceptions import TimeoutException
+
+
+class ReplayConnection(BaseConnection):
+    """udsoncan connection answering requests with the responses of a capture.
+
+    Each ``send`` consumes the next TX record of the capture, and queues the RX
+    records that follow it up to the next TX record. A request with no recorded
+    response times out, as it did when recording. RX records found before a
+    request, e.g. periodic data, are returned by ``wait_frame`` when no request
+    is sent, and dropped otherwise.
+
+    :param records: The records of the capture, in order.
+    :param speed: None to replay at maximum speed, without any wait. Otherwise
+        the original timing is replayed, divided by ``speed``: 1.0 is real time,
+        10.0 is ten times faster.
+    :param check_requests: Raise a ValueError when a request differs from the
+        recorded one.
+    :param name: This name is included in the logger name.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[CaptureRecord],
+        speed: Optional[float] = None,
+        check_requests: bool = True,
+        name: Optional[str] = None,
+    ):
+        BaseConnection.__init__(self, name if name is not None else "Replay")
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.speed = speed
+        self.check_requests = check_requests
+        self.request_count = 0
+        self.opened = False
+
+        self._records: Iterator[CaptureRecord] = iter(records)
+        self._next: Optional[CaptureRecord] = next(self._records, None)
+        self._rxqueue: Deque[Tuple[float, bytes]] = deque()  # (due time, payload)
+        self._start: Optional[Tuple[float, float]] = None  # (capture time, replay time) of the first request
+
+    def open(self) -> "ReplayConnection":
+        self.opened = True
+        return self
+
+    def close(self) -> None:
+        self.opened = False
+
+    def is_open(self) -> bool:
+        return self.opened
+
+    def empty_rxqueue(self) -> None:
+        self._rxqueue.clear()
+
+    def at_end(self) -> bool:
+        """True when every record of the capture has been replayed."""
+        return self._next is None
+
+    def requests(self) -> Iterator[Request]:
+        """Yields the recorded requests not replayed yet.
+
+        Each request must be sent, e.g. with ``Client.send_request``, before the
+        next one is yielded::
+
+            for request in conn.requests():
+                response = client.send_request(request)
+        """
+        while True:
+            self._skip_rx_records()
+            if self._next is None:
+                return
+            yield Request.from_payload(self._next.payload)
+
+    def _replay_time(self, timestamp: float) -> float:
+        """Returns the replay time of a capture timestamp, or 0 at maximum speed."""
+        if self.speed is None or self._start is None:
+            return 0.0
+        return self._start[1] + (timestamp - self._start[0]) / self.speed
+
+    def _queue_rx_records(self) -> None:
+        while self._next is not None and self._next.direction == Direction.RX:
+            self._rxqueue.append((self._replay_time(self._next.timestamp), self._next.payload))
+            self._next = next(self._records, None)
+
+    def _skip_rx_records(self) -> None:
+        while self._next is not None and self._next.direction == Direction.RX:
+            self._next = next(self._records, None)
+
+    def specific_send(self, payload: bytes) -> None:
+        self._skip_rx_records()  # Received before the request, like the frames dropped by Client.send_request
+        record = self._next
+        if record is None:
+            raise RuntimeError("No more requests in the capture")
+        if self.check_requests and bytes(payload) != record.payload:
+            raise ValueError(
+                "Request %s does not match request %d of the capture: %s"
+                % (bytes(payload).hex(), self.request_count, record.payload.hex())
+            )
+
+        if self.speed is not None:
+            if self._start is None:
+                self._start = (record.timestamp, time.monotonic())
+            delay = self._replay_time(record.timestamp) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        self.request_count += 1
+        self._next = next(self._records, None)
+        self._queue_rx_records()
+
+    def specific_wait_frame(self, timeout: Optional[float] = 2) -> Optional[bytes]:
+        # A timeout of None waits as long as the next recorded frame is due.
+        # Without a recorded frame left, it raises at once instead of blocking forever.
+        if not self._rxqueue:
+            self._queue_rx_records()
+        if not self._rxqueue:
+            if self.speed is not None and timeout is not None:
+                time.sleep(timeout)
+            raise TimeoutException("No recorded response (timeout=%s sec)" % timeout)
+
+        due, payload = self._rxqueue[0]
+        delay = due - time.monotonic()
+        if delay > 0:
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                raise TimeoutException("Did not receive frame in time (timeout=%s sec)" % timeout)
+            time.sleep(delay)
+        self._rxqueue.popleft()
+        return payload
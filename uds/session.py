@@ -0,0 +1,262 @@
+"""Diagnostic session and security access kept open across requests.
+
+Writing a DID of the FoxPi ECU needs the extended diagnostic session and
+security level 1. Changing the session and unlocking it before each write
+costs four round trips for a single WriteDataByIdentifier, and a call of the
+seed decryption library. ``SessionManager`` remembers the active session and
+the unlocked security levels, and only sends DiagnosticSessionControl and
+SecurityAccess when they are not valid anymore:
+
+- before the first request, or after :meth:`SessionManager.invalidate`;
+- after the S3 timeout, if no request nor TesterPresent was sent meanwhile;
+- when the ECU answers serviceNotSupportedInActiveSession,
+  subFunctionNotSupportedInActiveSession or securityAccessDenied, e.g. after
+  an ECU reset. The request is then sent again once the session and
+  security access are established again;
+- after a connection error or a timeout, as the ECU state is unknown.
+
+A background thread sends TesterPresent with suppressPosRspMsgIndicationBit
+set when no request was sent for ``keep_alive_interval``, so that the ECU
+stays in the session.
+"""
+
+from typing import Any, Callable, Dict, Optional, Set, Tuple, TypeVar
+import logging
+import threading
+import time
+
+from udsoncan.client import Client
+from udsoncan.exceptions import NegativeResponseException, TimeoutException
+from udsoncan.ResponseCode import ResponseCode
+from udsoncan.services import DiagnosticSessionControl
+
+logger = logging.getLogger("Session")
+
+DEFAULT_SESSION = DiagnosticSessionControl.Session.defaultSession
+EXTENDED_SESSION = DiagnosticSessionControl.Session.extendedDiagnosticSession
+S3_TIMEOUT = 5.0  # S3Server: time without request before the ECU returns to the default session
+KEEP_ALIVE_INTERVAL = 2.0
+REESTABLISH_RESPONSE_CODES = (
+    ResponseCode.ServiceNotSupportedInActiveSession,
+    ResponseCode.SubFunctionNotSupportedInActiveSession,
+    ResponseCode.SecurityAccessDenied,
+)
+
+T = TypeVar("T")
+
+
+def memoize_security_algo(
+    security_algo: Callable[..., bytes], maxsize: int = 256
+) -> Callable[[int, bytes, Optional[Any]], bytes]:
+    """Returns a security_algo computing the key of each (level, seed) only once.
+
+    Some ECUs send the same seed until they are reset, so the key is not
+    computed by the seed decryption library again. The algorithm parameters
+    are not part of the cache key: they come from the client configuration.
+
+    :param security_algo: A security_algo of the client configuration, e.g.
+        ``uds.client.decrypt_seed_with_model(model)``.
+    :param maxsize: Number of keys kept, the oldest ones are dropped first.
+    """
+    keys: Dict[Tuple[int, bytes], bytes] = {}
+    lock = threading.Lock()
+    code = getattr(security_algo, "__code__", None)
+    algo_args = code.co_varnames[:code.co_argcount] if code is not None else ("level", "seed", "params")
+
+    # udsoncan passes the arguments by the names level, seed and params
+    def cached_security_algo(level: int, seed: bytes, params: Optional[Any] = None) -> bytes:
+        cache_key = (level, bytes(seed))
+        with lock:
+            key = keys.get(cache_key)
+        if key is None:
+            arguments = {"level": level, "seed": seed, "params": params}
+            key = security_algo(**{name: value for name, value in arguments.items() if name in algo_args})
+            with lock:
+                keys[cache_key] = key
+                if len(keys) > maxsize:
+                    del keys[next(iter(keys))]
+        return key
+
+    cached_security_algo.cache = keys  # type: ignore[attr-defined]
+    return cached_security_algo
+
+
+class SessionManager:
+    """Keeps a client in a diagnostic session with security levels unlocked.
+
+    Requests sent with :meth:`request` or the shortcuts of this class are
+    serialized with the keep-alive thread by :attr:`lock`. Hold it to use the
+    client directly, and call :meth:`invalidate` after changing the session or
+    resetting the ECU behind the back of the manager.
+
+    :param client: An open udsoncan client.
+    :param session: Session of the requests, unless another one is given to :meth:`request`.
+    :param security_level: Security level of the requests, or None.
+    :param keep_alive_interval: Time without request before a TesterPresent is
+        sent, in seconds. None to send no TesterPresent.
+    :param s3_timeout: Time without request after which the ECU is assumed back in the default session, in seconds.
+    :param memoize_keys: Replace the security_algo of the client configuration by
+        a :func:`memoize_security_algo` of it. Off by default, as it changes the
+        configuration of a client the caller owns.
+    :param reestablish_response_codes: Negative response codes making the
+        manager establish the session and security access again, and send the
+        request again.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        session: int = EXTENDED_SESSION,
+        security_level: Optional[int] = 0x01,
+        keep_alive_interval: Optional[float] = KEEP_ALIVE_INTERVAL,
+        s3_timeout: float = S3_TIMEOUT,
+        memoize_keys: bool = False,
+        reestablish_response_codes: Tuple[int, ...] = REESTABLISH_RESPONSE_CODES,
+    ):
+        self.client = client
+        self.session = session
+        self.security_level = security_level
+        self.keep_alive_interval = keep_alive_interval
+        self.s3_timeout = s3_timeout
+        self.reestablish_response_codes = reestablish_response_codes
+        self.lock = threading.RLock()
+        self.active_session = DEFAULT_SESSION
+        self.unlocked: Set[int] = set()
+        self.last_request = float("-inf")  # time.monotonic() of the last request
+        self.session_changes = 0
+        self.unlocks = 0
+        self.keep_alives = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if memoize_keys and callable(client.config.get("security_algo")):
+            client.config["security_algo"] = memoize_security_algo(client.config["security_algo"])
+
+    def __enter__(self) -> "SessionManager":
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Starts the keep-alive thread."""
+        if self.keep_alive_interval is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._keep_alive, name="TesterPresent", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the keep-alive thread. The ECU returns to the default session after the S3 timeout."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def invalidate(self) -> None:
+        """Forgets the session and security access, e.g. after a reconnection or an ECU reset."""
+        with self.lock:
+            self.active_session = DEFAULT_SESSION
+            self.unlocked.clear()
+
+    def is_valid(self, session: Optional[int] = None, security_level: Optional[int] = None) -> bool:
+        """Whether a request can be sent in ``session`` with ``security_level`` without exchange beforehand."""
+        session = self.session if session is None else session
+        if time.monotonic() - self.last_request >= self.s3_timeout:
+            return session == DEFAULT_SESSION and security_level is None
+        return self.active_session == session and (security_level is None or security_level in self.unlocked)
+
+    def ensure(self, session: Optional[int] = None, security_level: Optional[int] = None) -> None:
+        """Changes the session and unlocks the security level, if needed.
+
+        :param session: Defaults to the session of the manager.
+        :param security_level: Defaults to the security level of the manager.
+        """
+        session = self.session if session is None else session
+        security_level = self.security_level if security_level is None else security_level
+        with self.lock:
+            if time.monotonic() - self.last_request >= self.s3_timeout:
+                self.invalidate()
+            if self.active_session != session:
+                self.client.change_session(session)
+                self.session_changes += 1
+                self.active_session = session
+                self.unlocked.clear()  # Changing the session locks the ECU again
+                self.last_request = time.monotonic()
+            if security_level is not None and security_level not in self.unlocked:
+                self.client.unlock_security_access(security_level)
+                self.unlocks += 1
+                self.unlocked.add(security_level)
+                self.last_request = time.monotonic()
+
+    def request(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        session: Optional[int] = None,
+        security_level: Optional[int] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Calls ``func(*args, **kwargs)`` once the session and security access are established.
+
+        ``func`` is a method of the client, e.g. ``client.write_data_by_identifier``.
+        It is called a second time when the ECU answers with one of the
+        ``reestablish_response_codes`` and the session was assumed valid.
+        """
+        with self.lock:
+            valid = self.is_valid(session, self.security_level if security_level is None else security_level)
+            try:
+                self.ensure(session, security_level)
+                try:
+                    return func(*args, **kwargs)
+                except NegativeResponseException as e:
+                    if not valid or e.response.code not in self.reestablish_response_codes:
+                        raise
+                    logger.info("%s, establishing the session and security access again", e.response.code_name)
+                    if e.response.code == ResponseCode.SecurityAccessDenied:
+                        self.unlocked.clear()
+                    else:
+                        self.invalidate()
+                    self.ensure(session, security_level)
+                    return func(*args, **kwargs)
+            except (ConnectionError, TimeoutException):
+                self.invalidate()
+                raise
+            finally:
+                self.last_request = time.monotonic()
+
+    def write_data_by_identifier(self, did: int, value: Any) -> Any:
+        return self.request(self.client.write_data_by_identifier, did, value)
+
+    def read_data_by_identifier(self, didlist: Any) -> Any:
+        return self.request(self.client.read_data_by_identifier, didlist)
+
+    def tester_present(self) -> None:
+        """Sends a TesterPresent without positive response."""
+        with self.lock:
+            try:
+                with self.client.suppress_positive_response:
+                    self.client.tester_present()
+            except (ConnectionError, TimeoutException):
+                self.invalidate()
+                raise
+            self.keep_alives += 1
+            self.last_request = time.monotonic()
+
+    def _keep_alive(self) -> None:
+        assert self.keep_alive_interval is not None
+        timeout = self.keep_alive_interval
+        while not self._stop.wait(timeout):
+            with self.lock:
+                idle = time.monotonic() - self.last_request
+                if self.active_session == DEFAULT_SESSION or idle >= self.s3_timeout:
+                    timeout = self.keep_alive_interval  # Nothing to keep
+                    continue
+                if idle < self.keep_alive_interval:
+                    timeout = self.keep_alive_interval - idle
+                    continue
+                try:
+                    self.tester_present()
+                except Exception as e:
+                    logger.warning("TesterPresent failed: %s", e)
+                timeout = self.keep_alive_interval
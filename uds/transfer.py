@@ -0,0 +1,499 @@
+"""Transfer of data blocks to an ECU with RequestDownload, TransferData and RequestTransferExit.
+
+``download`` sends a file or a buffer in blocks of the maximum length accepted
+by the server. Blocks are slices of a memoryview over the source, or over a
+memory map of the source file, so the source is never copied as a whole.
+
+The progress of a download is kept in a :class:`TransferState`: the number of
+bytes acknowledged by the server and the next block sequence counter. A
+download interrupted by an exception, e.g. a lost connection, is resumed from
+the last acknowledged block by calling ``download`` again with the same state,
+or with the same ``state_path`` after a restart of the program.
+
+``upload_file`` and ``download_file`` move files with RequestFileTransfer,
+one block at a time, so the memory used does not depend on the file size.
+Both compute a checksum of the file as the blocks go, CRC-32 by default.
+"""
+
+from typing import Callable, FrozenSet, Iterable, Optional, Tuple, Union
+import dataclasses
+import hashlib
+import json
+import logging
+import mmap
+import os
+import time
+import zlib
+
+from udsoncan.client import Client
+from udsoncan.common.DataFormatIdentifier import DataFormatIdentifier
+from udsoncan.common.MemoryLocation import MemoryLocation
+from udsoncan.exceptions import (
+    InvalidResponseException,
+    NegativeResponseException,
+    TimeoutException,
+    UnexpectedResponseException,
+)
+from udsoncan.ResponseCode import ResponseCode
+from udsoncan.services import TransferData
+
+logger = logging.getLogger("Transfer")
+
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap]
+
+# Negative responses to a TransferData request after which the same block is sent again
+RETRY_RESPONSE_CODES = (ResponseCode.BusyRepeatRequest,)
+
+# Sequence counter overhead of a TransferData request, included in maxNumberOfBlockLength with the SID
+TRANSFER_DATA_OVERHEAD = 2
+
+
+@dataclasses.dataclass
+class TransferState:
+    """Progress of a download, updated after each block acknowledged by the server."""
+
+    address: int
+    memorysize: int
+    size: int  # Bytes of the source
+    offset: int = 0  # Bytes acknowledged by the server
+    sequence_number: int = 1  # Block sequence counter of the next block
+    block_size: int = 0  # Data bytes per TransferData request, 0 before RequestDownload
+    finished: bool = False  # RequestTransferExit was acknowledged
+
+    @property
+    def started(self) -> bool:
+        return self.block_size > 0
+
+    def save(self, path: str) -> None:
+        """Writes the state to a JSON file, replacing it atomically."""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(dataclasses.asdict(self), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TransferState":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+@dataclasses.dataclass
+class TransferResult:
+    size: int  # Bytes of the source
+    transferred: int  # Bytes sent and acknowledged by this call, without resent blocks
+    seconds: float
+    blocks: int  # TransferData requests acknowledged
+    retries: int  # TransferData requests sent again
+    resumed: bool  # The download continued a previous one
+    checksum: Optional[bytes] = None  # Digest of the whole file, for file transfers
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.transferred / self.seconds if self.seconds > 0 else 0.0
+
+
+class Crc32:
+    """Incremental CRC-32, with the update/digest interface of the hashlib objects. The digest is big-endian."""
+
+    name = "crc32"
+    digest_size = 4
+
+    def __init__(self):
+        self.value = 0
+
+    def update(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        self.value = zlib.crc32(data, self.value)
+
+    def digest(self) -> bytes:
+        return self.value.to_bytes(4, "big")
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+def new_checksum(name: str):
+    """Returns an incremental checksum: "crc32", or the name of a hashlib algorithm, e.g. "sha256"."""
+    return Crc32() if name == Crc32.name else hashlib.new(name)
+
+
+def _check_response(response) -> None:
+    """Raises the exception of a failed response, for clients that return them instead of raising."""
+    if response is None:
+        return
+    if not response.positive:
+        raise NegativeResponseException(response)
+    if not response.valid:
+        raise InvalidResponseException(response)
+    if response.unexpected:
+        raise UnexpectedResponseException(response)
+
+
+class _SourceView:
+    """A flat byte memoryview over a source, and the resources to close with it."""
+
+    def __init__(self, source: Source):
+        self._file = None
+        self._mmap = None
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, "rb")
+            if os.fstat(self._file.fileno()).st_size > 0:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.view = memoryview(self._mmap)
+            else:
+                self.view = memoryview(b"")
+        else:
+            self.view = memoryview(source)
+        if self.view.format != "B" or self.view.ndim != 1:
+            self.view = self.view.cast("B")
+
+    def close(self) -> None:
+        self.view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "_SourceView":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+
+def download(
+    client: Client,
+    memory_location: MemoryLocation,
+    source: Source,
+    dfi: Optional[DataFormatIdentifier] = None,
+    state: Optional[TransferState] = None,
+    state_path: Optional[str] = None,
+    max_retries: int = 3,
+    retry_response_codes: Iterable[int] = RETRY_RESPONSE_CODES,
+    block_size: Optional[int] = None,
+    transfer_exit_data: Optional[bytes] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    checkpoint_interval: float = 1.0,
+) -> TransferResult:
+    """Downloads a source to the server memory.
+
+    A block whose TransferData request times out, or is answered by one of
+    ``retry_response_codes``, is sent again with the same block sequence
+    counter, as the server acknowledges a repeated block without writing it
+    twice. Other errors are raised, with ``state`` left at the last
+    acknowledged block.
+
+    When resuming, the transfer continues with the next block. If the server
+    answers RequestSequenceError, e.g. after a reset, a new RequestDownload is
+    sent for the rest of the memory block, from the first byte that was not
+    acknowledged. The session and security access needed by RequestDownload
+    are left to the caller.
+
+    :param client: The client of the server, with a timeout suitable for writing a block.
+    :param memory_location: The address and size of the memory block to write.
+        The source may be shorter than the memory block.
+    :param source: A file path, or the bytes to download.
+    :param dfi: The DataFormatIdentifier of RequestDownload.
+    :param state: The state of a download to resume, updated as blocks are acknowledged.
+    :param state_path: A JSON file where the state is kept: it is loaded if it
+        exists, saved every ``checkpoint_interval`` seconds and when an error
+        is raised, and removed once the download is finished.
+    :param max_retries: Number of times a block is sent again before the error is raised.
+    :param block_size: Data bytes per TransferData request. Defaults to the
+        maxNumberOfBlockLength of the RequestDownload response.
+    :param transfer_exit_data: Optional transferRequestParameterRecord of RequestTransferExit.
+    :param progress: Called with the bytes acknowledged and the source size after each block.
+    """
+    if state is None and state_path is not None and os.path.exists(state_path):
+        state = TransferState.load(state_path)
+
+    with _SourceView(source) as source_view:
+        view = source_view.view
+        size = len(view)
+        if size > memory_location.memorysize:
+            raise ValueError("Source of %d bytes is larger than the memory block of %d bytes" % (size, memory_location.memorysize))
+        if state is None:
+            state = TransferState(address=memory_location.address, memorysize=memory_location.memorysize, size=size)
+        elif (state.address, state.memorysize, state.size) != (memory_location.address, memory_location.memorysize, size):
+            raise ValueError("The transfer state is not the state of this download")
+
+        resumed = state.started
+        may_request_again = resumed
+        retry_response_codes = frozenset(retry_response_codes)
+        blocks = 0
+        retries = 0
+        transferred = 0
+        start = time.perf_counter()
+        checkpoint = start
+
+        try:
+            if not state.started:
+                _request_download(client, memory_location, dfi, state, block_size)
+
+            while state.offset < size:
+                chunk = view[state.offset:state.offset + state.block_size]
+                try:
+                    try:
+                        _, block_retries = _transfer_block(client, state.sequence_number, chunk, max_retries, retry_response_codes)
+                    except NegativeResponseException as e:
+                        if e.response.code != ResponseCode.RequestSequenceError or not may_request_again:
+                            raise
+                        # The server does not continue the interrupted transfer: start again from the acknowledged offset
+                        logger.info("Transfer not resumed by the server, requesting a download from offset %d", state.offset)
+                        _request_download(client, memory_location, dfi, state, block_size)
+                        chunk.release()
+                        chunk = view[state.offset:state.offset + state.block_size]
+                        _, block_retries = _transfer_block(client, state.sequence_number, chunk, max_retries, retry_response_codes)
+                    may_request_again = False
+                    length = len(chunk)
+                finally:
+                    chunk.release()
+
+                state.offset += length
+                state.sequence_number = (state.sequence_number + 1) & 0xFF
+                transferred += length
+                blocks += 1
+                retries += block_retries
+                if progress is not None:
+                    progress(state.offset, size)
+                if state_path is not None and time.perf_counter() - checkpoint >= checkpoint_interval:
+                    state.save(state_path)
+                    checkpoint = time.perf_counter()
+
+            if not state.finished:
+                _check_response(client.request_transfer_exit(transfer_exit_data))
+                state.finished = True
+        except BaseException:
+            if state_path is not None:
+                state.save(state_path)
+            raise
+
+    seconds = time.perf_counter() - start
+    if state_path is not None and os.path.exists(state_path):
+        os.remove(state_path)
+    logger.info("Downloaded %d bytes in %d blocks in %.3f s (%.0f bytes/s), %d retries",
+                transferred, blocks, seconds, transferred / seconds if seconds > 0 else 0.0, retries)
+    return TransferResult(size=size, transferred=transferred, seconds=seconds, blocks=blocks, retries=retries, resumed=resumed)
+
+
+def upload_file(
+    client: Client,
+    path: str,
+    remote: Optional[str] = None,
+    dfi: Optional[DataFormatIdentifier] = None,
+    replace: bool = False,
+    resume: bool = False,
+    checksum: Optional[str] = Crc32.name,
+    max_retries: int = 3,
+    retry_response_codes: Iterable[int] = RETRY_RESPONSE_CODES,
+    transfer_exit_data: Optional[bytes] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> TransferResult:
+    """Writes a local file to the server: RequestFileTransfer, TransferData and RequestTransferExit.
+
+    The file is read in blocks of the maxNumberOfBlockLength of the server,
+    into one reused buffer.
+
+    :param path: The local file.
+    :param remote: The file name on the server. Defaults to the name of the local file.
+    :param replace: Use ReplaceFile instead of AddFile.
+    :param resume: Use ResumeFile to continue an interrupted transfer of the
+        same file, from the file position returned by the server.
+    :param checksum: "crc32", a hashlib algorithm, or None. The checksum covers
+        the whole file, including the part written before resuming.
+    :param progress: Called with the bytes written and the file size after each block.
+    """
+    if remote is None:
+        remote = os.path.basename(path)
+    size = os.path.getsize(path)
+    hasher = new_checksum(checksum) if checksum else None
+    retry_response_codes = frozenset(retry_response_codes)
+    start = time.perf_counter()
+
+    if resume:
+        response = client.resume_file(remote, dfi, size)
+    elif replace:
+        response = client.replace_file(remote, dfi, size)
+    else:
+        response = client.add_file(remote, dfi, size)
+    _check_response(response)
+    position = response.service_data.fileposition if resume and response.service_data.fileposition else 0
+    if position > size:
+        raise ValueError("Server file position %d is beyond the end of the %d bytes file" % (position, size))
+    block_size = _block_size(response.service_data.max_length)
+
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    sequence_number = 1
+    blocks = 0
+    retries = 0
+    try:
+        with open(path, "rb") as f:
+            while f.tell() < position:  # Checksum of the part already on the server
+                length = f.readinto(view[:min(block_size, position - f.tell())])
+                if length == 0:
+                    break
+                if hasher is not None:
+                    hasher.update(view[:length])
+            offset = position
+            while True:
+                length = f.readinto(buffer)
+                if length == 0:
+                    break
+                chunk = view[:length]
+                try:
+                    _, block_retries = _transfer_block(client, sequence_number, chunk, max_retries, retry_response_codes)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                finally:
+                    chunk.release()
+                offset += length
+                sequence_number = (sequence_number + 1) & 0xFF
+                blocks += 1
+                retries += block_retries
+                if progress is not None:
+                    progress(offset, size)
+    finally:
+        view.release()
+
+    _check_response(client.request_transfer_exit(transfer_exit_data))
+    seconds = time.perf_counter() - start
+    return TransferResult(
+        size=size,
+        transferred=size - position,
+        seconds=seconds,
+        blocks=blocks,
+        retries=retries,
+        resumed=position > 0,
+        checksum=hasher.digest() if hasher is not None else None,
+    )
+
+
+def download_file(
+    client: Client,
+    remote: str,
+    local: str,
+    dfi: Optional[DataFormatIdentifier] = None,
+    checksum: Optional[str] = Crc32.name,
+    max_retries: int = 3,
+    retry_response_codes: Iterable[int] = RETRY_RESPONSE_CODES,
+    transfer_exit_data: Optional[bytes] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> TransferResult:
+    """Reads a file of the server into a local file: RequestFileTransfer ReadFile, TransferData and RequestTransferExit.
+
+    Each block is written to ``<local>.part`` as it is received, and the file
+    is renamed to ``local`` once complete. ReadFile has no file position, so an
+    interrupted read starts again from the beginning; a block whose response
+    is lost is requested again with the same block sequence counter.
+
+    :param remote: The file name on the server.
+    :param local: The local file, replaced if it exists.
+    :param checksum: "crc32", a hashlib algorithm, or None.
+    :param progress: Called with the bytes received and the file size after each block.
+    """
+    hasher = new_checksum(checksum) if checksum else None
+    retry_response_codes = frozenset(retry_response_codes)
+    start = time.perf_counter()
+
+    response = client.read_file(remote, dfi)
+    _check_response(response)
+    filesize = response.service_data.filesize
+    # The size of the transferred data is the compressed size, equal to the uncompressed size without compression
+    size = filesize.compressed if filesize.compressed is not None else filesize.uncompressed
+
+    part_path = local + ".part"
+    sequence_number = 1
+    received = 0
+    blocks = 0
+    retries = 0
+    try:
+        with open(part_path, "wb") as f:
+            while received < size:
+                response, block_retries = _transfer_block(client, sequence_number, None, max_retries, retry_response_codes)
+                data = response.service_data.parameter_records
+                if len(data) == 0:
+                    raise UnexpectedResponseException(response, "TransferData response holds no data, %d of %d bytes received" % (received, size))
+                f.write(data)
+                if hasher is not None:
+                    hasher.update(data)
+                received += len(data)
+                sequence_number = (sequence_number + 1) & 0xFF
+                blocks += 1
+                retries += block_retries
+                if progress is not None:
+                    progress(received, size)
+        _check_response(client.request_transfer_exit(transfer_exit_data))
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    os.replace(part_path, local)
+
+    seconds = time.perf_counter() - start
+    return TransferResult(
+        size=size,
+        transferred=received,
+        seconds=seconds,
+        blocks=blocks,
+        retries=retries,
+        resumed=False,
+        checksum=hasher.digest() if hasher is not None else None,
+    )
+
+
+def _transfer_block(
+    client: Client,
+    sequence_number: int,
+    data: Optional[Union[bytes, bytearray, memoryview]],
+    max_retries: int,
+    retry_response_codes: FrozenSet[int],
+) -> Tuple[TransferData.InterpretedResponse, int]:
+    """Sends one TransferData request, again with the same block sequence counter after a
+    timeout or one of ``retry_response_codes``.
+
+    :return: The positive response, and the number of times the request was sent again.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = client.transfer_data(sequence_number, data)
+            _check_response(response)
+            return response, attempt
+        except TimeoutException:
+            if attempt >= max_retries:
+                raise
+        except NegativeResponseException as e:
+            if e.response.code not in retry_response_codes or attempt >= max_retries:
+                raise
+        attempt += 1
+        logger.warning("Sending block 0x%02x again", sequence_number)
+
+
+def _request_download(
+    client: Client,
+    memory_location: MemoryLocation,
+    dfi: Optional[DataFormatIdentifier],
+    state: TransferState,
+    block_size: Optional[int],
+) -> None:
+    """Sends RequestDownload for the memory block from the state offset, and restarts the block sequence counter."""
+    if state.offset > 0:
+        memory_location = MemoryLocation(
+            memory_location.address + state.offset,
+            memory_location.memorysize - state.offset,
+            address_format=memory_location.address_format,
+            memorysize_format=memory_location.memorysize_format,
+        )
+    response = client.request_download(memory_location, dfi)
+    _check_response(response)
+    max_block_size = _block_size(response.service_data.max_length)
+    state.block_size = min(block_size, max_block_size) if block_size else max_block_size
+    state.sequence_number = 1
+
+
+def _block_size(max_length: int) -> int:
+    """Data bytes per TransferData request, from the maxNumberOfBlockLength of the server."""
+    block_size = max_length - TRANSFER_DATA_OVERHEAD
+    if block_size <= 0:
+        raise ValueError("Server maxNumberOfBlockLength of %d bytes leaves no room for data" % max_length)
+    return block_size
@@ -3,13 +3,24 @@ import inspect
 from udsoncan.ResponseCode import ResponseCode
 from abc import ABC
 
-from typing import Type, List, Optional
+from typing import Type, List, Optional, Dict
 
 
 class BaseSubfunction:
 
     @classmethod
     def get_name(cls, subfn_id: int) -> str:
+        # Names are resolved once per class and subfunction id. The cache is stored in the class itself, never inherited.
+        names: Optional[Dict[int, str]] = cls.__dict__.get('_subfn_names')
+        if names is None:
+            names = {}
+            setattr(cls, '_subfn_names', names)
+        if subfn_id not in names:
+            names[subfn_id] = cls._find_name(subfn_id)
+        return names[subfn_id]
+
+    @classmethod
+    def _find_name(cls, subfn_id: int) -> str:
         attributes = inspect.getmembers(cls, lambda a: not (inspect.isroutine(a)))
         subfn_list = [a for a in attributes if not (a[0].startswith('__') and a[0].endswith('__'))]
 
@@ -46,6 +57,15 @@ class BaseService(ABC):
     _use_subfunction: bool
     supported_negative_response: List[int]
 
+    # SID -> service lookup tables, built on first use for each base class and cleared when a new service class is defined
+    _request_id_index: Dict[Type["BaseService"], Dict[int, Type["BaseService"]]] = {}
+    _response_id_index: Dict[Type["BaseService"], Dict[int, Type["BaseService"]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseService._request_id_index.clear()
+        BaseService._response_id_index.clear()
+
     @classmethod  # Returns the service ID used for a client request
     def request_id(cls) -> int:
         return cls._sid
@@ -70,21 +90,28 @@ class BaseService(ABC):
                 lst.extend(subclasses)
         return lst
 
+    @staticmethod
+    def __build_index(cls, by_response_id: bool) -> Dict[int, Type["BaseService"]]:
+        index: Dict[int, Type["BaseService"]] = {}
+        for obj in BaseService.__get_all_subclasses(cls):
+            index.setdefault(obj.response_id() if by_response_id else obj.request_id(), obj)  # First match wins, like a linear search
+        return index
+
     @classmethod  # Returns an instance of the service identified by the service ID (Request)
     def from_request_id(cls, given_id: int) -> Optional[Type["BaseService"]]:
-        classes = BaseService.__get_all_subclasses(cls)
-        for obj in classes:
-            if obj.request_id() == given_id:
-                return obj
-        return None
+        index = BaseService._request_id_index.get(cls)
+        if index is None:
+            index = BaseService.__build_index(cls, by_response_id=False)
+            BaseService._request_id_index[cls] = index
+        return index.get(given_id)
 
     @classmethod  # Returns an instance of the service identified by the service ID (Response)
     def from_response_id(cls, given_id: int) -> Optional[Type["BaseService"]]:
-        classes = BaseService.__get_all_subclasses(cls)
-        for obj in classes:
-            if obj.response_id() == int(given_id):
-                return obj
-        return None
+        index = BaseService._response_id_index.get(cls)
+        if index is None:
+            index = BaseService.__build_index(cls, by_response_id=True)
+            BaseService._response_id_index[cls] = index
+        return index.get(int(given_id))
 
     # Default subfunction ID for service that does not implement subfunction_id().
     def subfunction_id(self) -> int:
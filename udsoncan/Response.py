@@ -62,7 +62,8 @@ class Response:
 
     .. data:: original_payload 
 
-            (bytes) When the response is built with `Response.from_payload`, this property contains a copy of the payload used. None otherwise.
+            (bytes) When the response is built with `Response.from_payload`, this property contains the payload used. None otherwise.
+            If the payload was given as a memoryview of a reused receive buffer, this property refers to that same buffer.
 
     .. data:: original_request 
 
@@ -154,13 +155,14 @@ class Response:
     # Analyzes a TP frame and builds a Response object. Used by client
 
     @classmethod
-    def from_payload(cls, payload: bytes) -> "Response":
+    def from_payload(cls, payload: Union[bytes, bytearray, memoryview]) -> "Response":
         """
         Creates a ``Response`` object from a payload coming from the underlying protocol.
         This method is meant to be used by a UDS client
 
-        :param payload: The payload of data to parse
-        :type payload: bytes
+        :param payload: The payload of data to parse. A bytearray or memoryview is accepted so that a connection can
+            hand out a view of its receive buffer; only ``data`` is copied out of it.
+        :type payload: bytes, bytearray or memoryview
 
         :return: A :ref:`Response<Response>` object with populated fields
         :rtype: :ref:`Response<Response>`
@@ -217,7 +219,7 @@ class Response:
         response.valid = True
         response.invalid_reason = ""
         if len(payload) > data_start:
-            response.data = payload[data_start:]
+            response.data = bytes(payload[data_start:])
         return response
 
     def __repr__(self) -> str:
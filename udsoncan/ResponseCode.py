@@ -167,11 +167,7 @@ class ResponseCode:
         if given_id is None:
             return ""
 
-        for member in inspect.getmembers(cls):
-            if isinstance(member[1], int):
-                if member[1] == given_id:
-                    return member[0]
-        return str(given_id)
+        return cls._names().get(given_id, str(given_id))
 
     # Tells if a code is a negative code
     @classmethod
@@ -179,8 +175,16 @@ class ResponseCode:
         if given_id in [None, cls.PositiveResponse]:
             return False
 
-        for member in inspect.getmembers(cls):
-            if isinstance(member[1], int):
-                if member[1] == given_id:
-                    return True
-        return False
+        return given_id in cls._names()
+
+    # Code -> name table, built once per class. The first member in alphabetical order wins, like a linear search of inspect.getmembers
+    @classmethod
+    def _names(cls) -> Dict[int, str]:
+        names = cls.__dict__.get('_code_names')
+        if names is None:
+            names = {}
+            for member in inspect.getmembers(cls):
+                if isinstance(member[1], int):
+                    names.setdefault(member[1], member[0])
+            setattr(cls, '_code_names', names)
+        return names
@@ -0,0 +1,561 @@
+from udsoncan import Request, Response, services
+from udsoncan.client import Client, SessionTiming
+from udsoncan.common.Routine import Routine
+from udsoncan.common.dids import DataIdentifier, CompiledDidConfig
+from udsoncan.connections import AsyncBaseConnection
+
+from udsoncan.exceptions import *
+from udsoncan.configs import default_client_config
+from udsoncan.typing import ClientConfig
+import asyncio
+import logging
+import binascii
+import functools
+import time
+
+from typing import Callable, Optional, Union, List, Any, cast
+
+
+class AsyncClient:
+    """
+    __init__(self, conn, config=default_client_config, request_timeout = None)
+
+    asyncio version of :ref:`Client<Client>`. Every service method is a coroutine; the configuration, the timeouts
+    and the validation of the responses are the same as with the :ref:`Client<Client>`.
+
+    Requests sent through one AsyncClient are serialized, as the UDS protocol requires. Use one AsyncClient per
+    connection to talk to several servers concurrently.
+
+    :param conn: The underlying protocol interface.
+    :type conn: :class:`AsyncBaseConnection<udsoncan.connections.AsyncBaseConnection>`
+
+    :param config: The :ref:`client configuration<client_config>`
+    :type config: dict
+
+    :param request_timeout: Maximum amount of time to wait for a response. This parameter exists for backward compatibility only. For detailed timeout handling, see :ref:`Client configuration<config_timeouts>`
+    :type request_timeout: int
+    """
+
+    conn: AsyncBaseConnection
+    config: ClientConfig
+    suppress_positive_response: Client.SuppressPositiveResponse
+    payload_override: Client.PayloadOverrider
+    last_response: Optional[Response]
+    session_timing: SessionTiming
+    compiled_data_identifiers: Optional[CompiledDidConfig]
+    logger: logging.Logger
+
+    def __init__(self, conn: AsyncBaseConnection, config: ClientConfig = default_client_config, request_timeout: Optional[float] = None):
+        self.conn = conn
+        self.config = cast(ClientConfig, dict(config))  # Makes a copy of given configuration
+
+        # For backward compatibility
+        if request_timeout is not None:
+            self.config['request_timeout'] = request_timeout
+        self.suppress_positive_response = Client.SuppressPositiveResponse()
+        self.payload_override = Client.PayloadOverrider()
+        self.last_response = None
+        self._request_lock = asyncio.Lock()
+
+        self.session_timing = SessionTiming(p2_server_max=None, p2_star_server_max=None)
+
+        self.refresh_config()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self.close()
+
+    async def open(self) -> None:
+        if not self.conn.is_open():
+            await self.conn.open()
+
+    async def close(self) -> None:
+        await self.conn.close()
+
+    # Configuration handling does no I/O and is shared with the synchronous Client
+    configure_logger = Client.configure_logger
+    set_config = Client.set_config
+    set_configs = Client.set_configs
+    refresh_config = Client.refresh_config
+    validate_config = Client.validate_config
+    service_log_prefix = Client.service_log_prefix
+    get_session_timing = Client.get_session_timing
+
+    # Response validation and NRC 0x78 handling are shared with the synchronous Client so that both stay in sync
+    _handle_response = Client._handle_response
+    _p2_star_timeout = Client._p2_star_timeout
+
+    # Same as Client.standard_error_management, for coroutines.
+    def standard_error_management(func: Callable):  # type: ignore
+        @functools.wraps(func)
+        async def decorated(self: "AsyncClient", *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+
+            except NegativeResponseException as e:
+                e.response.positive = False
+                if self.config['exception_on_negative_response']:
+                    logline = '[%s] : %s' % (e.__class__.__name__, str(e))
+                    self.logger.warning(logline)
+                    raise
+                else:
+                    self.logger.warning(str(e))
+                    return e.response
+
+            except InvalidResponseException as e:
+                e.response.valid = False
+                if self.config['exception_on_invalid_response']:
+                    self.logger.error('[%s] : %s' % (e.__class__.__name__, str(e)))
+                    raise
+                else:
+                    self.logger.error(str(e))
+                    return e.response
+
+            except UnexpectedResponseException as e:
+                e.response.unexpected = True
+                if self.config['exception_on_unexpected_response']:
+                    self.logger.error('[%s] : %s' % (e.__class__.__name__, str(e)))
+                    raise
+                else:
+                    self.logger.error(str(e))
+                    return e.response
+
+            except Exception as e:
+                self.logger.error('[%s] : %s' % (e.__class__.__name__, str(e)))
+                raise
+
+        decorated._func_no_error_management = func  # type:ignore
+        return decorated
+
+    @standard_error_management
+    async def change_session(self, newsession: int) -> Optional[services.DiagnosticSessionControl.InterpretedResponse]:
+        """
+        Requests the server to change the diagnostic session. See :meth:`Client.change_session<udsoncan.client.Client.change_session>`
+        """
+        req = services.DiagnosticSessionControl.make_request(newsession)
+
+        named_newsession = '%s (0x%02x)' % (services.DiagnosticSessionControl.Session.get_name(newsession), newsession)
+        self.logger.info('%s - Switching session to %s' % (self.service_log_prefix(services.DiagnosticSessionControl), named_newsession))
+
+        response = await self.send_request(req)
+        if response is None:
+            return None
+
+        response = services.DiagnosticSessionControl.interpret_response(response, standard_version=self.config['standard_version'])
+
+        if newsession != response.service_data.session_echo:
+            raise UnexpectedResponseException(response, "Response subfunction received from server (0x%02x) does not match the requested subfunction (0x%02x)" % (
+                response.service_data.session_echo, newsession))
+
+        if self.config['standard_version'] > 2006:
+            assert response.service_data.p2_server_max is not None
+            assert response.service_data.p2_star_server_max is not None
+            if self.config['use_server_timing']:
+                self.logger.info('%s - Received new timing parameters. P2=%.3fs and P2*=%.3fs.  Using these value from now on.' %
+                                 (self.service_log_prefix(services.DiagnosticSessionControl), response.service_data.p2_server_max, response.service_data.p2_star_server_max))
+                self.session_timing.p2_server_max = response.service_data.p2_server_max
+                self.session_timing.p2_star_server_max = response.service_data.p2_star_server_max
+
+        return response
+
+    @standard_error_management
+    async def request_seed(self, level: int, data=bytes()) -> Optional[services.SecurityAccess.InterpretedResponse]:
+        """
+        Requests a seed to unlock a security level. See :meth:`Client.request_seed<udsoncan.client.Client.request_seed>`
+        """
+        req = services.SecurityAccess.make_request(level, mode=services.SecurityAccess.Mode.RequestSeed, data=data)
+        assert req.subfunction is not None
+        self.logger.info('%s - Requesting seed to unlock security access level 0x%02x' %
+                         (self.service_log_prefix(services.SecurityAccess), req.subfunction))
+
+        response = await self.send_request(req)
+        if response is None:
+            return None
+
+        response = services.SecurityAccess.interpret_response(response, mode=services.SecurityAccess.Mode.RequestSeed)
+        assert response.service_data.seed is not None
+
+        expected_level = services.SecurityAccess.normalize_level(mode=services.SecurityAccess.Mode.RequestSeed, level=level)
+        received_level = response.service_data.security_level_echo
+        if expected_level != received_level:
+            raise UnexpectedResponseException(
+                response, "Response subfunction received from server (0x%02x) does not match the requested subfunction (0x%02x)" % (received_level, expected_level))
+
+        self.logger.debug('Received seed [%s]' % (binascii.hexlify(response.service_data.seed).decode('ascii')))
+        return response
+
+    @standard_error_management
+    async def send_key(self, level: int, key: bytes) -> Optional[services.SecurityAccess.InterpretedResponse]:
+        """
+        Sends a key to unlock a security level. See :meth:`Client.send_key<udsoncan.client.Client.send_key>`
+        """
+        req = services.SecurityAccess.make_request(level, mode=services.SecurityAccess.Mode.SendKey, data=key)
+        assert req.subfunction is not None
+
+        self.logger.info('%s - Sending key to unlock security access level 0x%02x' %
+                         (self.service_log_prefix(services.SecurityAccess), req.subfunction))
+        self.logger.debug('\tKey to send [%s]' % (binascii.hexlify(key).decode('ascii')))
+
+        response = await self.send_request(req)
+        if response is None:
+            return None
+
+        response = services.SecurityAccess.interpret_response(response, mode=services.SecurityAccess.Mode.SendKey)
+
+        expected_level = services.SecurityAccess.normalize_level(mode=services.SecurityAccess.Mode.SendKey, level=level)
+        received_level = response.service_data.security_level_echo
+        if expected_level != received_level:
+            raise UnexpectedResponseException(
+                response, "Response subfunction received from server (0x%02x) does not match the requested subfunction (0x%02x)" % (received_level, expected_level))
+
+        return response
+
+    @standard_error_management
+    async def unlock_security_access(self, level, seed_params=bytes()) -> Optional[services.SecurityAccess.InterpretedResponse]:
+        """
+        Successively calls request_seed and send_key to unlock a security level. The key computation is done by calling config['security_algo'].
+        See :meth:`Client.unlock_security_access<udsoncan.client.Client.unlock_security_access>`
+        """
+        if 'security_algo' not in self.config or not callable(self.config['security_algo']):
+            raise NotImplementedError("Client configuration does not provide a security algorithm")
+
+        response = await self.request_seed._func_no_error_management(self, level, data=seed_params)
+        seed = response.service_data.seed
+        if len(seed) > 0 and seed == b'\x00' * len(seed):
+            self.logger.info('%s - Security access level 0x%02x is already unlocked, no key will be sent.' %
+                             (self.service_log_prefix(services.SecurityAccess), level))
+            return response
+
+        params = self.config['security_algo_params'] if 'security_algo_params' in self.config else None
+
+        algo_params = {}
+        try:
+            algo_args = self.config['security_algo'].__code__.co_varnames[:self.config['security_algo'].__code__.co_argcount]
+
+            if 'seed' in algo_args:
+                algo_params['seed'] = seed
+            if 'level' in algo_args:
+                algo_params['level'] = level
+            if 'params' in algo_args:
+                algo_params['params'] = params
+        except:
+            algo_params = {'seed': seed, 'params': params, 'level': level}
+
+        key = self.config['security_algo'].__call__(**algo_params)  # type: ignore
+        return await self.send_key._func_no_error_management(self, level, key)
+
+    @standard_error_management
+    async def tester_present(self) -> Optional[services.TesterPresent.InterpretedResponse]:
+        """
+        Sends a TesterPresent request to keep the session active.
+        """
+        req = services.TesterPresent.make_request()
+        assert req.subfunction is not None
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info('%s - Sending TesterPresent request' % (self.service_log_prefix(services.TesterPresent)))
+        response = await self.send_request(req)
+        if response is None:
+            return None
+
+        response = services.TesterPresent.interpret_response(response)
+
+        if req.subfunction != response.service_data.subfunction_echo:
+            raise UnexpectedResponseException(response, "Response subfunction received from server (0x%02x) does not match the requested subfunction (0x%02x)" % (
+                response.service_data.subfunction_echo, req.subfunction))
+
+        return response
+
+    @standard_error_management
+    async def read_data_by_identifier_first(self, didlist: Union[int, List[int]]) -> Optional[Any]:
+        """
+        Shortcut to extract a single DID. Calls read_data_by_identifier then returns the first DID asked for.
+        """
+        didlist = services.ReadDataByIdentifier.validate_didlist_input(didlist)
+        response = await self.read_data_by_identifier(didlist)
+        values = response.service_data.values
+        if len(values) > 0 and len(didlist) > 0:
+            return values[didlist[0]]
+        return None
+
+    @standard_error_management
+    async def read_data_by_identifier(self, didlist: Union[int, List[int]]) -> Optional[services.ReadDataByIdentifier.InterpretedResponse]:
+        """
+        Requests a value associated with a data identifier (DID). See :meth:`Client.read_data_by_identifier<udsoncan.client.Client.read_data_by_identifier>`
+        """
+        didlist = services.ReadDataByIdentifier.validate_didlist_input(didlist)
+        req = services.ReadDataByIdentifier.make_request(didlist=didlist, didconfig=self.compiled_data_identifiers)
+
+        if self.logger.isEnabledFor(logging.INFO):
+            if len(didlist) == 1:
+                self.logger.info("%s - Reading data identifier : 0x%04x (%s)" %
+                                 (self.service_log_prefix(services.ReadDataByIdentifier), didlist[0], DataIdentifier.name_from_id(didlist[0])))
+            else:
+                self.logger.info("%s - Reading %d data identifier : %s" %
+                                 (self.service_log_prefix(services.ReadDataByIdentifier), len(didlist), list(map(hex, didlist))))
+
+        if 'data_identifiers' not in self.config or not isinstance(self.config['data_identifiers'], dict):
+            raise ConfigError('Configuration does not contains a valid data identifier description.')
+
+        response = await self.send_request(req)
+        if response is None:
+            return None
+
+        try:
+            response = services.ReadDataByIdentifier.interpret_response(response,
+                                                                        didlist=didlist,
+                                                                        didconfig=self.compiled_data_identifiers,
+                                                                        tolerate_zero_padding=self.config['tolerate_zero_padding']
+                                                                        )
+        except ConfigError as e:
+            if e.key in didlist:
+                raise
+            else:
+                raise UnexpectedResponseException(
+                    response, "Server returned values for data identifier 0x%04x that was not requested and no Codec was defined for it. Parsing must be stopped." % (e.key))
+
+        set_request_didlist = set(didlist)
+        set_response_didlist = set(response.service_data.values.keys())
+        extra_did = set_response_didlist - set_request_didlist
+        missing_did = set_request_didlist - set_response_didlist
+
+        if len(extra_did) > 0:
+            raise UnexpectedResponseException(
+                response, "Server returned values for %d data identifier that were not requested. Dids are : %s" % (len(extra_did), extra_did))
+
+        if len(missing_did) > 0:
+            raise UnexpectedResponseException(
+                response, "%d data identifier values are missing from server response. Dids are : %s" % (len(missing_did), missing_did))
+
+        return response
+
+    @standard_error_management
+    async def write_data_by_identifier(self, did: int, value: Any) -> Optional[services.WriteDataByIdentifier.InterpretedResponse]:
+        """
+        Requests to write a value associated with a data identifier (DID). See :meth:`Client.write_data_by_identifier<udsoncan.client.Client.write_data_by_identifier>`
+        """
+        req = services.WriteDataByIdentifier.make_request(did, value, didconfig=self.config['data_identifiers'])
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s - Writing data identifier 0x%04x (%s)" %
+                             (self.service_log_prefix(services.WriteDataByIdentifier), did, DataIdentifier.name_from_id(did)))
+
+        response = await self.send_request(req)
+        if response is None:
+            return None
+        response = services.WriteDataByIdentifier.interpret_response(response)
+
+        if response.service_data.did_echo != did:
+            raise UnexpectedResponseException(
+                response, "Server returned a response for data identifier 0x%04x while client requested for did 0x%04x" % (response.service_data.did_echo, did))
+
+        return response
+
+    @standard_error_management
+    async def ecu_reset(self, reset_type: int) -> Optional[services.ECUReset.InterpretedResponse]:
+        """
+        Requests the server to execute a reset sequence. See :meth:`Client.ecu_reset<udsoncan.client.Client.ecu_reset>`
+        """
+        req = services.ECUReset.make_request(reset_type)
+        self.logger.info("%s - Requesting reset of type 0x%02x (%s)" %
+                         (self.service_log_prefix(services.ECUReset), reset_type, services.ECUReset.ResetType.get_name(reset_type)))
+
+        response = await self.send_request(req)
+        if response is None:
+            return None
+        response = services.ECUReset.interpret_response(response)
+
+        if response.service_data.reset_type_echo != reset_type:
+            raise UnexpectedResponseException(response, "Response subfunction received from server (0x%02x) does not match the requested subfunction (0x%02x)" % (
+                response.service_data.reset_type_echo, reset_type))
+
+        if response.service_data.reset_type_echo == services.ECUReset.ResetType.enableRapidPowerShutDown and response.service_data.powerdown_time != 0xFF:
+            assert response.service_data.powerdown_time is not None
+            self.logger.info('Server will shutdown in %d seconds.' % (response.service_data.powerdown_time))
+
+        return response
+
+    @standard_error_management
+    async def clear_dtc(self, group: int = 0xFFFFFF, memory_selection: Optional[int] = None) -> Optional[services.ClearDiagnosticInformation.InterpretedResponse]:
+        """
+        Requests the server to clear its active Diagnostic Trouble Codes. See :meth:`Client.clear_dtc<udsoncan.client.Client.clear_dtc>`
+        """
+        request = services.ClearDiagnosticInformation.make_request(
+            group, memory_selection=memory_selection, standard_version=self.config['standard_version'])
+        memys_str = ''
+        if memory_selection is not None:
+            memys_str = ' , MemorySelection : %d' % memory_selection
+        if group == 0xFFFFFF:
+            self.logger.info('%s - Clearing all DTCs (group mask : 0xFFFFFF%s)' %
+                             (self.service_log_prefix(services.ClearDiagnosticInformation), memys_str))
+        else:
+            self.logger.info('%s - Clearing DTCs matching group mask : 0x%06x%s' %
+                             (self.service_log_prefix(services.ClearDiagnosticInformation), group, memys_str))
+
+        response = await self.send_request(request)
+        if response is None:
+            return None
+
+        return services.ClearDiagnosticInformation.interpret_response(response)
+
+    async def start_routine(self, routine_id: int, data: Optional[bytes] = None) -> Optional[services.RoutineControl.InterpretedResponse]:
+        """
+        Requests the server to start a routine (subfunction = 0x01).
+        """
+        return await self.routine_control(routine_id, services.RoutineControl.ControlType.startRoutine, data)
+
+    async def stop_routine(self, routine_id: int, data: Optional[bytes] = None) -> Optional[services.RoutineControl.InterpretedResponse]:
+        """
+        Requests the server to stop a routine (subfunction = 0x02).
+        """
+        return await self.routine_control(routine_id, services.RoutineControl.ControlType.stopRoutine, data)
+
+    async def get_routine_result(self, routine_id: int, data: Optional[bytes] = None) -> Optional[services.RoutineControl.InterpretedResponse]:
+        """
+        Requests the server to send back the execution result of the specified routine (subfunction = 0x03).
+        """
+        return await self.routine_control(routine_id, services.RoutineControl.ControlType.requestRoutineResults, data)
+
+    @standard_error_management
+    async def routine_control(self, routine_id: int, control_type: int, data: Optional[bytes] = None) -> Optional[services.RoutineControl.InterpretedResponse]:
+        """
+        Sends a generic request for the RoutineControl service. See :meth:`Client.routine_control<udsoncan.client.Client.routine_control>`
+        """
+        request = services.RoutineControl.make_request(routine_id, control_type, data=data)
+        payload_length = 0 if data is None else len(data)
+        action = "ISOSAEReserved action for routine ID"
+        if control_type == services.RoutineControl.ControlType.startRoutine:
+            action = "Starting routine ID"
+        elif control_type == services.RoutineControl.ControlType.stopRoutine:
+            action = "Stoping routine ID"
+        elif control_type == services.RoutineControl.ControlType.requestRoutineResults:
+            action = "Requesting result for routine ID"
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s - ControlType=0x%02x - %s 0x%04x (%s) with a payload of %d bytes" %
+                             (self.service_log_prefix(services.RoutineControl), control_type, action, routine_id, Routine.name_from_id(routine_id), payload_length))
+        if data is not None and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("\tPayload data : %s" % binascii.hexlify(data).decode('ascii'))
+
+        response = await self.send_request(request)
+        if response is None:
+            return None
+        response = services.RoutineControl.interpret_response(response)
+
+        if control_type != response.service_data.control_type_echo:
+            raise UnexpectedResponseException(response, "Control type of response (0x%02x) does not match request control type (0x%02x)" % (
+                response.service_data.control_type_echo, control_type))
+
+        if routine_id != response.service_data.routine_id_echo:
+            raise UnexpectedResponseException(response, "Response received from server (ID = 0x%04x) does not match the requested routine ID (0x%04x)" % (
+                response.service_data.routine_id_echo, routine_id))
+
+        return response
+
+    async def send_request(self, request: Request, timeout: int = -1) -> Optional[Response]:
+        """Sends a request and waits for its response. Same as :meth:`Client.send_request<udsoncan.client.Client.send_request>`"""
+        async with self._request_lock:
+            return await self._send_request(request, timeout)
+
+    async def _send_request(self, request: Request, timeout: int = -1) -> Optional[Response]:
+        if request.service is None:
+            raise ValueError("Request has no service")
+
+        if timeout < 0:
+            # Timeout not provided by user: defaults to Client request_timeout value
+            overall_timeout = self.config['request_timeout']
+            p2 = self.config['p2_timeout'] if self.session_timing.p2_server_max is None else self.session_timing.p2_server_max
+            if overall_timeout is not None:
+                single_request_timeout = min(overall_timeout, p2)
+            else:
+                single_request_timeout = p2
+        else:
+            overall_timeout = timeout
+            single_request_timeout = timeout
+        respect_overall_timeout = overall_timeout is not None
+        using_p2_star = False  # Will switch to true when Nrc 0x78 will be received the first time.
+
+        self.conn.empty_rxqueue()
+        self.logger.debug("Sending request to server")
+        override_suppress_positive_response = False
+        if self.suppress_positive_response.enabled == True and request.service.use_subfunction():
+            payload = request.get_payload(suppress_positive_response=True)
+            override_suppress_positive_response = True
+        else:
+            payload = request.get_payload()
+
+        if self.payload_override.enabled:
+            payload = self.payload_override.get_overrided_payload(payload)
+
+        if self.suppress_positive_response.enabled and not request.service.use_subfunction():
+            self.logger.warning('SuppressPositiveResponse cannot be used for service %s. Ignoring' % (request.service.get_name()))
+
+        await self.conn.send(payload)
+
+        spr_used = request.suppress_positive_response or override_suppress_positive_response
+        wait_nrc = self.suppress_positive_response.enabled and self.suppress_positive_response.wait_nrc
+
+        if spr_used and not wait_nrc:
+            return None
+
+        done_receiving = False
+        if respect_overall_timeout:
+            overall_timeout_time = time.monotonic() + overall_timeout
+
+        while not done_receiving:
+            done_receiving = True
+            self.logger.debug("Waiting for server response")
+
+            if not respect_overall_timeout or time.monotonic() + single_request_timeout < overall_timeout_time:
+                timeout_type_used = 'single_request'
+                timeout_value = single_request_timeout
+            else:
+                timeout_type_used = 'overall'
+                timeout_value = max(overall_timeout_time - time.monotonic(), 0)
+
+            try:
+                recv_payload = await self._wait_response_frame(timeout_value)
+            except TimeoutException:
+                recv_payload = None
+
+            if recv_payload is None:
+                if spr_used:
+                    return None
+                if timeout_type_used == 'single_request':
+                    timeout_name_to_report = 'P2* timeout' if using_p2_star else 'P2 timeout'
+                    timeout_value_to_report = single_request_timeout
+                else:
+                    timeout_name_to_report = 'Global request timeout'
+                    timeout_value_to_report = overall_timeout
+
+                raise TimeoutException('Did not receive response in time. %s time has expired (timeout=%.3f sec)' %
+                                       (timeout_name_to_report, float(timeout_value_to_report)))
+
+            response = self._handle_response(request, recv_payload)
+            if not response.positive:  # Response pending
+                done_receiving = False
+                if not using_p2_star:
+                    # Received a 0x78 NRC: timeout is now set to P2*
+                    single_request_timeout = self._p2_star_timeout()
+                    using_p2_star = True
+                    self.logger.debug("Server requested to wait with response code %s (0x%02x), single request timeout is now set to P2* (%.3f seconds)" %
+                                      (response.code_name, response.code, single_request_timeout))
+
+        if spr_used:
+            return None
+
+        return response
+
+    async def _wait_response_frame(self, timeout: Optional[float]) -> Optional[bytes]:
+        """Waits for the next frame that is not a periodic data message. Same as :meth:`Client._wait_response_frame<udsoncan.client.Client._wait_response_frame>`"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            payload = await self.conn.wait_frame(timeout=timeout, exception=True)
+            if payload is None or not services.ReadDataByPeriodicIdentifier.is_periodic_data(payload):
+                return payload
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug('Ignoring periodic data received while waiting for a response : %s' % binascii.hexlify(payload).decode('ascii'))
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
@@ -1,7 +1,7 @@
 from udsoncan import Request, Response, services
 from udsoncan.common.Routine import Routine
 from udsoncan.common.dtc import Dtc
-from udsoncan.common.dids import DataIdentifier
+from udsoncan.common.dids import DataIdentifier, CompiledDidConfig
 from udsoncan.common.MemoryLocation import MemoryLocation
 from udsoncan.common.DynamicDidDefinition import DynamicDidDefinition
 from udsoncan.common.CommunicationType import CommunicationType
@@ -20,7 +20,7 @@ import binascii
 import functools
 import time
 
-from typing import Callable, Optional, Union, Dict, List, Any, cast, Type
+from typing import Callable, Optional, Union, Dict, List, Any, cast, Type, Iterator, Tuple
 
 
 class SessionTiming:
@@ -106,6 +106,7 @@ class Client:
     payload_override: "Client.PayloadOverrider"
     last_response: Optional[Response]
     session_timing: SessionTiming
+    compiled_data_identifiers: Optional[CompiledDidConfig]
     logger: logging.Logger
 
     def __init__(self, conn: BaseConnection, config: ClientConfig = default_client_config, request_timeout: Optional[float] = None):
@@ -158,6 +159,9 @@ class Client:
             if k not in self.config:
                 self.config[k] = default_client_config[k]  # type:ignore
         self.validate_config()
+        # DID codecs are compiled once per configuration. Changes made in place to config['data_identifiers'] are not seen until the next set_config
+        didconfig = self.config['data_identifiers']
+        self.compiled_data_identifiers = CompiledDidConfig(didconfig) if isinstance(didconfig, dict) else None
 
     def validate_config(self) -> None:
         if self.config['standard_version'] not in [2006, 2013, 2020]:
@@ -397,7 +401,8 @@ class Client:
         req = services.TesterPresent.make_request()
         assert req.subfunction is not None
 
-        self.logger.info('%s - Sending TesterPresent request' % (self.service_log_prefix(services.TesterPresent)))
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info('%s - Sending TesterPresent request' % (self.service_log_prefix(services.TesterPresent)))
         response = self.send_request(req)
         if response is None:
             return None
@@ -468,14 +473,15 @@ class Client:
         :rtype: :ref:`Response<Response>`
         """
         didlist = services.ReadDataByIdentifier.validate_didlist_input(didlist)
-        req = services.ReadDataByIdentifier.make_request(didlist=didlist, didconfig=self.config['data_identifiers'])
+        req = services.ReadDataByIdentifier.make_request(didlist=didlist, didconfig=self.compiled_data_identifiers)
 
-        if len(didlist) == 1:
-            self.logger.info("%s - Reading data identifier : 0x%04x (%s)" %
-                             (self.service_log_prefix(services.ReadDataByIdentifier), didlist[0], DataIdentifier.name_from_id(didlist[0])))
-        else:
-            self.logger.info("%s - Reading %d data identifier : %s" %
-                             (self.service_log_prefix(services.ReadDataByIdentifier), len(didlist), list(map(hex, didlist))))
+        if self.logger.isEnabledFor(logging.INFO):
+            if len(didlist) == 1:
+                self.logger.info("%s - Reading data identifier : 0x%04x (%s)" %
+                                 (self.service_log_prefix(services.ReadDataByIdentifier), didlist[0], DataIdentifier.name_from_id(didlist[0])))
+            else:
+                self.logger.info("%s - Reading %d data identifier : %s" %
+                                 (self.service_log_prefix(services.ReadDataByIdentifier), len(didlist), list(map(hex, didlist))))
 
         if 'data_identifiers' not in self.config or not isinstance(self.config['data_identifiers'], dict):
             raise ConfigError('Configuration does not contains a valid data identifier description.')
@@ -487,7 +493,7 @@ class Client:
         try:
             response = services.ReadDataByIdentifier.interpret_response(response,
                                                                         didlist=didlist,
-                                                                        didconfig=self.config['data_identifiers'],
+                                                                        didconfig=self.compiled_data_identifiers,
                                                                         tolerate_zero_padding=self.config['tolerate_zero_padding']
                                                                         )
         except ConfigError as e:
@@ -512,6 +518,81 @@ class Client:
 
         return response
 
+    @standard_error_management
+    def read_data_by_periodic_identifier(self, transmission_mode: int, didlist: Optional[Union[int, List[int]]] = None) -> Optional[services.ReadDataByPeriodicIdentifier.InterpretedResponse]:
+        """
+        Starts or stops the periodic transmission of data identifiers through the :ref:`ReadDataByPeriodicIdentifier<ReadDataByPeriodicIdentifier>` service.
+        Once started, the values are pushed by the server and can be read with :meth:`periodic_data<udsoncan.client.Client.periodic_data>`
+
+        :Effective configuration: ``exception_on_<type>_response``
+
+        :param transmission_mode: The transmission rate or ``stopSending``. See :class:`ReadDataByPeriodicIdentifier.TransmissionMode<udsoncan.services.ReadDataByPeriodicIdentifier.TransmissionMode>`
+        :type transmission_mode: int
+
+        :param didlist: The periodic data identifiers (0xF2xx or their low byte). May be empty with ``stopSending`` to stop all of them.
+        :type didlist: list[int]
+
+        :return: The server response parsed by :meth:`ReadDataByPeriodicIdentifier.interpret_response<udsoncan.services.ReadDataByPeriodicIdentifier.interpret_response>`
+        :rtype: :ref:`Response<Response>`
+        """
+        req = services.ReadDataByPeriodicIdentifier.make_request(transmission_mode, didlist)
+        assert req.data is not None
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info('%s - TransmissionMode=0x%02x (%s) for periodic identifiers : %s' % (self.service_log_prefix(services.ReadDataByPeriodicIdentifier),
+                             transmission_mode, services.ReadDataByPeriodicIdentifier.TransmissionMode.get_name(transmission_mode), list(map(hex, req.data[1:]))))
+
+        response = self.send_request(req)
+        if response is None:
+            return None
+
+        return services.ReadDataByPeriodicIdentifier.interpret_response(response)
+
+    def start_periodic_read(self, didlist: Union[int, List[int]], transmission_mode: int = services.ReadDataByPeriodicIdentifier.TransmissionMode.sendAtFastRate) -> Optional[services.ReadDataByPeriodicIdentifier.InterpretedResponse]:
+        """
+        Shortcut to ask the server to start pushing the given periodic data identifiers at the given rate.
+        """
+        return self.read_data_by_periodic_identifier(transmission_mode, didlist)
+
+    def stop_periodic_read(self, didlist: Optional[Union[int, List[int]]] = None) -> Optional[services.ReadDataByPeriodicIdentifier.InterpretedResponse]:
+        """
+        Shortcut to stop the transmission of the given periodic data identifiers, or all of them when ``didlist`` is ``None``.
+        """
+        return self.read_data_by_periodic_identifier(services.ReadDataByPeriodicIdentifier.TransmissionMode.stopSending, didlist)
+
+    def periodic_data(self, timeout: Optional[float] = None, with_sid: bool = True) -> Iterator[Tuple[int, Any]]:
+        """
+        Generator yielding the periodic data pushed by the server after :meth:`start_periodic_read<udsoncan.client.Client.start_periodic_read>`.
+        Values are decoded with the codec of DID 0xF2xx found in the ``data_identifiers`` configuration.
+        Received frames that are not periodic data messages are skipped.
+
+        No other request may be sent on the same connection while iterating.
+
+        :Effective configuration: ``data_identifiers``
+
+        :param timeout: Maximum time to wait for each frame. The generator ends when no frame is received in time. ``None`` waits forever.
+        :type timeout: float
+
+        :param with_sid: ``True`` when periodic messages start with the 0x6A response ID, ``False`` when they start with the periodicDataIdentifier
+        :type with_sid: bool
+
+        :return: Tuples of (DID, decoded value)
+        """
+        while True:
+            try:
+                payload = self.conn.wait_frame(timeout=timeout, exception=True)
+            except TimeoutException:
+                return
+            if payload is None:
+                return
+
+            if with_sid and not services.ReadDataByPeriodicIdentifier.is_periodic_data(payload):
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug('Ignoring frame that is not periodic data : %s' % binascii.hexlify(payload).decode('ascii'))
+                continue
+
+            yield services.ReadDataByPeriodicIdentifier.interpret_periodic_data(payload, self.config['data_identifiers'], with_sid=with_sid)
+
     # Performs a WriteDataByIdentifier request.
 
     @standard_error_management
@@ -532,8 +613,9 @@ class Client:
 
         """
         req = services.WriteDataByIdentifier.make_request(did, value, didconfig=self.config['data_identifiers'])
-        self.logger.info("%s - Writing data identifier 0x%04x (%s)" %
-                         (self.service_log_prefix(services.WriteDataByIdentifier), did, DataIdentifier.name_from_id(did)))
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s - Writing data identifier 0x%04x (%s)" %
+                             (self.service_log_prefix(services.WriteDataByIdentifier), did, DataIdentifier.name_from_id(did)))
 
         response = self.send_request(req)
         if response is None:
@@ -707,9 +789,10 @@ class Client:
         elif control_type == services.RoutineControl.ControlType.requestRoutineResults:
             action = "Requesting result for routine ID"
 
-        self.logger.info("%s - ControlType=0x%02x - %s 0x%04x (%s) with a payload of %d bytes" %
-                         (self.service_log_prefix(services.RoutineControl), control_type, action, routine_id, Routine.name_from_id(routine_id), payload_length))
-        if data is not None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s - ControlType=0x%02x - %s 0x%04x (%s) with a payload of %d bytes" %
+                             (self.service_log_prefix(services.RoutineControl), control_type, action, routine_id, Routine.name_from_id(routine_id), payload_length))
+        if data is not None and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug("\tPayload data : %s" % binascii.hexlify(data).decode('ascii'))
 
         response = self.send_request(request)
@@ -977,17 +1060,18 @@ class Client:
         :type sequence_number: int
 
         :param data: Optional additional data to send to the server
-        :type data: bytes
+        :type data: bytes, bytearray or memoryview
 
         :return: The server response parsed by :meth:`TransferData.interpret_response<udsoncan.services.TransferData.interpret_response>`
         :rtype: :ref:`Response<Response>`
         """
         request = services.TransferData.make_request(sequence_number, data)
 
-        data_len = 0 if data is None else len(data)
-        self.logger.info('%s - Sending a block of data with SequenceNumber=%d that is %d bytes long .' %
-                         (self.service_log_prefix(services.TransferData), sequence_number, data_len))
-        if data is not None:
+        if self.logger.isEnabledFor(logging.INFO):
+            data_len = 0 if data is None else len(data)
+            self.logger.info('%s - Sending a block of data with SequenceNumber=%d that is %d bytes long .' %
+                             (self.service_log_prefix(services.TransferData), sequence_number, data_len))
+        if data is not None and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug('Data to transfer : %s' % binascii.hexlify(data).decode('ascii'))
 
         response = self.send_request(request)
@@ -1291,7 +1375,7 @@ class Client:
         Reads all the Diagnostic Trouble Codes that have a status matching the given mask. 
         The server will check all of its DTCs and if (Dtc.status & status_mask) != 0, then the DTCs match the filter and are sent back to the client.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :param status_mask: The status mask against which the DTCs are tested. 
         :type status_mask: int or :ref:`Dtc.Status<DTC_Status>`
@@ -1311,7 +1395,7 @@ class Client:
 
         Introduced in 2020 version of ISO-14229
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``standard_version``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``standard_version`` ``compact_dtc_records``
 
         :param status_mask: The status mask against which the DTCs are tested. 
         :type status_mask: int or :ref:`Dtc.Status<DTC_Status>`
@@ -1331,7 +1415,7 @@ class Client:
         Reads the emission-related Diagnostic Trouble Codes that have a status matching the given mask.
         The server will check its emission-related DTCs and if (Dtc.status & status_mask) != 0, then the DTCs match the filter and are sent back to the client.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :param status_mask: The status mask against which the DTCs are tested. 
         :type status_mask: int or :ref:`Dtc.Status<DTC_Status>`
@@ -1348,7 +1432,7 @@ class Client:
         Reads all the Diagnostic Trouble Codes stored in mirror memory that have a status matching the given mask. 
         The server will check all of its DTCs and if (Dtc.status & status_mask) != 0, then the DTCs match the filter and are sent back to the client.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :param status_mask: The status mask against which the DTCs are tested. 
         :type status_mask: int or :ref:`Dtc.Status<DTC_Status>`
@@ -1365,7 +1449,7 @@ class Client:
         Reads all the Diagnostic Trouble Codes that have a status and a severity matching the given masks. 
         The server will check all of its DTCs and if ( (Dtc.status & status_mask) != 0 && (Dtc.severity & severity) !=0), then the DTCs match the filter and are sent back to the client.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :param status_mask: The status mask against which the DTCs are tested. 
         :type status_mask: int or :ref:`Dtc.Status<DTC_Status>`
@@ -1391,7 +1475,7 @@ class Client:
         The server will check all of its DTCs and if ( (Dtc.status & status_mask) != 0 && (Dtc.severity & severity) !=0), then the DTCs match the filter and are sent back to the client.
         Note: severity_mask and dtc_class are combined into a single byte to populate DTCSeverityMask- see Table D.11.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :param functional_group_id: Functional Group ID to search for (FGID) (0x00 to 0xFE) :ref:`Dtc.FunctionalGroupIdentifiers<DTC_FunctionalGroupIdentifiers>` 
         :type functional_group_id: int
@@ -1417,7 +1501,7 @@ class Client:
 
         Reads all the WWH OBD Diagnostic Trouble Codes that have the specified functional_group and a permanent status. 
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :param functional_group_id: Functional Group ID to search for (FGID) (0x00 to 0xFE) :ref:`Dtc.FunctionalGroupIdentifiers<DTC_FunctionalGroupIdentifiers>` 
         :type functional_group_id: int
@@ -1502,7 +1586,7 @@ class Client:
 
         Requests the server for a specific DTC severity level.
 
-        :Effective configuration: ``exception_on_<type>_response``
+        :Effective configuration: ``exception_on_<type>_response`` ``compact_dtc_records``
 
         :param dtc: The DTC ID for which we request the severity. It can be a 3-byte integer or a DTC instance with an ID set.
         :type dtc: int or :ref:`Dtc<DTC>`
@@ -1518,7 +1602,7 @@ class Client:
 
         Requests the list of supported DTCs by the server.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :return: The server response parsed by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
         :rtype: :ref:`Response<Response>`
@@ -1531,7 +1615,7 @@ class Client:
 
         Reads a single DTC. Requests the server for the first DTC that set its ``Dtc.Status.test_failed`` bit.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :return: The server response parsed by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
         :rtype: :ref:`Response<Response>`
@@ -1544,7 +1628,7 @@ class Client:
 
         Reads a single DTC. Requests the server for the first DTC that set its ``Dtc.Status.confirmed`` bit.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :return: The server response parsed by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
         :rtype: :ref:`Response<Response>`
@@ -1557,7 +1641,7 @@ class Client:
 
         Reads a single DTC. Requests the server for the last DTC that set its ``Dtc.Status.test_failed`` bit.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :return: The server response parsed by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
         :rtype: :ref:`Response<Response>`
@@ -1570,7 +1654,7 @@ class Client:
 
         Reads a single DTC. Requests the server for the last DTC that set its ``Dtc.Status.confirmed`` bit.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :return: The server response parsed by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
         :rtype: :ref:`Response<Response>`
@@ -1585,7 +1669,7 @@ class Client:
 
         A permanent DTC is a DTC stored in Non-Volatile memory and that cannot be erased by test equipment or by power-cycling the ECU.
 
-        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc``
+        :Effective configuration: ``exception_on_<type>_response`` ``tolerate_zero_padding`` ``ignore_all_zero_dtc`` ``compact_dtc_records``
 
         :return: The server response parsed by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
         :rtype: :ref:`Response<Response>`
@@ -1843,7 +1927,8 @@ class Client:
                                                                       dtc_snapshot_did_size=self.config['dtc_snapshot_did_size'],
                                                                       didconfig=self.config['data_identifiers'] if 'data_identifiers' in self.config else None,
                                                                       extended_data_size=extended_data_size2,
-                                                                      standard_version=self.config['standard_version'])
+                                                                      standard_version=self.config['standard_version'],
+                                                                      compact_dtc_records=self.config.get('compact_dtc_records', False))
         except Exception as e:
             error = e
 
@@ -2272,7 +2357,7 @@ class Client:
                 timeout_value = max(overall_timeout_time - time.monotonic(), 0)
 
             try:
-                recv_payload = self.conn.wait_frame(timeout=timeout_value, exception=True)
+                recv_payload = self._wait_response_frame(timeout_value)
             except TimeoutException:
                 timed_out = True
             except Exception as e:
@@ -2294,61 +2379,95 @@ class Client:
                 raise TimeoutException('Did not receive response in time. %s time has expired (timeout=%.3f sec)' %
                                        (timeout_name_to_report, float(timeout_value_to_report)))
 
-            response = Response.from_payload(recv_payload)
-            self.last_response = response
-            self.logger.debug("Received response from server")
-
-            if not response.valid:
-                raise InvalidResponseException(response)
-
-            assert response.service is not None
-            assert response.code is not None
-
-            if response.service.response_id() != request.service.response_id():
-                msg = "Response gotten from server has a service ID different than the request service ID. Received=0x%02x, Expected=0x%02x" % (
-                    response.service.response_id(), request.service.response_id())
-                raise UnexpectedResponseException(response, msg)
-
-            if not response.positive:
-                try:
-                    if not Response.Code.is_supported_by_standard(response.code, self.config['standard_version']):
-                        self.logger.warning('Given response code "%s" (0x%02x) is not supported byt the UDS standard version that the clients s enforcing (%s)' % (
-                            response.code_name,
-                            response.code,
-                            self.config['standard_version']))
-                except ValueError:
-                    self.logger.warning('Unkown response code "%s" (0x%02x)', response.code_name, response.code)
-
-                if not request.service.is_supported_negative_response(response.code):
-                    self.logger.warning('Given response code "%s" (0x%02x) is not a supported negative response code according to UDS standard.' % (
-                        response.code_name, response.code))
-
-                if response.code == Response.Code.RequestCorrectlyReceived_ResponsePending:
-                    if self.config['nrc78_callback'] is not None:
-                        self.config['nrc78_callback']()
-                    
-                    done_receiving = False
-                    if not using_p2_star:
-                        # Received a 0x78 NRC: timeout is now set to P2*
-                        p2_star = self.config['p2_star_timeout'] if self.session_timing.p2_star_server_max is None else self.session_timing.p2_star_server_max
-                        single_request_timeout = p2_star
-                        using_p2_star = True
-                        self.logger.debug("Server requested to wait with response code %s (0x%02x), single request timeout is now set to P2* (%.3f seconds)" %
-                                          (response.code_name, response.code, single_request_timeout))
-                else:
-                    raise NegativeResponseException(response)
+            response = self._handle_response(request, recv_payload)
+            if not response.positive:  # Response pending
+                done_receiving = False
+                if not using_p2_star:
+                    # Received a 0x78 NRC: timeout is now set to P2*
+                    single_request_timeout = self._p2_star_timeout()
+                    using_p2_star = True
+                    self.logger.debug("Server requested to wait with response code %s (0x%02x), single request timeout is now set to P2* (%.3f seconds)" %
+                                      (response.code_name, response.code, single_request_timeout))
+
+        if spr_used:
+            return None
+
+        return response
+
+    def _handle_response(self, request: Request, payload: bytes) -> Response:
+        """
+        Parses and validates a response frame of a request. Shared with the :class:`AsyncClient<udsoncan.async_client.AsyncClient>`.
+
+        :return: The positive response, or the negative response with code RequestCorrectlyReceived_ResponsePending (0x78),
+            after calling the ``nrc78_callback``, when the server asks to wait for the actual response.
+        :raises InvalidResponseException: If the response is not valid
+        :raises UnexpectedResponseException: If the response is not for the request service
+        :raises NegativeResponseException: If the response is any other negative response
+        """
+        assert request.service is not None
+        response = Response.from_payload(payload)
+        self.last_response = response
+        self.logger.debug("Received response from server")
+
+        if not response.valid:
+            raise InvalidResponseException(response)
 
         assert response.service is not None
-        self.logger.info('Received positive response for service %s (0x%02x) from server.' %
-                         (response.service.get_name(), response.service.request_id()))
+        assert response.code is not None
 
-        response.original_request = request
+        if response.service.response_id() != request.service.response_id():
+            msg = "Response gotten from server has a service ID different than the request service ID. Received=0x%02x, Expected=0x%02x" % (
+                response.service.response_id(), request.service.response_id())
+            raise UnexpectedResponseException(response, msg)
 
-        if spr_used:
-            return None
+        if not response.positive:
+            try:
+                if not Response.Code.is_supported_by_standard(response.code, self.config['standard_version']):
+                    self.logger.warning('Given response code "%s" (0x%02x) is not supported by the UDS standard version that the client is enforcing (%s)' % (
+                        response.code_name,
+                        response.code,
+                        self.config['standard_version']))
+            except ValueError:
+                self.logger.warning('Unknown response code "%s" (0x%02x)', response.code_name, response.code)
+
+            if not request.service.is_supported_negative_response(response.code):
+                self.logger.warning('Given response code "%s" (0x%02x) is not a supported negative response code according to UDS standard.' % (
+                    response.code_name, response.code))
+
+            if response.code != Response.Code.RequestCorrectlyReceived_ResponsePending:
+                raise NegativeResponseException(response)
+
+            if self.config['nrc78_callback'] is not None:
+                self.config['nrc78_callback']()
+            return response
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info('Received positive response for service %s (0x%02x) from server.' %
+                             (response.service.get_name(), response.service.request_id()))
 
+        response.original_request = request
         return response
 
+    def _p2_star_timeout(self) -> float:
+        """The P2* timeout, as given by the server if known, else by the configuration"""
+        return self.config['p2_star_timeout'] if self.session_timing.p2_star_server_max is None else self.session_timing.p2_star_server_max
+
+    def _wait_response_frame(self, timeout: Optional[float]) -> Optional[bytes]:
+        """
+        Waits for the next frame that is not a periodic data message. Periodic data pushed by the server after a
+        :ref:`ReadDataByPeriodicIdentifier<ReadDataByPeriodicIdentifier>` request shares its response ID with the 0x6A positive response,
+        which has no data, and can arrive at any time. Such frames are dropped, within the same timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            payload = self.conn.wait_frame(timeout=timeout, exception=True)
+            if payload is None or not services.ReadDataByPeriodicIdentifier.is_periodic_data(payload):
+                return payload
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug('Ignoring periodic data received while waiting for a response : %s' % binascii.hexlify(payload).decode('ascii'))
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+
     # ====  Authentication Service Client Functions
     def deauthenticate(self) -> Optional[services.Authentication.InterpretedResponse]:
         """
@@ -3,16 +3,19 @@ __all__ = [
     'CodecDefinition',
     'check_did_config',
     'fetch_codec_definition_from_config',
-    'make_did_codec_from_definition'
+    'make_did_codec_from_definition',
+    'CompiledDidCodec',
+    'CompiledDidConfig'
 ]
 
 import inspect
+import struct
 from copy import deepcopy
 from udsoncan.exceptions import ConfigError
 from udsoncan.typing import CodecDefinition, DIDConfig, IOConfigEntry
 from udsoncan.common.DidCodec import DidCodec
 
-from typing import Dict, List, Union, Optional, cast
+from typing import Any, Callable, Dict, List, Union, Optional, cast
 
 
 class DataIdentifier:
@@ -219,3 +222,76 @@ def make_did_codec_from_definition(didconfig: Union[CodecDefinition, IOConfigEnt
         return DidCodec(packstr=didconfig)
 
     raise ValueError('Given codec of type %s is not a valid DidCodec' % (type(didconfig)))
+
+
+class CompiledDidCodec:
+    """
+    A DID codec resolved once from its configuration definition.
+
+    :param codec: The codec instance
+    :type codec: :ref:`DidCodec<DidCodec>`
+
+    .. data:: length
+
+        Payload length of the DID, or ``None`` if the codec reads all the remaining data
+
+    .. data:: decode
+
+        Function decoding a payload. For plain pack string codecs, it is the ``unpack`` method of a precompiled ``struct.Struct``
+    """
+
+    codec: DidCodec
+    length: Optional[int]
+    decode: Callable[[bytes], Any]
+
+    def __init__(self, codec: DidCodec):
+        self.codec = codec
+        if type(codec) is DidCodec and codec.packstr is not None:
+            compiled = struct.Struct(codec.packstr)
+            self.length = compiled.size
+            self.decode = compiled.unpack
+        else:
+            try:
+                self.length = len(codec)
+            except DidCodec.ReadAllRemainingData:
+                self.length = None
+            self.decode = codec.decode
+
+
+class CompiledDidConfig:
+    """
+    Registry of :class:`CompiledDidCodec<udsoncan.CompiledDidCodec>` for a data identifier configuration.
+    Each codec is compiled the first time its DID is used, then reused for every following request.
+
+    The registry does not follow changes made to the configuration dictionary after a DID was compiled.
+    The client builds a new registry when its configuration is set with :meth:`Client.set_config<udsoncan.client.Client.set_config>`.
+
+    :param didconfig: Definition of DID codecs. Dictionary mapping a DID (int) to a valid :ref:`DidCodec<DidCodec>` class or pack/unpack string
+    :type didconfig: dict[int] = :ref:`DidCodec<DidCodec>`
+    """
+
+    didconfig: DIDConfig
+
+    def __init__(self, didconfig: Dict):
+        if 'data_identifiers' in didconfig:
+            didconfig = didconfig['data_identifiers']
+        self.didconfig = cast(DIDConfig, didconfig)
+        self._codecs: Dict[int, CompiledDidCodec] = {}
+
+    def __contains__(self, did: int) -> bool:
+        return did in self.didconfig
+
+    def get(self, did: int) -> CompiledDidCodec:
+        """
+        Returns the compiled codec of a DID, falling back on the ``default`` codec
+
+        :raises ConfigError: If the configuration contains no definition for the DID and no default
+        :raises ValueError: If the codec definition is not valid
+        """
+        try:
+            return self._codecs[did]
+        except KeyError:
+            pass
+        codec = CompiledDidCodec(make_did_codec_from_definition(fetch_codec_definition_from_config(did, self.didconfig)))
+        self._codecs[did] = codec
+        return codec
@@ -1,9 +1,12 @@
-__all__ = ['Dtc']
+__all__ = ['Dtc', 'CompactDtcList']
 
 import struct
 import inspect
+import sys
+from array import array
+from collections.abc import Sequence
 
-from typing import Optional, List, Any, Union
+from typing import Optional, List, Any, Union, overload
 
 
 class Dtc:
@@ -328,3 +331,109 @@ class Dtc:
             (self.id >> 8) & 0xFFF,
             (self.id) & 0xFF
         )
+
+
+class CompactDtcList(Sequence):
+    """
+    DTC records kept as parallel columns, as decoded by :meth:`ReadDTCInformation.interpret_response<udsoncan.services.ReadDTCInformation.interpret_response>`
+    when ``compact_dtc_records`` is set. It is a sequence of :ref:`Dtc<DTC>`: each instance is only built when it is accessed.
+
+    :param ids: The 3-byte DTC IDs
+    :type ids: array('I')
+
+    :param statuses: The status byte of each DTC
+    :type statuses: bytes
+
+    :param severities: The severity byte of each DTC, if the records have one
+    :type severities: bytes or None
+
+    :param functional_units: The functional unit byte of each DTC, if the records have one
+    :type functional_units: bytes or None
+    """
+
+    ids: "array[int]"
+    statuses: bytes
+    severities: Optional[bytes]
+    functional_units: Optional[bytes]
+
+    def __init__(self, ids: "array[int]", statuses: bytes, severities: Optional[bytes] = None, functional_units: Optional[bytes] = None):
+        self.ids = ids
+        self.statuses = statuses
+        self.severities = severities
+        self.functional_units = functional_units
+        self._dtcs: Optional[List[Optional[Dtc]]] = None
+
+    @classmethod
+    def from_records(cls, data: bytes, record_size: int, id_offset: int, status_offset: int,
+                     severity_offset: Optional[int] = None, functional_unit_offset: Optional[int] = None,
+                     ignore_all_zero_dtc: bool = True) -> "CompactDtcList":
+        """
+        Splits fixed-size DTC records into columns, using slices instead of a loop over the records.
+
+        :param data: The records. Its length must be a multiple of ``record_size``
+        :param record_size: Number of bytes of each record
+        :param id_offset: Offset of the 3-byte DTC ID in a record
+        :param status_offset: Offset of the status byte in a record
+        :param severity_offset: Offset of the severity byte in a record, if any
+        :param functional_unit_offset: Offset of the functional unit byte in a record, if any
+        :param ignore_all_zero_dtc: Discard the records made only of zeros
+        """
+        count = len(data) // record_size
+        id_bytes = bytearray(count * 4)     # Big-endian 4-byte IDs
+        for i in range(3):
+            id_bytes[i + 1::4] = data[id_offset + i::record_size]
+        ids = array('I')
+        if ids.itemsize != 4:
+            ids = array('L')
+        ids.frombytes(bytes(id_bytes))
+        if sys.byteorder == 'little':
+            ids.byteswap()
+
+        statuses = data[status_offset::record_size]
+        severities = data[severity_offset::record_size] if severity_offset is not None else None
+        functional_units = data[functional_unit_offset::record_size] if functional_unit_offset is not None else None
+
+        if ignore_all_zero_dtc and 0 in ids:
+            zero_record = b'\x00' * record_size
+            keep = [i for i in range(count) if data[i * record_size:(i + 1) * record_size] != zero_record]
+            if len(keep) != count:
+                ids = array(ids.typecode, (ids[i] for i in keep))
+                statuses = bytes(statuses[i] for i in keep)
+                severities = bytes(severities[i] for i in keep) if severities is not None else None
+                functional_units = bytes(functional_units[i] for i in keep) if functional_units is not None else None
+
+        return cls(ids, bytes(statuses),
+                   bytes(severities) if severities is not None else None,
+                   bytes(functional_units) if functional_units is not None else None)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, index: int) -> Dtc: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dtc]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('DTC index out of range')
+        if self._dtcs is None:
+            self._dtcs = [None] * len(self)
+        dtc = self._dtcs[index]
+        if dtc is None:
+            dtc = Dtc(self.ids[index])
+            dtc.status.set_byte(self.statuses[index])
+            if self.severities is not None:
+                dtc.severity.set_byte(self.severities[index])
+            if self.functional_units is not None:
+                dtc.functional_unit = self.functional_units[index]
+            self._dtcs[index] = dtc
+        return dtc
+
+    def __repr__(self) -> str:
+        return '<CompactDtcList of %d DTCs at 0x%08x>' % (len(self), id(self))
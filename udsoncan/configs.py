@@ -10,6 +10,7 @@ default_client_config: ClientConfig = cast(ClientConfig, {
     'security_algo_params': None,
     'tolerate_zero_padding': True,
     'ignore_all_zero_dtc': True,
+    'compact_dtc_records': False,	# DTC lists decoded as a CompactDtcList, see ReadDTCInformation.interpret_response
     'dtc_snapshot_did_size': 2,		# Not specified in standard. 2 bytes matches other services format.
     'server_address_format': None,		# 8,16,24,32,40
     'server_memorysize_format': None,		# 8,16,24,32,40
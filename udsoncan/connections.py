@@ -72,7 +72,8 @@ class BaseConnection(ABC):
         else:
             payload = data
 
-        self.logger.debug('Sending %d bytes : [%s]' % (len(payload), binascii.hexlify(payload).decode('ascii')))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Sending %d bytes : [%s]' % (len(payload), binascii.hexlify(payload).decode('ascii')))
 
         # backward compatibility
         if 'timeout' in self.specific_send.__code__.co_varnames:
@@ -106,7 +107,7 @@ class BaseConnection(ABC):
             else:
                 frame = None
 
-        if frame is not None:
+        if frame is not None and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug('Received %d bytes : [%s]' % (len(frame), binascii.hexlify(frame).decode('ascii')))
         return frame
 
@@ -172,6 +173,112 @@ class BaseConnection(ABC):
         pass
 
 
+class AsyncBaseConnection(ABC):
+    """
+    Base class of the connections used by :class:`AsyncClient<udsoncan.async_client.AsyncClient>`.
+    Same as :class:`BaseConnection<udsoncan.connections.BaseConnection>`, with awaitable send and receive.
+    """
+
+    name: str
+    logger: logging.Logger
+
+    def __init__(self, name: Optional[str] = None):
+        if name is None:
+            self.name = 'Connection FoxtronPi'
+        else:
+            self.name = 'Connection[%s]' % (name)
+
+        self.logger = logging.getLogger(self.name)
+
+    async def send(self, data: Union[bytes, Request, Response], timeout: Optional[float] = None) -> None:
+        """Sends data to the underlying transport protocol
+
+        :param data: The data or object to send. If a Request or Response is given, the value returned by get_payload() will be sent.
+        :type data: bytes, Request, Response
+
+        :returns: None
+        """
+        if not self.is_open():
+            raise RuntimeError("Connection is not opened")
+
+        if isinstance(data, Request) or isinstance(data, Response):
+            payload = data.get_payload()
+        else:
+            payload = data
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Sending %d bytes : [%s]' % (len(payload), binascii.hexlify(payload).decode('ascii')))
+
+        await self.specific_send(payload, timeout=timeout)
+
+    async def wait_frame(self, timeout: Optional[float] = None, exception: bool = False) -> Optional[bytes]:
+        """Waits for the reception of a frame of data from the underlying transport protocol
+
+        :param timeout: The maximum amount of time to wait before giving up in seconds
+        :type timeout: float
+        :param exception: Boolean value indicating if this function may return exceptions.
+                When ``True``, all exceptions may be raised, including ``TimeoutException``
+                When ``False``, all exceptions will be logged as ``DEBUG`` and ``None`` will be returned.
+        :type exception: bool
+
+        :returns: Received data
+        :rtype: bytes or None
+        """
+        if not self.is_open():
+            raise RuntimeError("Connection is not opened")
+
+        try:
+            frame = await self.specific_wait_frame(timeout=timeout)
+        except Exception as e:
+            self.logger.debug('No data received: [%s] - %s ' % (e.__class__.__name__, str(e)))
+
+            if exception == True:
+                raise
+            else:
+                frame = None
+
+        if frame is not None and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Received %d bytes : [%s]' % (len(frame), binascii.hexlify(frame).decode('ascii')))
+        return frame
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self.close()
+
+    @abstractmethod
+    async def specific_send(self, payload: bytes, timeout: Optional[float] = None) -> None:
+        """The implementation of the send method."""
+        pass
+
+    @abstractmethod
+    async def specific_wait_frame(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """The implementation of the ``wait_frame`` method. Raises ``TimeoutException`` when no frame is received in time."""
+        pass
+
+    @abstractmethod
+    async def open(self) -> "AsyncBaseConnection":
+        """ Set up the connection object. """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """ Close the connection object """
+        pass
+
+    @abstractmethod
+    def empty_rxqueue(self) -> None:
+        """ Empty all unread data in the reception buffer. """
+        pass
+
+    @abstractmethod
+    def is_open(self) -> bool:
+        """ Tells if the connection is open. """
+        pass
+
+
 class SocketConnection(BaseConnection):
     """
     Sends and receives data through a socket.
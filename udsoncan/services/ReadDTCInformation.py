@@ -1,5 +1,5 @@
 import struct
-from udsoncan import Dtc, check_did_config, make_did_codec_from_definition, fetch_codec_definition_from_config, latest_standard, DIDConfig
+from udsoncan import Dtc, CompactDtcList, check_did_config, make_did_codec_from_definition, fetch_codec_definition_from_config, latest_standard, DIDConfig
 from udsoncan.Request import Request
 from udsoncan.Response import Response
 from udsoncan.exceptions import *
@@ -27,6 +27,7 @@ class ReadDTCInformation(BaseService):
         .. data:: dtcs
 
                 :ref:`DTC<DTC>` instances and their status read from the server.
+                A :class:`CompactDtcList<udsoncan.common.dtc.CompactDtcList>` when decoded with ``compact_dtc_records``.
 
         .. data:: dtc_count
 
@@ -51,7 +52,7 @@ class ReadDTCInformation(BaseService):
         """
 
         subfunction_echo: int
-        dtcs: List[Dtc]
+        dtcs: Union[List[Dtc], CompactDtcList]
         dtc_count: Optional[int]
         dtc_format: Optional[int]
         status_availability: Optional[Dtc.Status]
@@ -409,7 +410,8 @@ class ReadDTCInformation(BaseService):
                            ignore_all_zero_dtc: bool = True,
                            dtc_snapshot_did_size: int = 2,
                            didconfig: Optional[DIDConfig] = None,
-                           standard_version: int = latest_standard) -> InterpretedResponse:
+                           standard_version: int = latest_standard,
+                           compact_dtc_records: bool = False) -> InterpretedResponse:
         """
         Populates the response ``service_data`` property with an instance of :class:`ReadDTCInformation.ResponseData<udsoncan.services.ReadDTCInformation.ResponseData>`
 
@@ -435,6 +437,11 @@ class ReadDTCInformation(BaseService):
         :param didconfig: Definition of DID codecs. Dictionary mapping a DID (int) to a valid :ref:`DidCodec<DidCodec>` class or pack/unpack string 
         :type didconfig: dict[int] = :ref:`DidCodec<DidCodec>`
 
+        :param compact_dtc_records: Decode the DTC records of the DTC list subfunctions, including the WWH-OBD ones, into a
+                :class:`CompactDtcList<udsoncan.common.dtc.CompactDtcList>`, whose ``Dtc`` instances are only built when accessed.
+                Other subfunctions are not affected.
+        :type compact_dtc_records: bool
+
         :raises InvalidResponseException: If response length is wrong or does not match DID configuration
         :raises ValueError: If parameters are out of range, missing or wrong types
         :raises ConfigError: If the server returns a snapshot DID not defined in ``didconfig``
@@ -536,36 +543,54 @@ class ReadDTCInformation(BaseService):
             response.service_data.status_availability = Dtc.Status.from_byte(response.data[actual_byte])
             actual_byte += 1
 
-            while True:  # Loop until we have read all dtcs
-                if len(response.data) <= actual_byte:
-                    break  # done
-
-                elif len(response.data) < actual_byte + dtc_size:
-                    partial_dtc_length = len(response.data) - actual_byte
-                    if tolerate_zero_padding and response.data[actual_byte:] == b'\x00' * partial_dtc_length:
-                        break
-                    else:
-                        # We purposely ignore extra byte for subfunction reportSeverityInformationOfDTC as it is supposed to return 0 or 1 DTC.
-                        if subfunction != ReadDTCInformation.Subfunction.reportSeverityInformationOfDTC or actual_byte == 2:
-                            raise InvalidResponseException(
-                                response, 'Incomplete DTC record. Missing %d bytes to response to complete the record' % (dtc_size - partial_dtc_length))
+            if compact_dtc_records:
+                record_count = (len(response.data) - actual_byte) // dtc_size
+                records_end = actual_byte + record_count * dtc_size
+                partial_dtc_length = len(response.data) - records_end
+                if partial_dtc_length > 0 and not (tolerate_zero_padding and response.data[records_end:] == b'\x00' * partial_dtc_length):
+                    # Same rule as the record by record decoding below
+                    if subfunction != ReadDTCInformation.Subfunction.reportSeverityInformationOfDTC or records_end == 2:
+                        raise InvalidResponseException(
+                            response, 'Incomplete DTC record. Missing %d bytes to response to complete the record' % (dtc_size - partial_dtc_length))
 
+                if subfunction in response_subfn_dtc_availability_mask_plus_dtc_record:
+                    response.service_data.dtcs = CompactDtcList.from_records(response.data[actual_byte:records_end], dtc_size, id_offset=0, status_offset=3,
+                                                                             ignore_all_zero_dtc=ignore_all_zero_dtc)
                 else:
-                    dtc_bytes = response.data[actual_byte:actual_byte + dtc_size]
-                    if dtc_bytes == b'\x00' * dtc_size and ignore_all_zero_dtc:
-                        pass  # ignore
+                    response.service_data.dtcs = CompactDtcList.from_records(response.data[actual_byte:records_end], dtc_size, id_offset=2, status_offset=5,
+                                                                             severity_offset=0, functional_unit_offset=1,
+                                                                             ignore_all_zero_dtc=ignore_all_zero_dtc)
+            else:
+                while True:  # Loop until we have read all dtcs
+                    if len(response.data) <= actual_byte:
+                        break  # done
+
+                    elif len(response.data) < actual_byte + dtc_size:
+                        partial_dtc_length = len(response.data) - actual_byte
+                        if tolerate_zero_padding and response.data[actual_byte:] == b'\x00' * partial_dtc_length:
+                            break
+                        else:
+                            # We purposely ignore extra byte for subfunction reportSeverityInformationOfDTC as it is supposed to return 0 or 1 DTC.
+                            if subfunction != ReadDTCInformation.Subfunction.reportSeverityInformationOfDTC or actual_byte == 2:
+                                raise InvalidResponseException(
+                                    response, 'Incomplete DTC record. Missing %d bytes to response to complete the record' % (dtc_size - partial_dtc_length))
+
                     else:
-                        if subfunction in response_subfn_dtc_availability_mask_plus_dtc_record:
-                            dtc = Dtc(struct.unpack('>L', b'\x00' + dtc_bytes[0:3])[0])
-                            dtc.status.set_byte(dtc_bytes[3])
-                        elif subfunction in response_subfn_dtc_availability_mask_plus_dtc_record_with_severity:
-                            dtc = Dtc(struct.unpack('>L', b'\x00' + dtc_bytes[2:5])[0])
-                            dtc.severity.set_byte(dtc_bytes[0])
-                            dtc.functional_unit = dtc_bytes[1]
-                            dtc.status.set_byte(dtc_bytes[5])
-
-                        response.service_data.dtcs.append(dtc)
-                actual_byte += dtc_size
+                        dtc_bytes = response.data[actual_byte:actual_byte + dtc_size]
+                        if dtc_bytes == b'\x00' * dtc_size and ignore_all_zero_dtc:
+                            pass  # ignore
+                        else:
+                            if subfunction in response_subfn_dtc_availability_mask_plus_dtc_record:
+                                dtc = Dtc(struct.unpack('>L', b'\x00' + dtc_bytes[0:3])[0])
+                                dtc.status.set_byte(dtc_bytes[3])
+                            elif subfunction in response_subfn_dtc_availability_mask_plus_dtc_record_with_severity:
+                                dtc = Dtc(struct.unpack('>L', b'\x00' + dtc_bytes[2:5])[0])
+                                dtc.severity.set_byte(dtc_bytes[0])
+                                dtc.functional_unit = dtc_bytes[1]
+                                dtc.status.set_byte(dtc_bytes[5])
+
+                            response.service_data.dtcs.append(dtc)
+                    actual_byte += dtc_size
             response.service_data.dtc_count = len(response.service_data.dtcs)
 
         # The 2 following subfunction responses have different purposes but their constructions are very similar.
@@ -681,10 +706,9 @@ class ReadDTCInformation(BaseService):
                     snapshot.record_number = record_number
 
                     # As standard does not specify the length of the DID, we craft it based on a config
-                    did = 0
-                    for j in range(dtc_snapshot_did_size):
-                        offset = dtc_snapshot_did_size - 1 - j
-                        did |= (remaining_data[offset] << (8 * j))
+                    if len(remaining_data) < dtc_snapshot_did_size:
+                        raise InvalidResponseException(response, 'Incomplete response from server. Missing DID number and associated data.')
+                    did = int.from_bytes(remaining_data[:dtc_snapshot_did_size], 'big')
 
                     # Decode the data based on DID number.
                     snapshot.did = did
@@ -765,10 +789,9 @@ class ReadDTCInformation(BaseService):
                     snapshot.record_number = record_number
 
                     # As standard does not specify the length of the DID, we craft it based on a config
-                    did = 0
-                    for j in range(dtc_snapshot_did_size):
-                        offset = dtc_snapshot_did_size - 1 - j
-                        did |= (remaining_data[offset] << (8 * j))
+                    if len(remaining_data) < dtc_snapshot_did_size:
+                        raise InvalidResponseException(response, 'Incomplete response from server. Missing DID number and associated data.')
+                    did = int.from_bytes(remaining_data[:dtc_snapshot_did_size], 'big')
 
                     # Decode the data based on DID number.
                     snapshot.did = did
@@ -940,14 +963,15 @@ class ReadDTCInformation(BaseService):
             if len(remaining_bytes) % 5 != 0:
                 raise InvalidResponseException(response, 'Incomplete response from server. Remaining bytes must be a multiple of 5')
 
-            while remaining_bytes:
-                severity = remaining_bytes[0]
-                dtc = Dtc(struct.unpack('>L', b'\x00' + remaining_bytes[1:4])[0])
-                status_of_dtc = Dtc.Status.from_byte(remaining_bytes[4])
-                dtc.severity.set_byte(severity)
-                dtc.status = status_of_dtc
-                remaining_bytes = remaining_bytes[5:]
-                response.service_data.dtcs.append(dtc)
+            if compact_dtc_records:
+                response.service_data.dtcs = CompactDtcList.from_records(remaining_bytes, 5, id_offset=1, status_offset=4, severity_offset=0,
+                                                                         ignore_all_zero_dtc=False)
+            else:
+                for i in range(0, len(remaining_bytes), 5):     # Index the records, slicing off each one copies the rest of the response
+                    dtc = Dtc(struct.unpack('>L', b'\x00' + remaining_bytes[i + 1:i + 4])[0])
+                    dtc.severity.set_byte(remaining_bytes[i])
+                    dtc.status = Dtc.Status.from_byte(remaining_bytes[i + 4])
+                    response.service_data.dtcs.append(dtc)
 
             response.service_data.dtc_count = len(response.service_data.dtcs)
 
@@ -1,6 +1,6 @@
 import struct
 
-from udsoncan import DidCodec, check_did_config, make_did_codec_from_definition, fetch_codec_definition_from_config, DIDConfig
+from udsoncan import DidCodec, check_did_config, make_did_codec_from_definition, fetch_codec_definition_from_config, DIDConfig, CompiledDidConfig
 from udsoncan.Request import Request
 from udsoncan.Response import Response
 from udsoncan.exceptions import *
@@ -15,6 +15,8 @@ class ReadDataByIdentifier(BaseService):
     _sid = 0x22
     _use_subfunction = False
 
+    _did_struct = struct.Struct('>H')
+
     supported_negative_response = [ResponseCode.IncorrectMessageLengthOrInvalidFormat,
                                    ResponseCode.ConditionsNotCorrect,
                                    ResponseCode.RequestOutOfRange,
@@ -53,14 +55,15 @@ class ReadDataByIdentifier(BaseService):
         return [dids] if not isinstance(dids, list) else dids
 
     @classmethod
-    def make_request(cls, didlist: Union[int, List[int]], didconfig: Optional[DIDConfig]) -> Request:
+    def make_request(cls, didlist: Union[int, List[int]], didconfig: Optional[Union[DIDConfig, CompiledDidConfig]]) -> Request:
         """
         Generates a request for ReadDataByIdentifier
 
         :param didlist: List of data identifier to read.
         :type didlist: list[int]
 
-        :param didconfig: Optional definition of DID codecs for validation. Dictionary mapping a DID (int) to a valid :ref:`DidCodec<DidCodec>` class or pack/unpack string 
+        :param didconfig: Optional definition of DID codecs for validation. Dictionary mapping a DID (int) to a valid :ref:`DidCodec<DidCodec>` class or pack/unpack string,
+            or a :class:`CompiledDidConfig<udsoncan.CompiledDidConfig>` built from it
         :type didconfig: dict[int] = :ref:`DidCodec<DidCodec>`
 
         :raises ValueError: If parameters are out of range, missing or wrong type
@@ -69,7 +72,18 @@ class ReadDataByIdentifier(BaseService):
 
         didlist = cls.validate_didlist_input(didlist)
         req = Request(cls)
-        if didconfig is not None:
+        if isinstance(didconfig, CompiledDidConfig):
+            did_reading_all_data = None
+            for did in didlist:
+                if didconfig.get(did).length is None:
+                    if did_reading_all_data is not None:
+                        raise ValueError('It is impossible to read 2 DIDs configured to read the rest of the payload (__len__ raising ReadAllRemainingData). Dids are : 0x%04X and 0x%04X' % (
+                            did_reading_all_data, did))
+                    did_reading_all_data = did
+                elif did_reading_all_data is not None:
+                    raise ValueError('Did 0x%04X is configured to read the rest of the payload (__len__ raisong ReadAllRemainingData), but a subsequent DID is requested (0x%04x)' % (
+                        did_reading_all_data, did))
+        elif didconfig is not None:
             # Return a validated did config. Format may change, entries might be added if default value is set.
             check_did_config(didlist, didconfig)
 
@@ -98,7 +112,7 @@ class ReadDataByIdentifier(BaseService):
     def interpret_response(cls,
                            response: Response,
                            didlist: Union[int, List[int]],
-                           didconfig: DIDConfig,
+                           didconfig: Union[DIDConfig, CompiledDidConfig],
                            tolerate_zero_padding: bool = True) -> InterpretedResponse:
         """
         Populates the response ``service_data`` property with an instance of :class:`ReadDataByIdentifier.ResponseData<udsoncan.services.ReadDataByIdentifier.ResponseData>`
@@ -109,7 +123,8 @@ class ReadDataByIdentifier(BaseService):
         :param didlist:  List of data identifiers used for the request.
         :type didlist: list[int]
 
-        :param didconfig: Definition of DID codecs. Dictionary mapping a DID (int) to a valid :ref:`DidCodec<DidCodec>` class or pack/unpack string 
+        :param didconfig: Definition of DID codecs. Dictionary mapping a DID (int) to a valid :ref:`DidCodec<DidCodec>` class or pack/unpack string,
+            or a :class:`CompiledDidConfig<udsoncan.CompiledDidConfig>` built from it
         :type didconfig: dict[int] = :ref:`DidCodec<DidCodec>`
 
         :param tolerate_zero_padding: Ignore trailing zeros in the response data avoiding raising false :class:`InvalidResponseException<udsoncan.exceptions.InvalidResponseException>`.
@@ -123,6 +138,8 @@ class ReadDataByIdentifier(BaseService):
             raise InvalidResponseException(response, "No data in response")
 
         didlist = cls.validate_didlist_input(didlist)
+        if isinstance(didconfig, CompiledDidConfig):
+            return cls._interpret_response_compiled(response, didlist, didconfig, tolerate_zero_padding)
         didconfig_validated = check_did_config(didlist, didconfig)
 
         response.service_data = cls.ResponseData(
@@ -164,3 +181,44 @@ class ReadDataByIdentifier(BaseService):
             response.service_data.values[did] = val
 
         return cast(ReadDataByIdentifier.InterpretedResponse, response)
+
+    @classmethod
+    def _interpret_response_compiled(cls,
+                                     response: Response,
+                                     didlist: List[int],
+                                     didconfig: CompiledDidConfig,
+                                     tolerate_zero_padding: bool) -> InterpretedResponse:
+        """Same parsing algorithm as :meth:`interpret_response`, using the codecs compiled in ``didconfig``"""
+        for did in didlist:
+            didconfig.get(did)  # Raises ConfigError for a DID with no definition
+
+        data = response.data
+        assert data is not None
+        datalen = len(data)
+        values: Dict[int, Any] = {}
+        response.service_data = cls.ResponseData(values=values)
+
+        offset = 0
+        while offset < datalen:
+            if datalen <= offset + 1:
+                if tolerate_zero_padding and data[-1] == 0:
+                    break
+                raise InvalidResponseException(response, "Response given by server is incomplete.")
+
+            did = cls._did_struct.unpack_from(data, offset)[0]
+            if did == 0 and tolerate_zero_padding and did not in didconfig:
+                if data.count(0, offset) == datalen - offset:
+                    break
+
+            codec = didconfig.get(did)
+            offset += 2
+
+            payload_size = codec.length if codec.length is not None else datalen - offset
+            if datalen < offset + payload_size:
+                raise InvalidResponseException(
+                    response, "Value for data identifier 0x%04x was incomplete according to definition in configuration" % did)
+
+            values[did] = codec.decode(data[offset:offset + payload_size])
+            offset += payload_size
+
+        return cast(ReadDataByIdentifier.InterpretedResponse, response)
@@ -1,12 +1,18 @@
+from udsoncan import DidCodec, check_did_config, make_did_codec_from_definition, fetch_codec_definition_from_config, DIDConfig
 from udsoncan.Request import Request
 from udsoncan.Response import Response
 from udsoncan.exceptions import *
-from udsoncan.BaseService import BaseService, BaseResponseData
+from udsoncan.BaseService import BaseService, BaseSubfunction, BaseResponseData
 from udsoncan.ResponseCode import ResponseCode
+import udsoncan.tools as tools
+
+from typing import Any, List, Optional, Tuple, Union, cast
 
 
 class ReadDataByPeriodicIdentifier(BaseService):
     _sid = 0x2A
+    _use_subfunction = False
+    _no_response_data = True
 
     supported_negative_response = [ResponseCode.IncorrectMessageLengthOrInvalidFormat,
                                    ResponseCode.ConditionsNotCorrect,
@@ -14,6 +20,18 @@ class ReadDataByPeriodicIdentifier(BaseService):
                                    ResponseCode.SecurityAccessDenied
                                    ]
 
+    class TransmissionMode(BaseSubfunction):
+        """
+        ReadDataByPeriodicIdentifier defined transmission modes
+        """
+
+        __pretty_name__ = 'transmission mode'
+
+        sendAtSlowRate = 1
+        sendAtMediumRate = 2
+        sendAtFastRate = 3
+        stopSending = 4
+
     class ResponseData(BaseResponseData):
         def __init__(self):
             super().__init__(ReadDataByPeriodicIdentifier)
@@ -22,9 +40,97 @@ class ReadDataByPeriodicIdentifier(BaseService):
         service_data: "ReadDataByPeriodicIdentifier.ResponseData"
 
     @classmethod
-    def make_request(cls) -> Request:
-        raise NotImplementedError('Service is not implemented')
+    def normalize_periodic_id(cls, did: int) -> int:
+        """
+        Returns the 1 byte periodicDataIdentifier of a DID. Accepts either the full DID (0xF200-0xF2FF) or the low byte only.
+
+        :raises ValueError: If the DID is not a periodic data identifier
+        """
+        if isinstance(did, int) and 0xF200 <= did <= 0xF2FF:
+            return did & 0xFF
+        tools.validate_int(did, min=0, max=0xFF, name='Periodic data identifier')
+        return did
+
+    @classmethod
+    def make_request(cls, transmission_mode: int, didlist: Optional[Union[int, List[int]]] = None) -> Request:
+        """
+        Generates a request for ReadDataByPeriodicIdentifier
+
+        :param transmission_mode: The rate at which the server sends the periodic data, or ``stopSending``.
+            Values from :class:`ReadDataByPeriodicIdentifier.TransmissionMode<udsoncan.services.ReadDataByPeriodicIdentifier.TransmissionMode>` can be used.
+        :type transmission_mode: int
+
+        :param didlist: List of periodic data identifiers, given as 0xF2xx or as their low byte.
+            Required unless ``transmission_mode`` is ``stopSending``, in which case an empty list stops all periodic identifiers.
+        :type didlist: list[int]
+
+        :raises ValueError: If parameters are out of range, missing or wrong type
+        """
+        tools.validate_int(transmission_mode, min=1, max=0xFF, name='Transmission mode')
+
+        if didlist is None:
+            didlist = []
+        elif not isinstance(didlist, list):
+            didlist = [didlist]
+
+        if len(didlist) == 0 and transmission_mode != cls.TransmissionMode.stopSending:
+            raise ValueError('At least one periodic data identifier must be given unless transmission mode is stopSending')
+
+        data = bytes([transmission_mode] + [cls.normalize_periodic_id(did) for did in didlist])
+        return Request(service=cls, data=data)
 
     @classmethod
     def interpret_response(cls, response: Response) -> InterpretedResponse:
-        raise NotImplementedError('Service is not implemented')
+        """
+        Populates the response ``service_data`` property with an instance of :class:`ReadDataByPeriodicIdentifier.ResponseData<udsoncan.services.ReadDataByPeriodicIdentifier.ResponseData>`
+
+        :param response: The received response to interpret
+        :type response: :ref:`Response<Response>`
+        """
+        response.service_data = cls.ResponseData()
+        return cast(ReadDataByPeriodicIdentifier.InterpretedResponse, response)
+
+    @classmethod
+    def is_periodic_data(cls, payload: bytes) -> bool:
+        """
+        Tells if a received payload is a periodic data message (0x6A followed by a periodicDataIdentifier and its data)
+        rather than the positive response to the request.
+        """
+        return len(payload) > 1 and payload[0] == cls.response_id()
+
+    @classmethod
+    def interpret_periodic_data(cls, payload: bytes, didconfig: DIDConfig, with_sid: bool = True) -> Tuple[int, Any]:
+        """
+        Decodes a periodic data message pushed by the server.
+
+        :param payload: The received payload
+        :type payload: bytes
+
+        :param didconfig: Definition of DID codecs. The codec of DID 0xF2xx is used for periodicDataIdentifier xx
+        :type didconfig: dict[int] = :ref:`DidCodec<DidCodec>`
+
+        :param with_sid: ``True`` when the message starts with the 0x6A response ID, ``False`` for messages carrying the periodicDataIdentifier first
+        :type with_sid: bool
+
+        :return: The full DID (0xF2xx) and the value returned by its codec
+        :rtype: tuple(int, object)
+
+        :raises ValueError: If the payload is not a periodic data message
+        :raises ConfigError: If no codec is defined for the DID
+        """
+        offset = 1 if with_sid else 0
+        if len(payload) < offset + 1 or (with_sid and payload[0] != cls.response_id()):
+            raise ValueError('Payload is not a ReadDataByPeriodicIdentifier periodic data message')
+
+        did = 0xF200 | payload[offset]
+        codec = make_did_codec_from_definition(fetch_codec_definition_from_config(did, check_did_config(did, didconfig)))
+        data = payload[offset + 1:]
+        try:
+            payload_size = len(codec)
+        except DidCodec.ReadAllRemainingData:
+            payload_size = len(data)
+
+        if len(data) < payload_size:
+            raise ValueError('Value for periodic data identifier 0x%04x was incomplete according to definition in configuration' % did)
+
+        return did, codec.decode(data[:payload_size])
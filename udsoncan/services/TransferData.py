@@ -55,21 +55,21 @@ class TransferData(BaseService):
         :type sequence_number: int
 
         :param data: Optional additional data to send to the server
-        :type data: bytes
+        :type data: bytes, bytearray or memoryview
 
         :raises ValueError: If parameters are out of range, missing or wrong type
         """
 
         tools.validate_int(sequence_number, min=0, max=0xFF, name='Block sequence counter')  # Not a subfunction!
 
-        if data is not None and not isinstance(data, bytes):
-            raise ValueError('data must be a bytes object')
+        if data is not None and not isinstance(data, (bytes, bytearray, memoryview)):
+            raise ValueError('data must be a bytes-like object')
 
         request = Request(service=cls)
         request.data = struct.pack('B', sequence_number)
 
         if data is not None:
-            request.data += data
+            request.data += data  # Copies a memoryview block once, into the request
         return request
 
     @classmethod
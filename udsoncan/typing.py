@@ -34,6 +34,7 @@ class ClientConfig(TypedDict, total=False):
     security_algo_params: Optional[Any]
     tolerate_zero_padding: bool
     ignore_all_zero_dtc: bool
+    compact_dtc_records: bool
     dtc_snapshot_did_size: int
     server_address_format: Optional[int]
     server_memorysize_format: Optional[int]